@@ -0,0 +1,29 @@
+"""account run retry attempts
+
+Revision ID: 0006_account_run_attempts
+Revises: 0005_social_account_fingerprint_profile
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_account_run_attempts"
+down_revision = "0005_social_account_fingerprint_profile"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_runs",
+        sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("account_runs", "attempt_count")
@@ -0,0 +1,37 @@
+"""runs keyset pagination indexes
+
+Revision ID: 0007_runs_keyset_indexes
+Revises: 0006_account_run_attempts
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0007_runs_keyset_indexes"
+down_revision = "0006_account_run_attempts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_runs_workspace_created", "runs", ["workspace_id", "created_at", "id"], unique=False)
+    op.create_index(
+        "ix_runs_workspace_status_created", "runs", ["workspace_id", "status", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_runs_workspace_schedule_created", "runs", ["workspace_id", "schedule_id", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_runs_workspace_strategy_created", "runs", ["workspace_id", "strategy_id", "created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_workspace_strategy_created", table_name="runs")
+    op.drop_index("ix_runs_workspace_schedule_created", table_name="runs")
+    op.drop_index("ix_runs_workspace_status_created", table_name="runs")
+    op.drop_index("ix_runs_workspace_created", table_name="runs")
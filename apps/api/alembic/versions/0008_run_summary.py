@@ -0,0 +1,28 @@
+"""run summary aggregates
+
+Revision ID: 0008_run_summary
+Revises: 0007_runs_keyset_indexes
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_run_summary"
+down_revision = "0007_runs_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("runs", sa.Column("summary", sa.JSON(), nullable=True))
+    op.create_index("ix_actions_account_run_created", "actions", ["account_run_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_actions_account_run_created", table_name="actions")
+    op.drop_column("runs", "summary")
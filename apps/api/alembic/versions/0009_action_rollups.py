@@ -0,0 +1,62 @@
+"""action outcome rollups
+
+Revision ID: 0009_action_rollups
+Revises: 0008_run_summary
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_action_rollups"
+down_revision = "0008_run_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "action_rollups_hourly",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("workspace_id", sa.Uuid(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("social_account_id", sa.Uuid(), nullable=False),
+        sa.Column("strategy_id", sa.Uuid(), nullable=False),
+        sa.Column("action_type", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("error_code", sa.String(length=64), nullable=False, server_default=""),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["social_account_id"], ["social_accounts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["strategy_id"], ["strategies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "workspace_id",
+            "bucket_start",
+            "social_account_id",
+            "strategy_id",
+            "action_type",
+            "status",
+            "error_code",
+            name="uq_action_rollups_hourly_key",
+        ),
+    )
+    op.create_index(
+        "ix_action_rollups_hourly_workspace_bucket", "action_rollups_hourly", ["workspace_id", "bucket_start"], unique=False
+    )
+    op.create_index(
+        op.f("ix_action_rollups_hourly_social_account_id"), "action_rollups_hourly", ["social_account_id"], unique=False
+    )
+    op.create_index(op.f("ix_action_rollups_hourly_strategy_id"), "action_rollups_hourly", ["strategy_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_action_rollups_hourly_strategy_id"), table_name="action_rollups_hourly")
+    op.drop_index(op.f("ix_action_rollups_hourly_social_account_id"), table_name="action_rollups_hourly")
+    op.drop_index("ix_action_rollups_hourly_workspace_bucket", table_name="action_rollups_hourly")
+    op.drop_table("action_rollups_hourly")
@@ -0,0 +1,238 @@
+"""monthly range partitions for actions and audit_logs
+
+Revision ID: 0010_partition_actions_audit_logs
+Revises: 0009_action_rollups
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_partition_actions_audit_logs"
+down_revision = "0009_action_rollups"
+branch_labels = None
+depends_on = None
+
+_MONTHS_AHEAD = 2
+
+_ACTIONS_COLUMNS = (
+    "id, workspace_id, account_run_id, action_type, platform_key, target_external_id, target_url, "
+    "idempotency_key, status, error_code, metadata, created_at, started_at, finished_at"
+)
+_AUDIT_LOGS_COLUMNS = "id, workspace_id, actor_user_id, action, target_type, target_id, metadata, created_at"
+
+
+def _month_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def _create_partitions(table: str, first_month: datetime, last_month: datetime) -> None:
+    month = first_month
+    while month <= last_month:
+        name = f"{table}_p{month.year:04d}_{month.month:02d}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _partition_range(table: str) -> tuple[datetime, datetime]:
+    current = _month_start(datetime.now(timezone.utc))
+    oldest = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+    first = _month_start(oldest) if oldest is not None else current
+    return min(first, current), _add_months(current, _MONTHS_AHEAD)
+
+
+def _create_idempotency_keys() -> None:
+    op.create_table(
+        "action_idempotency_keys",
+        sa.Column("workspace_id", sa.Uuid(), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=500), nullable=False),
+        sa.Column("action_id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="RESTRICT"),
+        sa.PrimaryKeyConstraint("workspace_id", "idempotency_key"),
+    )
+    op.create_index(
+        op.f("ix_action_idempotency_keys_created_at"), "action_idempotency_keys", ["created_at"], unique=False
+    )
+    op.execute(
+        "INSERT INTO action_idempotency_keys (workspace_id, idempotency_key, action_id, created_at) "
+        "SELECT workspace_id, idempotency_key, id, created_at FROM actions"
+    )
+
+
+def upgrade() -> None:
+    _create_idempotency_keys()
+
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index(
+            "ix_actions_workspace_idempotency_key", "actions", ["workspace_id", "idempotency_key"], unique=False
+        )
+        op.create_index("ix_audit_logs_workspace_created", "audit_logs", ["workspace_id", "created_at"], unique=False)
+        return
+
+    # Partitioned tables can only be referenced through keys that include the partition column.
+    op.execute("ALTER TABLE artifacts DROP CONSTRAINT IF EXISTS artifacts_action_id_fkey")
+
+    first_month, last_month = _partition_range("actions")
+    op.execute("ALTER TABLE actions RENAME TO actions_unpartitioned")
+    op.execute("ALTER TABLE actions_unpartitioned RENAME CONSTRAINT actions_pkey TO actions_unpartitioned_pkey")
+    op.execute(
+        """
+        CREATE TABLE actions (
+            id uuid NOT NULL,
+            workspace_id uuid NOT NULL REFERENCES workspaces (id) ON DELETE RESTRICT,
+            account_run_id uuid NOT NULL REFERENCES account_runs (id) ON DELETE CASCADE,
+            action_type varchar(32) NOT NULL,
+            platform_key varchar(32) NOT NULL,
+            target_external_id varchar(200),
+            target_url varchar(1000),
+            idempotency_key varchar(500) NOT NULL,
+            status varchar(32) NOT NULL DEFAULT 'queued',
+            error_code varchar(64),
+            metadata json NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_at timestamptz,
+            finished_at timestamptz,
+            CONSTRAINT actions_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_partitions("actions", first_month, last_month)
+    op.execute(f"INSERT INTO actions ({_ACTIONS_COLUMNS}) SELECT {_ACTIONS_COLUMNS} FROM actions_unpartitioned")
+    op.execute("DROP TABLE actions_unpartitioned")
+    op.create_index(op.f("ix_actions_account_run_id"), "actions", ["account_run_id"], unique=False)
+    op.create_index(op.f("ix_actions_action_type"), "actions", ["action_type"], unique=False)
+    op.create_index(op.f("ix_actions_platform_key"), "actions", ["platform_key"], unique=False)
+    op.create_index(op.f("ix_actions_status"), "actions", ["status"], unique=False)
+    op.create_index(op.f("ix_actions_workspace_id"), "actions", ["workspace_id"], unique=False)
+    op.create_index("ix_actions_account_run_created", "actions", ["account_run_id", "created_at", "id"], unique=False)
+    op.create_index(
+        "ix_actions_workspace_idempotency_key", "actions", ["workspace_id", "idempotency_key"], unique=False
+    )
+
+    first_month, last_month = _partition_range("audit_logs")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute(
+        "ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id uuid NOT NULL,
+            workspace_id uuid NOT NULL REFERENCES workspaces (id) ON DELETE RESTRICT,
+            actor_user_id uuid REFERENCES users (id) ON DELETE SET NULL,
+            action varchar(200) NOT NULL,
+            target_type varchar(100),
+            target_id uuid,
+            metadata json NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_partitions("audit_logs", first_month, last_month)
+    op.execute(
+        f"INSERT INTO audit_logs ({_AUDIT_LOGS_COLUMNS}) SELECT {_AUDIT_LOGS_COLUMNS} FROM audit_logs_unpartitioned"
+    )
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+    op.create_index(op.f("ix_audit_logs_action"), "audit_logs", ["action"], unique=False)
+    op.create_index(op.f("ix_audit_logs_actor_user_id"), "audit_logs", ["actor_user_id"], unique=False)
+    op.create_index(op.f("ix_audit_logs_workspace_id"), "audit_logs", ["workspace_id"], unique=False)
+    op.create_index("ix_audit_logs_workspace_created", "audit_logs", ["workspace_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index("ix_audit_logs_workspace_created", table_name="audit_logs")
+        op.drop_index("ix_actions_workspace_idempotency_key", table_name="actions")
+        op.drop_index(op.f("ix_action_idempotency_keys_created_at"), table_name="action_idempotency_keys")
+        op.drop_table("action_idempotency_keys")
+        return
+
+    # Archived partitions are not restored; only rows still attached are copied back.
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_action, ix_audit_logs_actor_user_id, ix_audit_logs_workspace_id")
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_workspace_created")
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id uuid NOT NULL PRIMARY KEY,
+            workspace_id uuid NOT NULL REFERENCES workspaces (id) ON DELETE RESTRICT,
+            actor_user_id uuid REFERENCES users (id) ON DELETE SET NULL,
+            action varchar(200) NOT NULL,
+            target_type varchar(100),
+            target_id uuid,
+            metadata json NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    op.execute(f"INSERT INTO audit_logs ({_AUDIT_LOGS_COLUMNS}) SELECT {_AUDIT_LOGS_COLUMNS} FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    op.create_index(op.f("ix_audit_logs_action"), "audit_logs", ["action"], unique=False)
+    op.create_index(op.f("ix_audit_logs_actor_user_id"), "audit_logs", ["actor_user_id"], unique=False)
+    op.create_index(op.f("ix_audit_logs_workspace_id"), "audit_logs", ["workspace_id"], unique=False)
+
+    op.execute("ALTER TABLE actions RENAME TO actions_partitioned")
+    op.execute("ALTER TABLE actions_partitioned RENAME CONSTRAINT actions_pkey TO actions_partitioned_pkey")
+    op.execute(
+        "DROP INDEX IF EXISTS ix_actions_account_run_id, ix_actions_action_type, ix_actions_platform_key, "
+        "ix_actions_status, ix_actions_workspace_id, ix_actions_account_run_created, "
+        "ix_actions_workspace_idempotency_key"
+    )
+    op.execute(
+        """
+        CREATE TABLE actions (
+            id uuid NOT NULL PRIMARY KEY,
+            workspace_id uuid NOT NULL REFERENCES workspaces (id) ON DELETE RESTRICT,
+            account_run_id uuid NOT NULL REFERENCES account_runs (id) ON DELETE CASCADE,
+            action_type varchar(32) NOT NULL,
+            platform_key varchar(32) NOT NULL,
+            target_external_id varchar(200),
+            target_url varchar(1000),
+            idempotency_key varchar(500) NOT NULL,
+            status varchar(32) NOT NULL DEFAULT 'queued',
+            error_code varchar(64),
+            metadata json NOT NULL DEFAULT '{}',
+            created_at timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_at timestamptz,
+            finished_at timestamptz,
+            CONSTRAINT actions_workspace_id_idempotency_key_key UNIQUE (workspace_id, idempotency_key)
+        )
+        """
+    )
+    op.execute(f"INSERT INTO actions ({_ACTIONS_COLUMNS}) SELECT {_ACTIONS_COLUMNS} FROM actions_partitioned")
+    op.execute("DROP TABLE actions_partitioned CASCADE")
+    op.create_index(op.f("ix_actions_account_run_id"), "actions", ["account_run_id"], unique=False)
+    op.create_index(op.f("ix_actions_action_type"), "actions", ["action_type"], unique=False)
+    op.create_index(op.f("ix_actions_platform_key"), "actions", ["platform_key"], unique=False)
+    op.create_index(op.f("ix_actions_status"), "actions", ["status"], unique=False)
+    op.create_index(op.f("ix_actions_workspace_id"), "actions", ["workspace_id"], unique=False)
+    op.create_index("ix_actions_account_run_created", "actions", ["account_run_id", "created_at", "id"], unique=False)
+    op.execute("DELETE FROM artifacts WHERE action_id NOT IN (SELECT id FROM actions)")
+    op.execute(
+        "ALTER TABLE artifacts ADD CONSTRAINT artifacts_action_id_fkey "
+        "FOREIGN KEY (action_id) REFERENCES actions (id) ON DELETE CASCADE"
+    )
+
+    op.drop_index(op.f("ix_action_idempotency_keys_created_at"), table_name="action_idempotency_keys")
+    op.drop_table("action_idempotency_keys")
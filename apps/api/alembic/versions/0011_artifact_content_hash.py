@@ -0,0 +1,30 @@
+"""content-addressed artifacts
+
+Revision ID: 0011_artifact_content_hash
+Revises: 0010_partition_actions_audit_logs
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_artifact_content_hash"
+down_revision = "0010_partition_actions_audit_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("artifacts", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_artifacts_workspace_content_hash", "artifacts", ["workspace_id", "content_hash"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_workspace_content_hash", table_name="artifacts")
+    op.drop_column("artifacts", "content_hash")
@@ -4,8 +4,10 @@ from app.api.routes import (
     admin_audit_logs,
     admin_subscription,
     admin_users,
+    analytics,
     artifacts,
     auth,
+    internal,
     login_sessions,
     me,
     runs,
@@ -23,6 +25,8 @@ api_router.include_router(strategies.router, prefix="/strategies", tags=["strate
 api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
 api_router.include_router(runs.router, prefix="/runs", tags=["runs"])
 api_router.include_router(artifacts.router, tags=["artifacts"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
 api_router.include_router(admin_users.router, prefix="/admin", tags=["admin"])
 api_router.include_router(admin_subscription.router, prefix="/admin", tags=["admin"])
 api_router.include_router(admin_audit_logs.router, prefix="/admin", tags=["admin"])
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"])
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
@@ -10,6 +11,7 @@ from app.deps import get_db, require_admin
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.schemas.audit_log import AuditLogPublic
+from app.utils.time import utc_now
 
 router = APIRouter()
 
@@ -19,11 +21,12 @@ def list_audit_logs(
     admin: Annotated[User, Depends(require_admin)],
     db: Session = Depends(get_db),
     limit: int = Query(default=200, ge=1, le=2000),
+    days: int = Query(default=30, ge=1, le=366),
 ) -> list[AuditLogPublic]:
     rows = db.execute(
         select(AuditLog, User.email)
         .join(User, User.id == AuditLog.actor_user_id, isouter=True)
-        .where(AuditLog.workspace_id == admin.workspace_id)
+        .where(AuditLog.workspace_id == admin.workspace_id, AuditLog.created_at >= utc_now() - timedelta(days=days))
         .order_by(AuditLog.created_at.desc())
         .limit(limit)
     ).all()
@@ -17,6 +17,7 @@ from app.schemas.subscription import (
 )
 from app.services.subscription import (
     get_current_month_period_start,
+    get_pending_runtime_seconds,
     get_workspace_subscription,
     get_workspace_usage_monthly,
     is_subscription_active,
@@ -52,6 +53,7 @@ def get_subscription_overview(
         current_month_usage=WorkspaceUsageMonthlyPublic.model_validate(usage, from_attributes=True) if usage is not None else None,
         active=active_check.allowed,
         active_reason=active_check.reason,
+        pending_runtime_seconds=get_pending_runtime_seconds(workspace_id=admin.workspace_id, period_start=period_start),
     )
 
 
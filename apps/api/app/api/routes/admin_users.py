@@ -14,6 +14,7 @@ from app.core.security import hash_password
 from app.deps import get_db, require_admin
 from app.models.audit_log import AuditLog
 from app.models.refresh_token import RefreshToken
+from app.services.principal_cache import principal_cache
 from app.services.subscription import enforce_seat_limit, get_workspace_subscription
 from app.models.user import User
 from app.schemas.user import (
@@ -170,6 +171,7 @@ def update_user(
         )
     )
     db.commit()
+    principal_cache.invalidate(user.id)
     db.refresh(user)
     return UserPublic.model_validate(user, from_attributes=True)
 
@@ -205,6 +207,7 @@ def delete_user(
         )
     )
     db.commit()
+    principal_cache.invalidate(user.id)
     return {"ok": True}
 
 
@@ -239,4 +242,5 @@ def reset_password(
         )
     )
     db.commit()
+    principal_cache.invalidate(user.id)
     return ResetPasswordResponse(temporary_password=temporary_password)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.deps import get_current_user, get_db
+from app.models.user import User
+from app.schemas.analytics import ActionSeries, ActionSeriesPoint
+from app.services.action_rollups import ROLLUP_DIMENSIONS, default_series_window, query_action_series
+from app.utils.time import ensure_utc, utc_now
+
+router = APIRouter()
+
+_MAX_WINDOW = {"hour": timedelta(days=14), "day": timedelta(days=366)}
+
+
+@router.get("/actions", response_model=ActionSeries)
+def action_series(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    granularity: str = Query(default="day", pattern="^(hour|day)$"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    group_by: list[str] = Query(default=["action_type", "status"]),
+    social_account_id: uuid.UUID | None = None,
+    strategy_id: uuid.UUID | None = None,
+    action_type: str | None = Query(default=None, max_length=32),
+) -> ActionSeries:
+    dimensions = [item.strip() for value in group_by for item in value.split(",") if item.strip()]
+    unknown = [item for item in dimensions if item not in ROLLUP_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid group_by: {', '.join(unknown)}")
+
+    default_start, default_end = default_series_window(utc_now(), granularity=granularity)
+    end_at = ensure_utc(end) if end is not None else default_end
+    start_at = ensure_utc(start) if start is not None else end_at - (default_end - default_start)
+    if start_at >= end_at:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if end_at - start_at > _MAX_WINDOW[granularity]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Time window too large")
+
+    points = query_action_series(
+        db,
+        workspace_id=user.workspace_id,
+        start=start_at,
+        end=end_at,
+        granularity=granularity,
+        group_by=dimensions,
+        social_account_id=social_account_id,
+        strategy_id=strategy_id,
+        action_type=action_type.strip().lower() if action_type else None,
+    )
+    return ActionSeries(
+        granularity=granularity,
+        start=start_at,
+        end=end_at,
+        group_by=[name for name in ROLLUP_DIMENSIONS if name in dimensions],
+        points=[ActionSeriesPoint(**point) for point in points],
+    )
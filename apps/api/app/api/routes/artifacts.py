@@ -1,40 +1,169 @@
 from __future__ import annotations
 
-from pathlib import Path
+import re
+from pathlib import PurePosixPath
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.deps import get_current_user, get_db
 from app.models.artifact import Artifact
 from app.models.user import User
+from app.services.artifact_storage import (
+    THUMBNAIL_WIDTHS,
+    ThumbnailDecodeError,
+    artifact_storage,
+    get_or_create_thumbnail,
+)
 
 router = APIRouter()
 
+_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
 
 @router.get("/artifacts/{artifact_id}/download")
 def download_artifact(
     artifact_id: UUID,
+    request: Request,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Response:
+    row = _get_workspace_artifact(db, artifact_id=artifact_id, user=user)
+
+    filename = PurePosixPath(row.storage_key).name
+    media_type = "application/octet-stream"
+    if row.type == "screenshot" and filename.lower().endswith(".png"):
+        media_type = "image/png"
+
+    etag = _artifact_etag(row)
+    headers = {"ETag": etag, "Cache-Control": _IMMUTABLE_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = artifact_storage.local_path(row.storage_key)
+    if path is not None:
+        if not path.exists() or not path.is_file():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact file missing")
+        total_size = path.stat().st_size
+    else:
+        if ".." in PurePosixPath(row.storage_key).parts:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid artifact storage key")
+        total_size = row.size
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if total_size is not None and (if_range is None or if_range.strip() == etag):
+        byte_range = _parse_range(request.headers.get("range"), total_size)
+    if byte_range is not None:
+        start, end = byte_range
+        payload = artifact_storage.get_range(row.storage_key, start, end)
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact file missing")
+        return Response(
+            content=payload,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers={**headers, "Content-Range": f"bytes {start}-{end}/{total_size}"},
+        )
+
+    if path is not None:
+        return FileResponse(path=str(path), media_type=media_type, filename=filename, headers=headers)
+
+    payload = artifact_storage.get(row.storage_key)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact file missing")
+    return Response(
+        content=payload,
+        media_type=media_type,
+        headers={**headers, "Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/artifacts/{artifact_id}/thumbnail")
+def artifact_thumbnail(
+    artifact_id: UUID,
+    request: Request,
+    width: int = Query(default=320),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> FileResponse:
+) -> Response:
+    if width not in THUMBNAIL_WIDTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"width must be one of {', '.join(str(item) for item in THUMBNAIL_WIDTHS)}",
+        )
+    row = _get_workspace_artifact(db, artifact_id=artifact_id, user=user)
+    if row.type != "screenshot":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail not available")
+
+    etag = _artifact_etag(row, suffix=f"w{width}")
+    headers = {"ETag": etag, "Cache-Control": _IMMUTABLE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        path = get_or_create_thumbnail(row.storage_key, width=width)
+    except ThumbnailDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from None
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from None
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact file missing")
+    return FileResponse(path=str(path), media_type="image/webp", headers=headers)
+
+
+def _get_workspace_artifact(db: Session, *, artifact_id: UUID, user: User) -> Artifact:
     row = db.get(Artifact, artifact_id)
     if row is None or row.workspace_id != user.workspace_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    return row
 
-    base_dir = Path(settings.artifacts_dir).resolve()
-    path = (base_dir / row.storage_key).resolve()
-    if not path.is_relative_to(base_dir):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid artifact storage key")
-    if not path.exists() or not path.is_file():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact file missing")
 
-    media_type = "application/octet-stream"
-    if row.type == "screenshot" and path.suffix.lower() == ".png":
-        media_type = "image/png"
+def _artifact_etag(row: Artifact, *, suffix: str | None = None) -> str:
+    # Content-addressed artifacts never change, so the hash is a strong validator;
+    # legacy per-action files are written once and keyed by their row.
+    tag = f"sha256-{row.content_hash}" if row.content_hash else f"artifact-{row.id}-{row.size or 0}"
+    if suffix:
+        tag = f"{tag}-{suffix}"
+    return f'"{tag}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [item.strip().removeprefix("W/") for item in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _parse_range(header: str | None, total_size: int) -> tuple[int, int] | None:
+    if not header or total_size <= 0:
+        return None
+    match = _RANGE_RE.fullmatch(header.strip())
+    if match is None:
+        # Multi-range and unknown units fall back to the full body.
+        return None
+    start_text, end_text = match.groups()
+    if not start_text and not end_text:
+        return None
+    if not start_text:
+        length = int(end_text)
+        if length <= 0:
+            raise _range_not_satisfiable(total_size)
+        return max(0, total_size - length), total_size - 1
+
+    start = int(start_text)
+    end = min(int(end_text), total_size - 1) if end_text else total_size - 1
+    if start >= total_size or start > end:
+        raise _range_not_satisfiable(total_size)
+    return start, end
 
-    return FileResponse(path=str(path), media_type=media_type, filename=path.name)
 
+def _range_not_satisfiable(total_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{total_size}"},
+    )
@@ -18,6 +18,7 @@ from app.deps import get_db, get_request_client_info
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, TokenResponse
+from app.services.principal_cache import principal_cache
 from app.utils.time import ensure_utc, utc_now
 
 router = APIRouter()
@@ -59,6 +60,7 @@ def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)
         )
     )
     db.commit()
+    principal_cache.invalidate(user.id)
 
     return TokenResponse(
         access_token=access_token,
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hmac
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.login_session_auto_capture import (
+    auto_capture_enabled,
+    capture_login_session,
+    mark_login_sessions_evicted,
+)
+
+router = APIRouter()
+
+
+def require_browser_node_token(x_internal_token: Annotated[str | None, Header()] = None) -> None:
+    expected = settings.browser_node_internal_token.strip() if settings.browser_node_internal_token else ""
+    if not expected or not hmac.compare_digest((x_internal_token or "").encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+
+class LoginSessionLoggedInRequest(BaseModel):
+    storage_state: dict
+
+
+@router.post("/login-sessions/{login_session_id}/logged-in")
+def login_session_logged_in(
+    login_session_id: UUID,
+    payload: LoginSessionLoggedInRequest,
+    _: None = Depends(require_browser_node_token),
+) -> dict:
+    if not auto_capture_enabled():
+        # The user finalizes manually; the node keeps the browser open for that.
+        return {"captured": False}
+    # The node closes its own runtime once this returns, so don't call back into it here.
+    captured = capture_login_session(login_session_id, payload.storage_state, stop_runtime=False)
+    return {"captured": captured}
+
+
+@router.post("/login-sessions/{login_session_id}/evicted")
+def login_session_evicted(
+    login_session_id: UUID,
+    _: None = Depends(require_browser_node_token),
+) -> dict:
+    return {"expired": bool(mark_login_sessions_evicted([login_session_id]))}
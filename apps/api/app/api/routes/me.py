@@ -7,6 +7,7 @@ from app.core.security import hash_password, verify_password
 from app.deps import get_current_user, get_db
 from app.models.user import User
 from app.schemas.user import ChangePasswordRequest, UserPublic
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -19,9 +20,12 @@ def me(user: User = Depends(get_current_user)) -> UserPublic:
 @router.post("/me/password")
 def change_password(
     payload: ChangePasswordRequest,
-    user: User = Depends(get_current_user),
+    principal: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> dict:
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User disabled or not found")
     if not verify_password(payload.current_password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password incorrect")
 
@@ -29,5 +33,6 @@ def change_password(
     user.must_change_password = False
     db.add(user)
     db.commit()
+    principal_cache.invalidate(user.id)
     return {"ok": True}
 
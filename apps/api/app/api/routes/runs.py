@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import base64
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
+from app.db.session import SessionLocal
 from app.deps import get_current_user, get_db
 from app.models.account_run import AccountRun
 from app.models.action import Action
@@ -14,22 +20,166 @@ from app.models.run import Run
 from app.models.user import User
 from app.schemas.action import ActionPublic
 from app.schemas.artifact import ArtifactPublic
-from app.schemas.run import AccountRunPublic, RunDetail, RunPublic
+from app.schemas.run import (
+    AccountRunPage,
+    AccountRunPublic,
+    ActionPage,
+    RunDetail,
+    RunPage,
+    RunPublic,
+    RunSummary,
+)
+from app.services.partitions import actions_created_after
+from app.services.run_events import stream_run_events, subscribe_run_events
+from app.services.run_summary import get_run_summary
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[RunPublic])
-def list_runs(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> list[RunPublic]:
-    rows = db.scalars(select(Run).where(Run.workspace_id == user.workspace_id).order_by(Run.created_at.desc())).all()
-    return [RunPublic.model_validate(row, from_attributes=True) for row in rows]
+@router.get("", response_model=RunPage)
+def list_runs(
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
+    run_status: str | None = Query(default=None, alias="status", max_length=32),
+    schedule_id: uuid.UUID | None = None,
+    strategy_id: uuid.UUID | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> RunPage:
+    stmt = select(Run).where(Run.workspace_id == user.workspace_id)
+    if run_status:
+        stmt = stmt.where(Run.status == run_status.strip().lower())
+    if schedule_id is not None:
+        stmt = stmt.where(Run.schedule_id == schedule_id)
+    if strategy_id is not None:
+        stmt = stmt.where(Run.strategy_id == strategy_id)
+    if created_from is not None:
+        stmt = stmt.where(Run.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Run.created_at < created_to)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                Run.created_at < cursor_created_at,
+                and_(Run.created_at == cursor_created_at, Run.id < cursor_id),
+            )
+        )
+
+    rows = db.scalars(stmt.order_by(Run.created_at.desc(), Run.id.desc()).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    return RunPage(
+        items=[RunPublic.model_validate(row, from_attributes=True) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{run_id}/summary", response_model=RunSummary)
+def get_run_summary_endpoint(
+    run_id: uuid.UUID, user: User = Depends(get_current_user), db: Session = Depends(get_db)
+) -> RunSummary:
+    run = _get_workspace_run(db, run_id=run_id, user=user)
+    return RunSummary(run=RunPublic.model_validate(run, from_attributes=True), **get_run_summary(db, run))
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events_endpoint(
+    run_id: uuid.UUID, request: Request, user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    try:
+        pubsub = await subscribe_run_events(run_id)
+    except RedisError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Run events unavailable") from None
+
+    # Subscribe before taking the snapshot so no transition falls between the two.
+    snapshot = await run_in_threadpool(_load_run_snapshot, run_id=run_id, workspace_id=user.workspace_id)
+    if snapshot is None:
+        await pubsub.aclose()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+
+    return StreamingResponse(
+        stream_run_events(pubsub, snapshot=snapshot, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{run_id}/account-runs", response_model=AccountRunPage)
+def list_run_account_runs(
+    run_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: uuid.UUID | None = None,
+    account_run_status: str | None = Query(default=None, alias="status", max_length=32),
+) -> AccountRunPage:
+    run = _get_workspace_run(db, run_id=run_id, user=user)
+    stmt = select(AccountRun).where(AccountRun.workspace_id == user.workspace_id, AccountRun.run_id == run.id)
+    if account_run_status:
+        stmt = stmt.where(AccountRun.status == account_run_status.strip().lower())
+    if cursor is not None:
+        stmt = stmt.where(AccountRun.id > cursor)
+
+    rows = db.scalars(stmt.order_by(AccountRun.id.asc()).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1].id)
+    return AccountRunPage(
+        items=[AccountRunPublic.model_validate(row, from_attributes=True) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{run_id}/account-runs/{account_run_id}/actions", response_model=ActionPage)
+def list_account_run_actions(
+    run_id: uuid.UUID,
+    account_run_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=200),
+) -> ActionPage:
+    run = _get_workspace_run(db, run_id=run_id, user=user)
+    account_run = db.get(AccountRun, account_run_id)
+    if account_run is None or account_run.workspace_id != user.workspace_id or account_run.run_id != run.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account run not found")
+
+    stmt = select(Action).where(
+        Action.workspace_id == user.workspace_id,
+        Action.account_run_id == account_run.id,
+        Action.created_at >= actions_created_after(run.created_at),
+    )
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                Action.created_at > cursor_created_at,
+                and_(Action.created_at == cursor_created_at, Action.id > cursor_id),
+            )
+        )
+
+    actions = db.scalars(stmt.order_by(Action.created_at.asc(), Action.id.asc()).limit(limit + 1)).all()
+    next_cursor = None
+    if len(actions) > limit:
+        actions = actions[:limit]
+        next_cursor = _encode_cursor(actions[-1].created_at, actions[-1].id)
+
+    artifacts_by_action_id = _load_artifacts_by_action_id(db, user=user, action_ids=[a.id for a in actions])
+    return ActionPage(
+        items=[_to_action_public(action, artifacts_by_action_id) for action in actions],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/{run_id}", response_model=RunDetail)
 def get_run(run_id: uuid.UUID, user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> RunDetail:
-    run = db.get(Run, run_id)
-    if run is None or run.workspace_id != user.workspace_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    run = _get_workspace_run(db, run_id=run_id, user=user)
 
     account_runs = (
         db.scalars(select(AccountRun).where(AccountRun.workspace_id == user.workspace_id, AccountRun.run_id == run.id))
@@ -42,48 +192,89 @@ def get_run(run_id: uuid.UUID, user: User = Depends(get_current_user), db: Sessi
         actions = (
             db.scalars(
                 select(Action)
-                .where(Action.workspace_id == user.workspace_id, Action.account_run_id.in_(account_run_ids))
+                .where(
+                    Action.workspace_id == user.workspace_id,
+                    Action.account_run_id.in_(account_run_ids),
+                    Action.created_at >= actions_created_after(run.created_at),
+                )
                 .order_by(Action.created_at.asc())
             )
             .all()
         )
 
-    action_ids = [a.id for a in actions]
-    artifacts_by_action_id: dict[uuid.UUID, list[ArtifactPublic]] = {}
-    if action_ids:
-        artifacts = (
-            db.scalars(
-                select(Artifact)
-                .where(Artifact.workspace_id == user.workspace_id, Artifact.action_id.in_(action_ids))
-                .order_by(Artifact.created_at.asc())
-            )
-            .all()
-        )
-        for art in artifacts:
-            artifacts_by_action_id.setdefault(art.action_id, []).append(ArtifactPublic.model_validate(art, from_attributes=True))
-
-    def to_action_public(action: Action) -> ActionPublic:
-        metadata = action.metadata_ if isinstance(action.metadata_, dict) else {}
-        return ActionPublic(
-            id=action.id,
-            workspace_id=action.workspace_id,
-            account_run_id=action.account_run_id,
-            action_type=action.action_type,
-            platform_key=action.platform_key,
-            target_external_id=action.target_external_id,
-            target_url=action.target_url,
-            idempotency_key=action.idempotency_key,
-            status=action.status,
-            error_code=action.error_code,
-            metadata=metadata,
-            artifacts=artifacts_by_action_id.get(action.id, []),
-            created_at=action.created_at,
-            started_at=action.started_at,
-            finished_at=action.finished_at,
-        )
-
+    artifacts_by_action_id = _load_artifacts_by_action_id(db, user=user, action_ids=[a.id for a in actions])
     return RunDetail(
         run=RunPublic.model_validate(run, from_attributes=True),
         account_runs=[AccountRunPublic.model_validate(ar, from_attributes=True) for ar in account_runs],
-        actions=[to_action_public(action) for action in actions],
+        actions=[_to_action_public(action, artifacts_by_action_id) for action in actions],
     )
+
+
+def _get_workspace_run(db: Session, *, run_id: uuid.UUID, user: User) -> Run:
+    run = db.get(Run, run_id)
+    if run is None or run.workspace_id != user.workspace_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    return run
+
+
+def _load_run_snapshot(*, run_id: uuid.UUID, workspace_id: uuid.UUID) -> dict | None:
+    with SessionLocal() as db:
+        run = db.get(Run, run_id)
+        if run is None or run.workspace_id != workspace_id:
+            return None
+        summary = RunSummary(run=RunPublic.model_validate(run, from_attributes=True), **get_run_summary(db, run))
+        return summary.model_dump(mode="json")
+
+
+def _load_artifacts_by_action_id(
+    db: Session, *, user: User, action_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, list[ArtifactPublic]]:
+    artifacts_by_action_id: dict[uuid.UUID, list[ArtifactPublic]] = {}
+    if not action_ids:
+        return artifacts_by_action_id
+    artifacts = (
+        db.scalars(
+            select(Artifact)
+            .where(Artifact.workspace_id == user.workspace_id, Artifact.action_id.in_(action_ids))
+            .order_by(Artifact.created_at.asc())
+        )
+        .all()
+    )
+    for art in artifacts:
+        artifacts_by_action_id.setdefault(art.action_id, []).append(ArtifactPublic.model_validate(art, from_attributes=True))
+    return artifacts_by_action_id
+
+
+def _to_action_public(action: Action, artifacts_by_action_id: dict[uuid.UUID, list[ArtifactPublic]]) -> ActionPublic:
+    metadata = action.metadata_ if isinstance(action.metadata_, dict) else {}
+    return ActionPublic(
+        id=action.id,
+        workspace_id=action.workspace_id,
+        account_run_id=action.account_run_id,
+        action_type=action.action_type,
+        platform_key=action.platform_key,
+        target_external_id=action.target_external_id,
+        target_url=action.target_url,
+        idempotency_key=action.idempotency_key,
+        status=action.status,
+        error_code=action.error_code,
+        metadata=metadata,
+        artifacts=artifacts_by_action_id.get(action.id, []),
+        created_at=action.created_at,
+        started_at=action.started_at,
+        finished_at=action.finished_at,
+    )
+
+
+def _encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, _, id_raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").partition("|")
+        return datetime.fromisoformat(created_raw), uuid.UUID(id_raw)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
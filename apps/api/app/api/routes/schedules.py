@@ -16,10 +16,12 @@ from app.models.strategy import Strategy
 from app.models.user import User
 from app.schemas.run import RunPublic
 from app.schemas.schedule import CreateScheduleRequest, SchedulePublic, UpdateScheduleRequest
+from app.services.schedule_occupancy import estimate_schedule_minutes, load_occupancy_calendar
 from app.services.schedule_planner import compute_next_run_at
 from app.services.subscription import (
     effective_parallel_limit,
     get_current_month_period_start,
+    get_pending_runtime_seconds,
     get_workspace_subscription,
     get_workspace_usage_monthly,
     has_remaining_runtime_quota,
@@ -57,6 +59,15 @@ def _resolve_accounts(db: Session, workspace_id: uuid.UUID, selector: dict) -> l
     ).all()
 
 
+def _require_next_run(frequency: str, next_run_at: datetime | None) -> None:
+    # Only manual schedules have no next run; anything else would be recomputed on every tick forever.
+    if str(frequency).strip().lower() != "manual" and next_run_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Schedule never fires: invalid cron expression or no run time inside weekdays/active_hours",
+        )
+
+
 @router.get("", response_model=list[SchedulePublic])
 def list_schedules(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> list[SchedulePublic]:
     rows = (
@@ -78,6 +89,15 @@ def create_schedule(
 
     selector = payload.account_selector or {"all": True}
     now = utc_now()
+    next_run_at = compute_next_run_at(
+        frequency=payload.frequency,
+        schedule_spec=payload.schedule_spec,
+        random_config=payload.random_config,
+        now=now,
+        occupancy=load_occupancy_calendar(db, now=now),
+        cost_minutes=estimate_schedule_minutes(payload.max_parallel),
+    )
+    _require_next_run(payload.frequency, next_run_at)
     row = Schedule(
         workspace_id=user.workspace_id,
         name=payload.name,
@@ -88,12 +108,7 @@ def create_schedule(
         schedule_spec=payload.schedule_spec,
         random_config=payload.random_config,
         max_parallel=payload.max_parallel,
-        next_run_at=compute_next_run_at(
-            frequency=payload.frequency,
-            schedule_spec=payload.schedule_spec,
-            random_config=payload.random_config,
-            now=now,
-        ),
+        next_run_at=next_run_at,
     )
     db.add(row)
     db.commit()
@@ -128,12 +143,16 @@ def update_schedule(
         row.max_parallel = payload.max_parallel
 
     if payload.frequency is not None or payload.schedule_spec is not None or payload.random_config is not None:
+        now = utc_now()
         row.next_run_at = compute_next_run_at(
             frequency=row.frequency,
             schedule_spec=row.schedule_spec or {},
             random_config=row.random_config or {},
-            now=utc_now(),
+            now=now,
+            occupancy=load_occupancy_calendar(db, now=now, exclude_schedule_ids=[row.id]),
+            cost_minutes=estimate_schedule_minutes(row.max_parallel),
         )
+        _require_next_run(row.frequency, row.next_run_at)
 
     db.add(row)
     db.commit()
@@ -165,7 +184,11 @@ def run_now(
 
     period_start = get_current_month_period_start(now)
     usage = get_workspace_usage_monthly(db, workspace_id=user.workspace_id, period_start=period_start)
-    runtime_check = has_remaining_runtime_quota(subscription, usage)
+    runtime_check = has_remaining_runtime_quota(
+        subscription,
+        usage,
+        pending_seconds=get_pending_runtime_seconds(workspace_id=user.workspace_id, period_start=period_start),
+    )
     if not runtime_check.allowed:
         raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail=runtime_check.reason or "Runtime quota exceeded")
 
@@ -205,12 +228,15 @@ def run_now(
         except Exception:
             pass
 
-    schedule.last_run_at = utc_now()
+    now = utc_now()
+    schedule.last_run_at = now
     schedule.next_run_at = compute_next_run_at(
         frequency=schedule.frequency,
         schedule_spec=schedule.schedule_spec or {},
         random_config=schedule.random_config or {},
-        now=utc_now(),
+        now=now,
+        occupancy=load_occupancy_calendar(db, now=now, exclude_schedule_ids=[schedule.id]),
+        cost_minutes=estimate_schedule_minutes(schedule.max_parallel),
     )
     db.add(schedule)
     db.commit()
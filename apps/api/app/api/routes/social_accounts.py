@@ -15,7 +15,6 @@ from app.schemas.login_session import LoginSessionPublic
 from app.schemas.social_account import CreateSocialAccountRequest, SocialAccountPublic
 from app.services.browser_cluster import browser_cluster
 from app.services.fingerprint import generate_fingerprint_profile
-from app.services.login_session_auto_capture import start_auto_capture
 from app.services.subscription import enforce_max_social_accounts, get_workspace_subscription
 from app.utils.time import utc_now
 
@@ -105,7 +104,6 @@ def create_login_session(
         db.add(row)
         db.commit()
         db.refresh(row)
-        start_auto_capture(row.id)
     except Exception:
         row.status = "failed"
         db.add(row)
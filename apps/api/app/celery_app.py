@@ -13,6 +13,18 @@ celery_app.conf.beat_schedule = {
         "task": "syncsocial.tick_schedules",
         "schedule": 30.0,
     },
+    "syncsocial-flush-usage-counters": {
+        "task": "syncsocial.flush_usage_counters",
+        "schedule": 60.0,
+    },
+    "syncsocial-expire-login-sessions": {
+        "task": "syncsocial.expire_login_sessions",
+        "schedule": 60.0,
+    },
+    "syncsocial-maintain-partitions": {
+        "task": "syncsocial.maintain_partitions",
+        "schedule": 24 * 60 * 60.0,
+    },
     "syncsocial-cleanup-artifacts": {
         "task": "syncsocial.cleanup_artifacts",
         "schedule": 6 * 60 * 60.0,
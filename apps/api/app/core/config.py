@@ -39,12 +39,52 @@ class Settings(BaseSettings):
     browser_node_internal_token: str | None = Field(default=None, alias="BROWSER_NODE_INTERNAL_TOKEN")
 
     login_session_auto_capture: bool = Field(default=True, alias="LOGIN_SESSION_AUTO_CAPTURE")
+    login_session_poll_interval_seconds: float = Field(default=3.0, alias="LOGIN_SESSION_POLL_INTERVAL_SECONDS")
+    login_session_push_enabled: bool = Field(default=False, alias="LOGIN_SESSION_PUSH")
 
     artifacts_dir: str = Field(default=".local/artifacts", alias="ARTIFACTS_DIR")
+    artifact_thumbnails_dir: str = Field(default=".local/artifact-thumbnails", alias="ARTIFACT_THUMBNAILS_DIR")
+    artifact_storage_backend: str = Field(default="local", alias="ARTIFACT_STORAGE_BACKEND")
+    artifact_s3_bucket: str | None = Field(default=None, alias="ARTIFACT_S3_BUCKET")
+    artifact_s3_endpoint_url: str | None = Field(default=None, alias="ARTIFACT_S3_ENDPOINT_URL")
+    artifact_s3_region: str | None = Field(default=None, alias="ARTIFACT_S3_REGION")
+    artifact_s3_access_key_id: str | None = Field(default=None, alias="ARTIFACT_S3_ACCESS_KEY_ID")
+    artifact_s3_secret_access_key: str | None = Field(default=None, alias="ARTIFACT_S3_SECRET_ACCESS_KEY")
+    artifact_s3_prefix: str = Field(default="", alias="ARTIFACT_S3_PREFIX")
+    artifact_cleanup_batch_size: int = Field(default=5000, alias="ARTIFACT_CLEANUP_BATCH_SIZE")
+    artifact_cleanup_workers: int = Field(default=8, alias="ARTIFACT_CLEANUP_WORKERS")
+    artifact_blob_grace_seconds: int = Field(default=3600, alias="ARTIFACT_BLOB_GRACE_SECONDS")
+
+    partition_months_ahead: int = Field(default=2, alias="PARTITION_MONTHS_AHEAD")
+    partition_archive_dir: str = Field(default=".local/archive", alias="PARTITION_ARCHIVE_DIR")
+    actions_retention_months: int = Field(default=6, alias="ACTIONS_RETENTION_MONTHS")
+    audit_logs_retention_months: int = Field(default=12, alias="AUDIT_LOGS_RETENTION_MONTHS")
 
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
     celery_task_always_eager: bool = Field(default=False, alias="CELERY_TASK_ALWAYS_EAGER")
 
+    principal_cache_ttl_seconds: int = Field(default=60, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_local_cache_ttl_seconds: int = Field(default=5, alias="PRINCIPAL_LOCAL_CACHE_TTL_SECONDS")
+
+    session_lease_seconds: int = Field(default=1800, alias="SESSION_LEASE_SECONDS")
+    session_limit_defer_seconds: int = Field(default=30, alias="SESSION_LIMIT_DEFER_SECONDS")
+
+    schedule_slot_minutes: int = Field(default=5, alias="SCHEDULE_SLOT_MINUTES")
+    schedule_default_spread_minutes: int = Field(default=15, alias="SCHEDULE_DEFAULT_SPREAD_MINUTES")
+    schedule_occupancy_horizon_hours: int = Field(default=48, alias="SCHEDULE_OCCUPANCY_HORIZON_HOURS")
+    schedule_minutes_per_account_run: int = Field(default=3, alias="SCHEDULE_MINUTES_PER_ACCOUNT_RUN")
+
+    account_run_max_retries: int = Field(default=3, alias="ACCOUNT_RUN_MAX_RETRIES")
+    run_retry_budget: int = Field(default=20, alias="RUN_RETRY_BUDGET")
+    retry_backoff_base_seconds: int = Field(default=30, alias="RETRY_BACKOFF_BASE_SECONDS")
+    retry_backoff_max_seconds: int = Field(default=900, alias="RETRY_BACKOFF_MAX_SECONDS")
+
+    action_pacing_enabled: bool = Field(default=True, alias="ACTION_PACING_ENABLED")
+    action_page_parallelism: int = Field(default=1, alias="ACTION_PAGE_PARALLELISM")
+    action_pacing_budgets: dict[str, dict[str, dict[str, float]]] = Field(
+        default_factory=dict, alias="ACTION_PACING_BUDGETS"
+    )
+
     def normalized_cors_origins(self) -> list[str]:
         value: Any = self.cors_origins
         if isinstance(value, str):
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.core.config import settings
+
+redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
+async_redis_client = AsyncRedis.from_url(settings.redis_url, decode_responses=True)
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.core.security import decode_access_token
 from app.db.session import get_db_session
 from app.models.user import User
+from app.services.principal_cache import principal_cache, principal_from_user, user_from_principal
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -25,7 +26,6 @@ def get_db() -> Session:
 
 def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
-    db: Annotated[Session, Depends(get_db)],
 ) -> User:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
@@ -44,8 +44,17 @@ def get_current_user(
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload") from None
 
-    user = db.get(User, user_id)
-    if user is None or user.status != "active":
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        with get_db_session() as db:
+            row = db.get(User, user_id)
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User disabled or not found")
+            principal = principal_from_user(row)
+        principal_cache.set(user_id, principal)
+
+    user = user_from_principal(principal)
+    if user.status != "active":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User disabled or not found")
     return user
 
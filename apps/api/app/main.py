@@ -1,10 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
+from app.services.login_session_auto_capture import run_login_session_watcher
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    stop_event = asyncio.Event()
+    watcher = asyncio.create_task(run_login_session_watcher(stop_event))
+    try:
+        yield
+    finally:
+        stop_event.set()
+        await watcher
+
 
-app = FastAPI(title="SyncSocial API", version="0.1.0")
+app = FastAPI(title="SyncSocial API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,6 +1,7 @@
 from app.models.audit_log import AuditLog
 from app.models.artifact import Artifact
-from app.models.action import Action
+from app.models.action import Action, ActionIdempotencyKey
+from app.models.action_rollup import ActionRollupHourly
 from app.models.account_run import AccountRun
 from app.models.credential import Credential
 from app.models.login_session import LoginSession
@@ -16,6 +17,8 @@ from app.models.workspace import Workspace
 __all__ = [
     "AccountRun",
     "Action",
+    "ActionIdempotencyKey",
+    "ActionRollupHourly",
     "Artifact",
     "AuditLog",
     "Credential",
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, UniqueConstraint, Uuid, func
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -11,7 +11,10 @@ from app.db.base import Base
 
 class Action(Base):
     __tablename__ = "actions"
-    __table_args__ = (UniqueConstraint("workspace_id", "idempotency_key"),)
+    __table_args__ = (
+        Index("ix_actions_account_run_created", "account_run_id", "created_at", "id"),
+        Index("ix_actions_workspace_idempotency_key", "workspace_id", "idempotency_key"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -41,3 +44,16 @@ class Action(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+
+
+class ActionIdempotencyKey(Base):
+    __tablename__ = "action_idempotency_keys"
+
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(),
+        ForeignKey("workspaces.id", ondelete="RESTRICT"),
+        primary_key=True,
+    )
+    idempotency_key: Mapped[str] = mapped_column(String(500), primary_key=True)
+    action_id: Mapped[uuid.UUID] = mapped_column(Uuid(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
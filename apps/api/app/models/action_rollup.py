@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ActionRollupHourly(Base):
+    __tablename__ = "action_rollups_hourly"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "bucket_start",
+            "social_account_id",
+            "strategy_id",
+            "action_type",
+            "status",
+            "error_code",
+            name="uq_action_rollups_hourly_key",
+        ),
+        Index("ix_action_rollups_hourly_workspace_bucket", "workspace_id", "bucket_start"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(), primary_key=True, default=uuid.uuid4)
+    workspace_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(),
+        ForeignKey("workspaces.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    social_account_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(),
+        ForeignKey("social_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    strategy_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(),
+        ForeignKey("strategies.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    action_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    error_code: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Uuid, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -11,6 +11,7 @@ from app.db.base import Base
 
 class Artifact(Base):
     __tablename__ = "artifacts"
+    __table_args__ = (Index("ix_artifacts_workspace_content_hash", "workspace_id", "content_hash"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(), primary_key=True, default=uuid.uuid4)
     workspace_id: Mapped[uuid.UUID] = mapped_column(
@@ -19,15 +20,11 @@ class Artifact(Base):
         nullable=False,
         index=True,
     )
-    action_id: Mapped[uuid.UUID] = mapped_column(
-        Uuid(),
-        ForeignKey("actions.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True,
-    )
+    action_id: Mapped[uuid.UUID] = mapped_column(Uuid(), nullable=False, index=True)
 
     type: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     storage_key: Mapped[str] = mapped_column(String(1000), nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     size: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ActionSeriesPoint(BaseModel):
+    bucket_start: datetime
+    count: int
+    social_account_id: UUID | None = None
+    strategy_id: UUID | None = None
+    action_type: str | None = None
+    status: str | None = None
+    error_code: str | None = None
+
+
+class ActionSeries(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    group_by: list[str]
+    points: list[ActionSeriesPoint]
@@ -15,6 +15,7 @@ class ArtifactPublic(BaseModel):
     action_id: UUID
     type: str
     storage_key: str
+    content_hash: str | None = None
     size: int | None
     created_at: datetime
 
@@ -27,10 +27,31 @@ class AccountRunPublic(BaseModel):
     social_account_id: UUID
     status: str
     error_code: str | None
+    attempt_count: int = 0
     started_at: datetime | None
     finished_at: datetime | None
 
 
+class RunSummary(BaseModel):
+    run: RunPublic
+    account_run_total: int = 0
+    account_runs_by_status: dict[str, int] = {}
+    account_run_error_codes: dict[str, int] = {}
+    action_total: int = 0
+    actions_by_type: dict[str, dict[str, int]] = {}
+    action_error_codes: dict[str, int] = {}
+
+
+class AccountRunPage(BaseModel):
+    items: list[AccountRunPublic]
+    next_cursor: str | None = None
+
+
+class ActionPage(BaseModel):
+    items: list[ActionPublic]
+    next_cursor: str | None = None
+
+
 class RunDetail(BaseModel):
     run: RunPublic
     account_runs: list[AccountRunPublic]
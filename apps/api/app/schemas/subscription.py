@@ -48,4 +48,5 @@ class AdminSubscriptionOverview(BaseModel):
     current_month_usage: WorkspaceUsageMonthlyPublic | None
     active: bool
     active_reason: str | None = None
+    pending_runtime_seconds: int = 0
 
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.action import Action
+from app.models.action_rollup import ActionRollupHourly
+from app.utils.time import ensure_utc
+
+ROLLUP_DIMENSIONS = ("social_account_id", "strategy_id", "action_type", "status", "error_code")
+_FINISHED_STATUSES = {"succeeded", "failed", "skipped"}
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return ensure_utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def record_action_outcomes(
+    db: Session,
+    *,
+    social_account_id: uuid.UUID,
+    strategy_id: uuid.UUID,
+    actions: Iterable[Action],
+) -> None:
+    counts = _outcome_counts(actions)
+    if not counts:
+        return
+
+    bind = db.get_bind()
+    is_postgres = bind is not None and getattr(bind.dialect, "name", "") == "postgresql"
+    for (workspace_id, bucket_start, action_type, status_value, error_code), count in counts.items():
+        values = {
+            "workspace_id": workspace_id,
+            "bucket_start": bucket_start,
+            "social_account_id": social_account_id,
+            "strategy_id": strategy_id,
+            "action_type": action_type,
+            "status": status_value,
+            "error_code": error_code,
+        }
+        if is_postgres:
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            stmt = pg_insert(ActionRollupHourly).values(id=uuid.uuid4(), count=count, **values)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_action_rollups_hourly_key",
+                set_={
+                    "count": ActionRollupHourly.count + stmt.excluded.count,
+                    "updated_at": func.now(),
+                },
+            )
+            db.execute(stmt)
+            continue
+
+        row = db.scalar(
+            select(ActionRollupHourly).where(*[getattr(ActionRollupHourly, key) == value for key, value in values.items()])
+        )
+        if row is None:
+            row = ActionRollupHourly(count=0, **values)
+        row.count = int(row.count or 0) + count
+        db.add(row)
+
+
+def retract_action_outcomes(
+    db: Session,
+    *,
+    social_account_id: uuid.UUID,
+    strategy_id: uuid.UUID,
+    actions: Iterable[Action],
+) -> None:
+    # Called before a recorded attempt is re-queued for retry, so only the final attempt stays counted.
+    counts = _outcome_counts(actions)
+    for (workspace_id, bucket_start, action_type, status_value, error_code), count in counts.items():
+        db.execute(
+            update(ActionRollupHourly)
+            .where(
+                ActionRollupHourly.workspace_id == workspace_id,
+                ActionRollupHourly.bucket_start == bucket_start,
+                ActionRollupHourly.social_account_id == social_account_id,
+                ActionRollupHourly.strategy_id == strategy_id,
+                ActionRollupHourly.action_type == action_type,
+                ActionRollupHourly.status == status_value,
+                ActionRollupHourly.error_code == error_code,
+            )
+            .values(
+                count=case((ActionRollupHourly.count > count, ActionRollupHourly.count - count), else_=0),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _outcome_counts(actions: Iterable[Action]) -> Counter[tuple]:
+    counts: Counter[tuple] = Counter()
+    for action in actions:
+        if action.status not in _FINISHED_STATUSES or action.finished_at is None:
+            continue
+        key = (
+            action.workspace_id,
+            hour_bucket(action.finished_at),
+            action.action_type,
+            action.status,
+            action.error_code or "",
+        )
+        counts[key] += 1
+    return counts
+
+
+def query_action_series(
+    db: Session,
+    *,
+    workspace_id: uuid.UUID,
+    start: datetime,
+    end: datetime,
+    granularity: str,
+    group_by: list[str],
+    social_account_id: uuid.UUID | None = None,
+    strategy_id: uuid.UUID | None = None,
+    action_type: str | None = None,
+) -> list[dict]:
+    dimensions = [name for name in ROLLUP_DIMENSIONS if name in group_by]
+    columns = [getattr(ActionRollupHourly, name) for name in dimensions]
+
+    stmt = select(ActionRollupHourly.bucket_start, *columns, func.sum(ActionRollupHourly.count)).where(
+        ActionRollupHourly.workspace_id == workspace_id,
+        ActionRollupHourly.bucket_start >= hour_bucket(start),
+        ActionRollupHourly.bucket_start < ensure_utc(end),
+    )
+    if social_account_id is not None:
+        stmt = stmt.where(ActionRollupHourly.social_account_id == social_account_id)
+    if strategy_id is not None:
+        stmt = stmt.where(ActionRollupHourly.strategy_id == strategy_id)
+    if action_type:
+        stmt = stmt.where(ActionRollupHourly.action_type == action_type)
+    stmt = stmt.group_by(ActionRollupHourly.bucket_start, *columns)
+
+    totals: dict[tuple, int] = {}
+    for row in db.execute(stmt).all():
+        bucket = ensure_utc(row[0])
+        if granularity == "day":
+            bucket = bucket.replace(hour=0)
+        key = (bucket, *row[1:-1])
+        totals[key] = totals.get(key, 0) + int(row[-1] or 0)
+
+    points: list[dict] = []
+    for key in sorted(totals, key=lambda item: tuple(str(part) for part in item)):
+        point = {"bucket_start": key[0], "count": totals[key]}
+        point.update({name: value for name, value in zip(dimensions, key[1:], strict=True)})
+        points.append(point)
+    return points
+
+
+def default_series_window(now: datetime, *, granularity: str) -> tuple[datetime, datetime]:
+    end = hour_bucket(now) + timedelta(hours=1)
+    span = timedelta(days=30) if granularity == "day" else timedelta(days=2)
+    return end - span, end
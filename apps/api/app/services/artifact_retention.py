@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.artifact import Artifact
+from app.services.artifact_storage import release_artifact_objects
+
+
+def purge_expired_artifacts(db: Session, *, workspace_id: uuid.UUID, cutoff: datetime) -> int:
+    batch_size = max(1, settings.artifact_cleanup_batch_size)
+    deleted = 0
+    while True:
+        expired_ids = (
+            select(Artifact.id)
+            .where(Artifact.workspace_id == workspace_id, Artifact.created_at < cutoff)
+            .limit(batch_size)
+        )
+        rows = [
+            (row.workspace_id, str(row.storage_key), row.content_hash)
+            for row in db.execute(
+                delete(Artifact)
+                .where(Artifact.id.in_(expired_ids))
+                .returning(Artifact.workspace_id, Artifact.storage_key, Artifact.content_hash)
+                .execution_options(synchronize_session=False)
+            ).all()
+        ]
+        db.commit()
+        if not rows:
+            break
+        deleted += len(rows)
+        exhausted = len(rows) < batch_size
+        release_artifact_objects(db, rows)
+        if exhausted:
+            break
+    return deleted
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.artifact import Artifact
+
+THUMBNAIL_WIDTHS = (160, 320, 640)
+
+
+class ThumbnailDecodeError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    storage_key: str
+    content_hash: str
+    size: int
+
+
+class LocalArtifactStorage:
+    def __init__(self, *, base_dir: str) -> None:
+        self._base_dir = Path(base_dir)
+
+    def local_path(self, key: str) -> Path | None:
+        base_dir = self._base_dir.resolve()
+        path = (base_dir / key).resolve()
+        if not path.is_relative_to(base_dir):
+            return None
+        return path
+
+    def exists(self, key: str) -> bool:
+        path = self.local_path(key)
+        return path is not None and path.is_file()
+
+    def modified_at(self, key: str) -> float | None:
+        path = self.local_path(key)
+        try:
+            return path.stat().st_mtime if path is not None else None
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes, *, content_type: str) -> None:
+        path = self.local_path(key)
+        if path is None:
+            raise ValueError("Invalid artifact storage key")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def get(self, key: str) -> bytes | None:
+        path = self.local_path(key)
+        if path is None or not path.is_file():
+            return None
+        return path.read_bytes()
+
+    def get_range(self, key: str, start: int, end: int) -> bytes | None:
+        path = self.local_path(key)
+        if path is None or not path.is_file():
+            return None
+        with path.open("rb") as fh:
+            fh.seek(start)
+            return fh.read(end - start + 1)
+
+    def delete(self, key: str) -> None:
+        path = self.local_path(key)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+class S3ArtifactStorage:
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        prefix: str = "",
+    ) -> None:
+        try:
+            import boto3
+        except Exception as exc:  # pragma: no cover
+            raise RuntimeError("boto3 is not installed; run pip install boto3") from exc
+
+        self._bucket = bucket
+        self._prefix = prefix.strip("/")
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self._prefix}/{key}" if self._prefix else key
+
+    def local_path(self, key: str) -> Path | None:
+        return None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self._bucket, Key=self._object_key(key))
+        except Exception:
+            return False
+        return True
+
+    def modified_at(self, key: str) -> float | None:
+        try:
+            response = self._client.head_object(Bucket=self._bucket, Key=self._object_key(key))
+        except Exception:
+            return None
+        return response["LastModified"].timestamp()
+
+    def put(self, key: str, data: bytes, *, content_type: str) -> None:
+        self._client.put_object(Bucket=self._bucket, Key=self._object_key(key), Body=data, ContentType=content_type)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            response = self._client.get_object(Bucket=self._bucket, Key=self._object_key(key))
+        except Exception:
+            return None
+        return response["Body"].read()
+
+    def get_range(self, key: str, start: int, end: int) -> bytes | None:
+        try:
+            response = self._client.get_object(
+                Bucket=self._bucket, Key=self._object_key(key), Range=f"bytes={start}-{end}"
+            )
+        except Exception:
+            return None
+        return response["Body"].read()
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self._bucket, Key=self._object_key(key))
+
+
+def blob_storage_key(workspace_id: uuid.UUID, content_hash: str, *, extension: str) -> str:
+    return f"{workspace_id}/blobs/{content_hash[:2]}/{content_hash}{extension}"
+
+
+def store_artifact_blob(workspace_id: uuid.UUID, data: bytes, *, extension: str, content_type: str) -> StoredBlob:
+    content_hash = hashlib.sha256(data).hexdigest()
+    key = blob_storage_key(workspace_id, content_hash, extension=extension)
+    # Always rewritten, even when the blob exists: the fresh modification time keeps retention from
+    # deleting it before the artifact row referencing it is committed.
+    artifact_storage.put(key, data, content_type=content_type)
+    return StoredBlob(storage_key=key, content_hash=content_hash, size=len(data))
+
+
+def thumbnail_path(storage_key: str, *, width: int) -> Path | None:
+    base_dir = Path(settings.artifact_thumbnails_dir).resolve()
+    path = (base_dir / f"{storage_key}.w{width}.webp").resolve()
+    if not path.is_relative_to(base_dir):
+        return None
+    return path
+
+
+def get_or_create_thumbnail(storage_key: str, *, width: int) -> Path | None:
+    path = thumbnail_path(storage_key, width=width)
+    if path is None:
+        return None
+    if path.is_file():
+        return path
+
+    payload = artifact_storage.get(storage_key)
+    if payload is None:
+        return None
+
+    try:
+        from PIL import Image
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("Pillow is not installed; run pip install pillow") from exc
+
+    # Only decoding is mapped to ThumbnailDecodeError; failures writing the cache below surface as they are.
+    try:
+        with Image.open(io.BytesIO(payload)) as image:
+            image.thumbnail((width, width * 4))
+            if image.mode not in {"RGB", "RGBA"}:
+                image = image.convert("RGBA")
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=80, method=4)
+    except OSError as exc:
+        # PIL.UnidentifiedImageError is an OSError, as are truncated or corrupt image payloads.
+        raise ThumbnailDecodeError("Artifact is not an image") from exc
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(buffer.getvalue())
+    tmp_path.replace(path)
+    return path
+
+
+def remove_cached_thumbnails(storage_key: str) -> None:
+    for width in THUMBNAIL_WIDTHS:
+        path = thumbnail_path(storage_key, width=width)
+        if path is None:
+            continue
+        try:
+            path.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+def delete_artifact_objects(storage_keys: list[str], *, grace_seconds: int = 0) -> None:
+    if not storage_keys:
+        return
+    fresh_after = time.time() - grace_seconds
+
+    def _delete(key: str) -> None:
+        if grace_seconds > 0:
+            modified_at = artifact_storage.modified_at(key)
+            if modified_at is not None and modified_at >= fresh_after:
+                return
+        try:
+            artifact_storage.delete(key)
+        except Exception:
+            pass
+        remove_cached_thumbnails(key)
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.artifact_cleanup_workers)) as pool:
+        list(pool.map(_delete, storage_keys))
+
+
+def release_artifact_objects(db: Session, rows: list[tuple[uuid.UUID, str, str | None]]) -> int:
+    # rows are (workspace_id, storage_key, content_hash) of artifacts that were just deleted;
+    # content-addressed blobs are only removed once no remaining artifact references them.
+    legacy_keys = sorted({key for _, key, content_hash in rows if not content_hash})
+    shared = {(workspace_id, content_hash): key for workspace_id, key, content_hash in rows if content_hash}
+
+    referenced: set[tuple[uuid.UUID, str]] = set()
+    by_workspace: dict[uuid.UUID, list[str]] = {}
+    for workspace_id, content_hash in shared:
+        by_workspace.setdefault(workspace_id, []).append(content_hash)
+    for workspace_id, hashes in by_workspace.items():
+        for start in range(0, len(hashes), 1000):
+            chunk = hashes[start : start + 1000]
+            for content_hash in db.scalars(
+                select(Artifact.content_hash)
+                .where(Artifact.workspace_id == workspace_id, Artifact.content_hash.in_(chunk))
+                .distinct()
+            ).all():
+                referenced.add((workspace_id, str(content_hash)))
+
+    orphaned = sorted(key for ref, key in shared.items() if ref not in referenced)
+    delete_artifact_objects(legacy_keys)
+    delete_artifact_objects(orphaned, grace_seconds=max(0, settings.artifact_blob_grace_seconds))
+    return len(legacy_keys) + len(orphaned)
+
+
+def _build_artifact_storage() -> LocalArtifactStorage | S3ArtifactStorage:
+    if settings.artifact_storage_backend.strip().lower() == "s3":
+        if not settings.artifact_s3_bucket:
+            raise RuntimeError("ARTIFACT_S3_BUCKET is required when ARTIFACT_STORAGE_BACKEND=s3")
+        return S3ArtifactStorage(
+            bucket=settings.artifact_s3_bucket,
+            endpoint_url=settings.artifact_s3_endpoint_url,
+            region=settings.artifact_s3_region,
+            access_key_id=settings.artifact_s3_access_key_id,
+            secret_access_key=settings.artifact_s3_secret_access_key,
+            prefix=settings.artifact_s3_prefix,
+        )
+    return LocalArtifactStorage(base_dir=settings.artifacts_dir)
+
+
+artifact_storage = _build_artifact_storage()
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import threading
 import uuid
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from redis.exceptions import RedisError
+
 from app.core.config import settings
+from app.core.redis import redis_client
 from app.platforms.registry import get_login_adapter
 
+_PROFILE_AFFINITY_KEY_PREFIX = "syncsocial:browser-profile-affinity"
+_PROFILE_AFFINITY_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class BrowserNodeError(RuntimeError):
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# Must match the browser node's hashing so both sides agree on cache keys.
+def storage_state_hash(storage_state: dict) -> str:
+    payload = json.dumps(storage_state, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 @dataclass
 class LoginRuntime:
@@ -72,6 +92,21 @@ class LocalPlaywrightBrowserCluster:
         cookies = runtime.context.cookies(adapter.get_cookie_origin())
         return adapter.is_logged_in(cookies=cookies)
 
+    def is_logged_in_batch(self, *, login_session_ids: list[uuid.UUID]) -> dict[uuid.UUID, bool | None]:
+        states: dict[uuid.UUID, bool | None] = {}
+        for login_session_id in login_session_ids:
+            try:
+                states[login_session_id] = self.is_logged_in(login_session_id=login_session_id)
+            except KeyError:
+                states[login_session_id] = None
+            except Exception:
+                continue
+        return states
+
+    def login_session_ids(self) -> list[uuid.UUID]:
+        with self._lock:
+            return list(self._sessions)
+
     def export_storage_state(self, *, login_session_id: uuid.UUID) -> dict:
         with self._lock:
             runtime = self._sessions.get(login_session_id)
@@ -114,6 +149,9 @@ class LocalPlaywrightBrowserCluster:
         actions: list[dict],
         bandwidth_mode: str | None = None,
         fingerprint_profile: dict | None = None,
+        profile_key: str | None = None,
+        on_storage_state: Callable[[dict], None] | None = None,
+        parallelism: int = 1,
     ) -> list[dict]:
         raise RuntimeError("Local browser cluster does not support action execution yet; use BROWSER_CLUSTER_MODE=remote")
 
@@ -123,10 +161,12 @@ class RemoteBrowserCluster:
         self._base_url = base_url.rstrip("/")
         self._internal_token = internal_token.strip() if internal_token and internal_token.strip() else None
 
-    def _request_json(self, method: str, path: str, payload: dict | None = None) -> dict:
+    def _request_json(
+        self, method: str, path: str, payload: dict | None = None, *, extra_headers: dict[str, str] | None = None
+    ) -> dict:
         url = f"{self._base_url}{path}"
         data = None
-        headers = {"accept": "application/json"}
+        headers = {"accept": "application/json", **(extra_headers or {})}
         if self._internal_token:
             headers["x-internal-token"] = self._internal_token
         if payload is not None:
@@ -138,7 +178,7 @@ class RemoteBrowserCluster:
             with urlopen(req, timeout=30) as resp:
                 body = resp.read()
         except HTTPError as exc:
-            raise RuntimeError(f"Browser node error: {exc.code} {exc.reason}") from exc
+            raise BrowserNodeError(f"Browser node error: {exc.code} {exc.reason}", status_code=exc.code) from exc
         except URLError as exc:
             raise RuntimeError(f"Browser node unreachable: {exc.reason}") from exc
 
@@ -165,6 +205,23 @@ class RemoteBrowserCluster:
         res = self._request_json("GET", f"/login-sessions/{login_session_id}/is-logged-in")
         return bool(res.get("logged_in"))
 
+    def is_logged_in_batch(self, *, login_session_ids: list[uuid.UUID]) -> dict[uuid.UUID, bool | None]:
+        res = self._request_json(
+            "POST",
+            "/login-sessions/is-logged-in",
+            {"login_session_ids": [str(login_session_id) for login_session_id in login_session_ids]},
+        )
+        results = res.get("results")
+        if not isinstance(results, dict):
+            raise RuntimeError("Browser node returned invalid results")
+        states: dict[uuid.UUID, bool | None] = {}
+        for raw_id, logged_in in results.items():
+            try:
+                states[uuid.UUID(str(raw_id))] = None if logged_in is None else bool(logged_in)
+            except ValueError:
+                continue
+        return states
+
     def export_storage_state(self, *, login_session_id: uuid.UUID) -> dict:
         return self._request_json("GET", f"/login-sessions/{login_session_id}/storage-state")
 
@@ -206,24 +263,64 @@ class RemoteBrowserCluster:
         actions: list[dict],
         bandwidth_mode: str | None = None,
         fingerprint_profile: dict | None = None,
+        profile_key: str | None = None,
+        on_storage_state: Callable[[dict], None] | None = None,
+        parallelism: int = 1,
     ) -> list[dict]:
-        res = self._request_json(
-            "POST",
-            "/automation/actions/execute-batch",
-            {
-                "platform_key": platform_key,
-                "storage_state": storage_state,
-                "bandwidth_mode": bandwidth_mode,
-                "fingerprint_profile": fingerprint_profile or {},
-                "actions": actions,
-            },
-        )
+        state_hash = storage_state_hash(storage_state)
+        payload = {
+            "platform_key": platform_key,
+            "storage_state": None,
+            "storage_state_hash": state_hash,
+            "bandwidth_mode": bandwidth_mode,
+            "fingerprint_profile": fingerprint_profile or {},
+            "profile_key": profile_key,
+            "parallelism": max(1, int(parallelism)),
+            "actions": actions,
+        }
+        headers = _profile_affinity_headers(profile_key)
+        # The node usually has the state cached from an earlier batch; send the body only on a miss.
+        try:
+            res = self._request_json("POST", "/automation/actions/execute-batch", payload, extra_headers=headers)
+        except BrowserNodeError as exc:
+            if exc.status_code != 409:
+                raise
+            payload["storage_state"] = storage_state
+            res = self._request_json("POST", "/automation/actions/execute-batch", payload, extra_headers=headers)
+
         results = res.get("results")
         if not isinstance(results, list):
             raise RuntimeError("Browser node returned invalid results")
+        if profile_key and res.get("node_id"):
+            _remember_profile_affinity(profile_key, str(res["node_id"]))
+        updated = res.get("storage_state")
+        if on_storage_state is not None and isinstance(updated, dict) and res.get("storage_state_hash") != state_hash:
+            on_storage_state(updated)
         return results
 
 
+# A load balancer in front of several nodes can hash on the profile key, or route on the
+# last node that reported holding the account's persistent profile.
+def _profile_affinity_headers(profile_key: str | None) -> dict[str, str]:
+    if not profile_key:
+        return {}
+    headers = {"x-browser-profile-key": profile_key}
+    try:
+        node_id = redis_client.get(f"{_PROFILE_AFFINITY_KEY_PREFIX}:{profile_key}")
+    except RedisError:
+        node_id = None
+    if node_id:
+        headers["x-browser-node-affinity"] = str(node_id)
+    return headers
+
+
+def _remember_profile_affinity(profile_key: str, node_id: str) -> None:
+    try:
+        redis_client.set(f"{_PROFILE_AFFINITY_KEY_PREFIX}:{profile_key}", node_id, ex=_PROFILE_AFFINITY_TTL_SECONDS)
+    except RedisError:
+        pass
+
+
 def _context_kwargs_from_fingerprint(profile: dict) -> dict:
     if not isinstance(profile, dict) or not profile:
         return {}
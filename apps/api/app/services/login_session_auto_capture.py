@@ -1,71 +1,159 @@
 from __future__ import annotations
 
-import threading
-import time
+import asyncio
 import uuid
 
-from sqlalchemy import select
+from fastapi.concurrency import run_in_threadpool
+from redis.exceptions import RedisError
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.crypto import encrypt_json
+from app.core.redis import redis_client
 from app.db.session import SessionLocal
 from app.models.credential import Credential
 from app.models.login_session import LoginSession
 from app.models.social_account import SocialAccount
-from app.services.browser_cluster import browser_cluster
-from app.utils.time import ensure_utc, utc_now
+from app.services.browser_cluster import LocalPlaywrightBrowserCluster, RemoteBrowserCluster, browser_cluster
+from app.utils.time import utc_now
 
-_POLL_INTERVAL_SECONDS = 3
+_LEADER_KEY = "syncsocial:login-sessions:watcher"
+_INSTANCE_ID = uuid.uuid4().hex
+_WATCHED_STATUSES = ("created", "active")
 
 
-def start_auto_capture(login_session_id: uuid.UUID) -> None:
+def auto_capture_enabled() -> bool:
     if not settings.login_session_auto_capture:
-        return
-    if settings.credential_encryption_key is None or not settings.credential_encryption_key.strip():
-        return
+        return False
+    return settings.credential_encryption_key is not None and bool(settings.credential_encryption_key.strip())
 
-    t = threading.Thread(target=_run, args=(login_session_id,), daemon=True)
-    t.start()
 
+async def run_login_session_watcher(stop_event: asyncio.Event) -> None:
+    interval = max(0.5, float(settings.login_session_poll_interval_seconds))
+    while not stop_event.is_set():
+        try:
+            if auto_capture_enabled() and _hold_leadership(interval):
+                await run_in_threadpool(poll_login_sessions_once)
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
 
-def _run(login_session_id: uuid.UUID) -> None:
-    while True:
-        row = _get_session(login_session_id)
-        if row is None:
-            return
 
-        now = utc_now()
-        if row.status in {"succeeded", "failed", "expired", "canceled"}:
-            return
+def _hold_leadership(interval: float) -> bool:
+    # Runtimes of the local cluster live inside this process, so every process watches its own.
+    if not isinstance(browser_cluster, RemoteBrowserCluster):
+        return True
+    ttl = max(2, int(interval * 3))
+    try:
+        if redis_client.set(_LEADER_KEY, _INSTANCE_ID, nx=True, ex=ttl):
+            return True
+        if redis_client.get(_LEADER_KEY) == _INSTANCE_ID:
+            redis_client.expire(_LEADER_KEY, ttl)
+            return True
+        return False
+    except RedisError:
+        return True
 
-        if ensure_utc(row.expires_at) <= now:
-            _set_status(login_session_id, "expired")
-            try:
-                browser_cluster.stop_login_session(login_session_id=login_session_id)
-            except Exception:
-                pass
-            return
 
+def expire_login_sessions() -> list[uuid.UUID]:
+    with SessionLocal() as db:
+        expired_ids = list(
+            db.scalars(
+                update(LoginSession)
+                .where(LoginSession.status.in_(_WATCHED_STATUSES), LoginSession.expires_at <= utc_now())
+                .values(status="expired")
+                .returning(LoginSession.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+        db.commit()
+
+    for login_session_id in expired_ids:
         try:
-            logged_in = browser_cluster.is_logged_in(login_session_id=login_session_id)
-        except KeyError:
-            return
+            browser_cluster.stop_login_session(login_session_id=login_session_id)
         except Exception:
-            time.sleep(_POLL_INTERVAL_SECONDS)
-            continue
+            pass
+    return expired_ids
 
-        if not logged_in:
-            time.sleep(_POLL_INTERVAL_SECONDS)
-            continue
 
-        _finalize(login_session_id)
-        return
+def mark_login_sessions_evicted(login_session_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+    # The node dropped these runtimes (TTL/idle reaping, restart), so nothing can finish the login anymore.
+    if not login_session_ids:
+        return []
+    with SessionLocal() as db:
+        evicted_ids = list(
+            db.scalars(
+                update(LoginSession)
+                .where(LoginSession.id.in_(login_session_ids), LoginSession.status.in_(_WATCHED_STATUSES))
+                .values(status="expired")
+                .returning(LoginSession.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+        db.commit()
+    return evicted_ids
 
 
-def _get_session(login_session_id: uuid.UUID) -> LoginSession | None:
+def stop_orphaned_local_runtimes() -> list[uuid.UUID]:
+    # Rows expired or closed by another process (the beat task, another API worker) never reach
+    # this process's stop call, so local runtimes are checked against the table instead.
+    if not isinstance(browser_cluster, LocalPlaywrightBrowserCluster):
+        return []
+    held_ids = browser_cluster.login_session_ids()
+    if not held_ids:
+        return []
     with SessionLocal() as db:
-        return db.get(LoginSession, login_session_id)
+        live_ids = set(
+            db.scalars(
+                select(LoginSession.id).where(
+                    LoginSession.id.in_(held_ids), LoginSession.status.in_((*_WATCHED_STATUSES, "capturing"))
+                )
+            ).all()
+        )
+    orphaned_ids = [login_session_id for login_session_id in held_ids if login_session_id not in live_ids]
+    for login_session_id in orphaned_ids:
+        try:
+            browser_cluster.stop_login_session(login_session_id=login_session_id)
+        except Exception:
+            pass
+    return orphaned_ids
+
+
+def poll_login_sessions_once() -> None:
+    expire_login_sessions()
+    stop_orphaned_local_runtimes()
+    # With push enabled the browser node reports logins itself; this loop only expires sessions.
+    if settings.login_session_push_enabled and isinstance(browser_cluster, RemoteBrowserCluster):
+        return
+
+    remote = isinstance(browser_cluster, RemoteBrowserCluster)
+    active_stmt = select(LoginSession.id).where(LoginSession.status == "active")
+    if not remote:
+        # Every process watches in local mode, and each one only holds its own runtimes.
+        held_ids = browser_cluster.login_session_ids()
+        if not held_ids:
+            return
+        active_stmt = active_stmt.where(LoginSession.id.in_(held_ids))
+    with SessionLocal() as db:
+        active_ids = list(db.scalars(active_stmt).all())
+    if not active_ids:
+        return
+
+    try:
+        states = browser_cluster.is_logged_in_batch(login_session_ids=active_ids)
+    except Exception:
+        return
+
+    if remote:
+        # None means the node holds no runtime for the session any more.
+        mark_login_sessions_evicted([login_session_id for login_session_id, state in states.items() if state is None])
+    for login_session_id, logged_in in states.items():
+        if logged_in:
+            _finalize(login_session_id)
 
 
 def _set_status(login_session_id: uuid.UUID, status_value: str) -> None:
@@ -81,7 +169,6 @@ def _set_status(login_session_id: uuid.UUID, status_value: str) -> None:
 def _finalize(login_session_id: uuid.UUID) -> None:
     try:
         storage_state = browser_cluster.export_storage_state(login_session_id=login_session_id)
-        encrypted_blob = encrypt_json(storage_state)
     except Exception:
         _set_status(login_session_id, "failed")
         try:
@@ -89,13 +176,27 @@ def _finalize(login_session_id: uuid.UUID) -> None:
         except Exception:
             pass
         return
+    capture_login_session(login_session_id, storage_state)
+
+
+def capture_login_session(login_session_id: uuid.UUID, storage_state: dict, *, stop_runtime: bool = True) -> bool:
+    try:
+        encrypted_blob = encrypt_json(storage_state)
+    except Exception:
+        _set_status(login_session_id, "failed")
+        if stop_runtime:
+            try:
+                browser_cluster.stop_login_session(login_session_id=login_session_id)
+            except Exception:
+                pass
+        return False
 
     with SessionLocal() as db:
         row = db.get(LoginSession, login_session_id)
         if row is None:
-            return
+            return False
         if row.status in {"succeeded", "expired", "canceled"}:
-            return
+            return row.status == "succeeded"
 
         row.status = "capturing"
         db.add(row)
@@ -109,10 +210,12 @@ def _finalize(login_session_id: uuid.UUID) -> None:
         db.add(row)
         db.commit()
 
-    try:
-        browser_cluster.stop_login_session(login_session_id=login_session_id)
-    except Exception:
-        pass
+    if stop_runtime:
+        try:
+            browser_cluster.stop_login_session(login_session_id=login_session_id)
+        except Exception:
+            pass
+    return True
 
 
 def _upsert_credential(db: Session, login_session: LoginSession, encrypted_blob: bytes) -> None:
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+_KEY_PREFIX = "syncsocial:pacing"
+
+_DEFAULT_BUDGETS: dict[str, dict[str, dict[str, float]]] = {
+    "x": {
+        "x_like": {"capacity": 20, "per_hour": 30},
+        "x_repost": {"capacity": 8, "per_hour": 10},
+        "x_reply": {"capacity": 5, "per_hour": 6},
+        "x_quote": {"capacity": 3, "per_hour": 4},
+    },
+}
+
+# KEYS[1] = bucket hash, ARGV = capacity, refill_per_second, now, requested
+# wait covers enough tokens for the deferred rest (up to capacity), so a resume runs them as one batch.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1])
+local ts = tonumber(data[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(requested, math.floor(tokens))
+local residual = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(residual), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+local wait = 0
+if granted < requested then
+  wait = math.ceil((math.min(requested - granted, capacity) - residual) / rate)
+end
+return {granted, wait}
+"""
+
+
+@dataclass(frozen=True)
+class PacingBudget:
+    capacity: int
+    per_hour: float
+
+
+@dataclass(frozen=True)
+class PacingDecision:
+    granted: int
+    retry_after_seconds: int
+
+
+class ActionPacer:
+    def __init__(self, client: Redis, *, budgets: dict, enabled: bool = True) -> None:
+        self._client = client
+        self._budgets = _merge_budgets(_DEFAULT_BUDGETS, budgets)
+        self._enabled = enabled
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def budget_for(self, *, platform_key: str, action_type: str) -> PacingBudget | None:
+        if not self._enabled:
+            return None
+        raw = self._budgets.get(str(platform_key).strip().lower(), {}).get(str(action_type).strip().lower())
+        if not isinstance(raw, dict):
+            return None
+        try:
+            capacity = int(raw.get("capacity", 0))
+            per_hour = float(raw.get("per_hour", 0))
+        except Exception:
+            return None
+        if capacity <= 0 or per_hour <= 0:
+            return None
+        return PacingBudget(capacity=capacity, per_hour=per_hour)
+
+    def take(self, *, platform_key: str, social_account_id, action_type: str, requested: int) -> PacingDecision:
+        if requested <= 0:
+            return PacingDecision(granted=0, retry_after_seconds=0)
+        budget = self.budget_for(platform_key=platform_key, action_type=action_type)
+        if budget is None:
+            return PacingDecision(granted=requested, retry_after_seconds=0)
+
+        key = f"{_KEY_PREFIX}:{social_account_id}:{str(action_type).strip().lower()}"
+        try:
+            granted, wait = self._take(
+                keys=[key],
+                args=[budget.capacity, budget.per_hour / 3600.0, time.time(), int(requested)],
+            )
+        except RedisError:
+            return PacingDecision(granted=requested, retry_after_seconds=0)
+        return PacingDecision(granted=int(granted), retry_after_seconds=max(0, int(math.ceil(float(wait)))))
+
+
+def _merge_budgets(defaults: dict, overrides: dict) -> dict[str, dict[str, dict]]:
+    merged: dict[str, dict[str, dict]] = {platform: dict(items) for platform, items in defaults.items()}
+    if not isinstance(overrides, dict):
+        return merged
+    for platform, items in overrides.items():
+        if not isinstance(items, dict):
+            continue
+        bucket = merged.setdefault(str(platform).strip().lower(), {})
+        for action_type, budget in items.items():
+            if isinstance(budget, dict):
+                bucket[str(action_type).strip().lower()] = budget
+    return merged
+
+
+action_pacer = ActionPacer(
+    redis_client,
+    budgets=settings.action_pacing_budgets,
+    enabled=settings.action_pacing_enabled,
+)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import gzip
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.artifact_storage import release_artifact_objects
+from app.utils.time import ensure_utc
+
+_PARTITION_NAME_RE = re.compile(r"^(?P<table>[a-z_]+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+# Runs and actions are stamped by different hosts, so the pruning bound leaves room for clock skew.
+_CREATED_AT_SKEW = timedelta(minutes=10)
+# Reply/quote idempotency keys enforce repeat windows of up to 365 days (repeat_window_days), so they
+# outlive the actions partition they were written with.
+_IDEMPOTENCY_KEY_RETENTION = timedelta(days=366)
+
+
+def actions_created_after(run_created_at: datetime) -> datetime:
+    return ensure_utc(run_created_at) - _CREATED_AT_SKEW
+
+
+def partitioned_tables() -> dict[str, int]:
+    return {
+        "actions": settings.actions_retention_months,
+        "audit_logs": settings.audit_logs_retention_months,
+    }
+
+
+def is_partitioning_supported(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind is not None and getattr(bind.dialect, "name", "") == "postgresql"
+
+
+def month_start(moment: datetime) -> datetime:
+    value = ensure_utc(moment)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    index = moment.year * 12 + (moment.month - 1) + months
+    return moment.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start.year:04d}_{start.month:02d}"
+
+
+def ensure_monthly_partitions(db: Session, *, now: datetime, months_ahead: int | None = None) -> list[str]:
+    if not is_partitioning_supported(db):
+        return []
+    ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+    current = month_start(now)
+
+    created: list[str] = []
+    for table in partitioned_tables():
+        existing = {name for name, _ in list_monthly_partitions(db, table)}
+        for offset in range(0, max(0, ahead) + 1):
+            start = add_months(current, offset)
+            name = partition_name(table, start)
+            if name in existing:
+                continue
+            try:
+                db.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+                    )
+                )
+                db.commit()
+                created.append(name)
+            except Exception:
+                # Rows for this month already landed in the default partition; leave them there.
+                db.rollback()
+    return created
+
+
+def list_monthly_partitions(db: Session, table: str) -> list[tuple[str, datetime]]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ).all()
+
+    partitions: list[tuple[str, datetime]] = []
+    for (name,) in rows:
+        match = _PARTITION_NAME_RE.match(str(name))
+        if match is None or match.group("table") != table:
+            continue
+        start = datetime(int(match.group("year")), int(match.group("month")), 1, tzinfo=timezone.utc)
+        partitions.append((str(name), start))
+    partitions.sort(key=lambda item: item[1])
+    return partitions
+
+
+def archive_expired_partitions(db: Session, *, now: datetime) -> list[Path]:
+    if not is_partitioning_supported(db):
+        return []
+
+    archived: list[Path] = []
+    current = month_start(now)
+    for table, retention_months in partitioned_tables().items():
+        if retention_months <= 0:
+            continue
+        cutoff = add_months(current, -int(retention_months))
+        for name, start in list_monthly_partitions(db, table):
+            if start >= cutoff:
+                break
+            try:
+                archived.append(archive_partition(db, table=table, name=name, start=start, now=now))
+            except Exception:
+                db.rollback()
+    return archived
+
+
+def archive_partition(
+    db: Session, *, table: str, name: str, start: datetime, now: datetime | None = None
+) -> Path:
+    archive_dir = Path(settings.partition_archive_dir) / table
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.jsonl.gz"
+    tmp_path = path.with_suffix(".tmp")
+
+    result = db.execute(
+        text(f"SELECT row_to_json(t)::text FROM {name} t ORDER BY created_at, id").execution_options(
+            stream_results=True, yield_per=1000
+        )
+    )
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        for (line,) in result:
+            fh.write(line)
+            fh.write("\n")
+    tmp_path.replace(path)
+
+    released: list[tuple] = []
+    end = add_months(start, 1)
+    if table == "actions":
+        released = [
+            tuple(row)
+            for row in db.execute(
+                text(
+                    f"DELETE FROM artifacts WHERE action_id IN (SELECT id FROM {name}) "
+                    "RETURNING workspace_id, storage_key, content_hash"
+                )
+            ).all()
+        ]
+        keys_cutoff = min(end, ensure_utc(now or datetime.now(timezone.utc)) - _IDEMPOTENCY_KEY_RETENTION)
+        db.execute(text("DELETE FROM action_idempotency_keys WHERE created_at < :cutoff"), {"cutoff": keys_cutoff})
+
+    db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+
+    release_artifact_objects(db, released)
+    return path
+
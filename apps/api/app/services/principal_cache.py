@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.user import User
+
+_KEY_PREFIX = "syncsocial:principals"
+
+# password_hash is deliberately left out; handlers that need it reload the user from the database.
+_PRINCIPAL_FIELDS = (
+    "id",
+    "workspace_id",
+    "email",
+    "display_name",
+    "role",
+    "status",
+    "must_change_password",
+    "created_at",
+    "updated_at",
+    "last_login_at",
+)
+_UUID_FIELDS = {"id", "workspace_id"}
+_DATETIME_FIELDS = {"created_at", "updated_at", "last_login_at"}
+
+
+def principal_from_user(user: User) -> dict:
+    data: dict = {}
+    for field in _PRINCIPAL_FIELDS:
+        value = getattr(user, field)
+        if field in _UUID_FIELDS and value is not None:
+            value = str(value)
+        elif field in _DATETIME_FIELDS and value is not None:
+            value = value.isoformat()
+        data[field] = value
+    return data
+
+
+def user_from_principal(data: dict) -> User:
+    values: dict = {}
+    for field in _PRINCIPAL_FIELDS:
+        value = data.get(field)
+        if field in _UUID_FIELDS and value is not None:
+            value = uuid.UUID(str(value))
+        elif field in _DATETIME_FIELDS and value is not None:
+            value = datetime.fromisoformat(str(value))
+        values[field] = value
+    user = User(**values)
+    # Detached with an identity key, so a handler can still db.add() it to persist changes.
+    make_transient_to_detached(user)
+    return user
+
+
+# Two tiers: a per-process LRU with a short TTL in front of a shared Redis copy.
+# Invalidation clears Redis; other processes converge once their local entry expires.
+class PrincipalCache:
+    def __init__(self, client: Redis, *, ttl_seconds: int, local_ttl_seconds: int, max_entries: int = 4096) -> None:
+        self._client = client
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._local_ttl_seconds = max(0, int(local_ttl_seconds))
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f"{_KEY_PREFIX}:{user_id}"
+
+    def get(self, user_id: uuid.UUID) -> dict | None:
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local.move_to_end(key)
+                    return entry[1]
+                self._local.pop(key, None)
+
+        try:
+            raw = self._client.get(self._key(user_id))
+        except RedisError:
+            return None
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def set(self, user_id: uuid.UUID, data: dict) -> None:
+        self._remember(str(user_id), data)
+        try:
+            self._client.set(self._key(user_id), json.dumps(data), ex=self._ttl_seconds)
+        except RedisError:
+            pass
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._local.pop(str(user_id), None)
+        try:
+            self._client.delete(self._key(user_id))
+        except RedisError:
+            pass
+
+    def _remember(self, key: str, data: dict) -> None:
+        if self._local_ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + self._local_ttl_seconds, data)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+
+principal_cache = PrincipalCache(
+    redis_client,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    local_ttl_seconds=settings.principal_local_cache_ttl_seconds,
+)
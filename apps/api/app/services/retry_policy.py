@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+TRANSIENT_ERROR_CODES = frozenset(
+    {
+        "NETWORK_TIMEOUT",
+        "BROWSER_NODE_ERROR",
+        "BROWSER_ERROR",
+        "INTERNAL_ERROR",
+        "UI_INTERCEPTED",
+    }
+)
+
+# Actions that never ran because an earlier action in the same batch failed.
+RETRYABLE_ACTION_ERROR_CODES = TRANSIENT_ERROR_CODES | {"ABORTED"}
+
+
+@dataclass(frozen=True)
+class RetryDecision:
+    retry: bool
+    countdown_seconds: int
+    reason: str | None
+
+
+def is_transient_error(error_code: str | None) -> bool:
+    return str(error_code or "").strip().upper() in TRANSIENT_ERROR_CODES
+
+
+def compute_backoff_seconds(attempt: int, *, base_seconds: int, max_seconds: int) -> int:
+    exponent = max(0, int(attempt))
+    delay = min(max_seconds, base_seconds * (2**exponent))
+    jitter = random.uniform(0, delay * 0.2)
+    return max(1, int(delay + jitter))
+
+
+def decide_retry(
+    *,
+    error_code: str | None,
+    attempt: int,
+    max_attempts: int,
+    run_retries_used: int,
+    run_retry_budget: int,
+    base_seconds: int,
+    max_seconds: int,
+) -> RetryDecision:
+    if not is_transient_error(error_code):
+        return RetryDecision(retry=False, countdown_seconds=0, reason="TERMINAL_ERROR")
+    if attempt >= max_attempts:
+        return RetryDecision(retry=False, countdown_seconds=0, reason="RETRY_ATTEMPTS_EXHAUSTED")
+    if run_retries_used >= run_retry_budget:
+        return RetryDecision(retry=False, countdown_seconds=0, reason="RUN_RETRY_BUDGET_EXHAUSTED")
+    return RetryDecision(
+        retry=True,
+        countdown_seconds=compute_backoff_seconds(attempt, base_seconds=base_seconds, max_seconds=max_seconds),
+        reason=None,
+    )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from app.core.redis import async_redis_client, redis_client
+
+_FINAL_RUN_STATUSES = {"succeeded", "failed"}
+_KEEPALIVE_SECONDS = 15.0
+
+
+def run_events_channel(run_id) -> str:
+    return f"syncsocial:runs:{run_id}:events"
+
+
+def publish_run_event(run_id, event: dict) -> None:
+    try:
+        redis_client.publish(run_events_channel(run_id), json.dumps(event, default=str))
+    except RedisError:
+        return
+
+
+def publish_run_status(run) -> None:
+    publish_run_event(
+        run.id,
+        {
+            "type": "run",
+            "id": str(run.id),
+            "status": run.status,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+        },
+    )
+
+
+def publish_account_run_status(account_run) -> None:
+    publish_run_event(
+        account_run.run_id,
+        {
+            "type": "account_run",
+            "id": str(account_run.id),
+            "social_account_id": str(account_run.social_account_id),
+            "status": account_run.status,
+            "error_code": account_run.error_code,
+            "attempt_count": account_run.attempt_count,
+        },
+    )
+
+
+def publish_action_statuses(account_run, actions) -> None:
+    for action in actions:
+        publish_run_event(
+            account_run.run_id,
+            {
+                "type": "action",
+                "id": str(action.id),
+                "account_run_id": str(action.account_run_id),
+                "action_type": action.action_type,
+                "status": action.status,
+                "error_code": action.error_code,
+            },
+        )
+
+
+async def subscribe_run_events(run_id) -> PubSub:
+    pubsub = async_redis_client.pubsub()
+    await pubsub.subscribe(run_events_channel(run_id))
+    return pubsub
+
+
+async def stream_run_events(
+    pubsub: PubSub,
+    *,
+    snapshot: dict,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    try:
+        yield _format_sse("snapshot", snapshot)
+        run = snapshot.get("run") if isinstance(snapshot.get("run"), dict) else {}
+        if run.get("status") in _FINAL_RUN_STATUSES:
+            return
+
+        while not await is_disconnected():
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_KEEPALIVE_SECONDS)
+            except RedisError:
+                return
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            try:
+                event = json.loads(message.get("data") or "{}")
+            except Exception:
+                continue
+            if not isinstance(event, dict):
+                continue
+            yield _format_sse(str(event.get("type") or "message"), event)
+            if event.get("type") == "run" and event.get("status") in _FINAL_RUN_STATUSES:
+                return
+    finally:
+        try:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+        except RedisError:
+            pass
+
+
+def _format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.account_run import AccountRun
+from app.models.action import Action
+from app.models.run import Run
+from app.services.partitions import actions_created_after
+
+_FINAL_RUN_STATUSES = {"succeeded", "failed"}
+
+
+def compute_run_summary(
+    db: Session, *, run_id: uuid.UUID, workspace_id: uuid.UUID, created_after: datetime | None = None
+) -> dict:
+    account_runs_by_status: dict[str, int] = {}
+    account_run_error_codes: dict[str, int] = {}
+    for status_value, error_code, count in db.execute(
+        select(AccountRun.status, AccountRun.error_code, func.count())
+        .where(AccountRun.workspace_id == workspace_id, AccountRun.run_id == run_id)
+        .group_by(AccountRun.status, AccountRun.error_code)
+    ).all():
+        account_runs_by_status[status_value] = account_runs_by_status.get(status_value, 0) + int(count)
+        if error_code:
+            account_run_error_codes[error_code] = account_run_error_codes.get(error_code, 0) + int(count)
+
+    actions_by_type: dict[str, dict[str, int]] = {}
+    action_error_codes: dict[str, int] = {}
+    run_account_ids = select(AccountRun.id).where(AccountRun.workspace_id == workspace_id, AccountRun.run_id == run_id)
+    action_stmt = select(Action.action_type, Action.status, Action.error_code, func.count()).where(
+        Action.workspace_id == workspace_id, Action.account_run_id.in_(run_account_ids)
+    )
+    if created_after is not None:
+        action_stmt = action_stmt.where(Action.created_at >= created_after)
+    for action_type, status_value, error_code, count in db.execute(
+        action_stmt.group_by(Action.action_type, Action.status, Action.error_code)
+    ).all():
+        by_status = actions_by_type.setdefault(action_type, {})
+        by_status[status_value] = by_status.get(status_value, 0) + int(count)
+        if error_code:
+            action_error_codes[error_code] = action_error_codes.get(error_code, 0) + int(count)
+
+    return {
+        "account_run_total": sum(account_runs_by_status.values()),
+        "account_runs_by_status": account_runs_by_status,
+        "account_run_error_codes": account_run_error_codes,
+        "action_total": sum(sum(item.values()) for item in actions_by_type.values()),
+        "actions_by_type": actions_by_type,
+        "action_error_codes": action_error_codes,
+    }
+
+
+def get_run_summary(db: Session, run: Run) -> dict:
+    if run.status in _FINAL_RUN_STATUSES and isinstance(run.summary, dict) and run.summary:
+        return run.summary
+    return compute_run_summary(db, run_id=run.id, workspace_id=run.workspace_id, created_after=actions_created_after(run.created_at))
+
+
+def store_run_summary(db: Session, run: Run) -> None:
+    run.summary = compute_run_summary(db, run_id=run.id, workspace_id=run.workspace_id, created_after=actions_created_after(run.created_at))
+    db.add(run)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.schedule import Schedule
+from app.services.schedule_planner import OccupancyCalendar
+from app.utils.time import ensure_utc
+
+
+def estimate_schedule_minutes(max_parallel: int | None) -> float:
+    accounts = max_parallel if isinstance(max_parallel, int) and max_parallel > 0 else 1
+    return float(accounts * max(1, settings.schedule_minutes_per_account_run))
+
+
+def load_occupancy_calendar(db: Session, *, now: datetime, exclude_schedule_ids: Iterable = ()) -> OccupancyCalendar:
+    now_utc = ensure_utc(now)
+    horizon = now_utc + timedelta(hours=max(1, settings.schedule_occupancy_horizon_hours))
+    excluded = set(exclude_schedule_ids)
+
+    calendar = OccupancyCalendar(
+        slot_minutes=settings.schedule_slot_minutes,
+        default_window_minutes=settings.schedule_default_spread_minutes,
+    )
+    rows = db.execute(
+        select(Schedule.id, Schedule.next_run_at, Schedule.max_parallel).where(
+            Schedule.enabled.is_(True),
+            Schedule.frequency != "manual",
+            Schedule.next_run_at.is_not(None),
+            Schedule.next_run_at >= now_utc,
+            Schedule.next_run_at < horizon,
+        )
+    ).all()
+    for schedule_id, next_run_at, max_parallel in rows:
+        if schedule_id in excluded:
+            continue
+        calendar.book(next_run_at, minutes=estimate_schedule_minutes(max_parallel))
+    return calendar
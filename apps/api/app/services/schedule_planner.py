@@ -1,40 +1,181 @@
 from __future__ import annotations
 
+import json
+import math
 import random
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from app.utils.time import ensure_utc
 
+_WEEKDAY_NAMES = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+_CRON_SEARCH_LIMIT_DAYS = 366 * 5
 
-def compute_next_run_at(*, frequency: str, schedule_spec: dict, random_config: dict, now: datetime) -> datetime | None:
-    freq = str(frequency).strip().lower()
-    if freq == "manual":
+
+@dataclass(frozen=True)
+class ScheduleTiming:
+    frequency: str
+    schedule_spec: dict
+    random_config: dict
+    cost_minutes: float = 0.0
+
+
+class OccupancyCalendar:
+    def __init__(self, *, slot_minutes: int = 5, default_window_minutes: int = 15) -> None:
+        self._slot_minutes = max(1, int(slot_minutes))
+        self._default_window_minutes = max(0, int(default_window_minutes))
+        self._booked: dict[int, float] = {}
+
+    @property
+    def default_window_minutes(self) -> int:
+        return self._default_window_minutes
+
+    def _slot(self, at: datetime) -> int:
+        return int(ensure_utc(at).timestamp()) // (self._slot_minutes * 60)
+
+    def load(self, at: datetime) -> float:
+        return self._booked.get(self._slot(at), 0.0)
+
+    def book(self, at: datetime, *, minutes: float) -> None:
+        slot = self._slot(at)
+        remaining = max(0.0, float(minutes))
+        while remaining > 0:
+            taken = min(remaining, float(self._slot_minutes))
+            self._booked[slot] = self._booked.get(slot, 0.0) + taken
+            remaining -= taken
+            slot += 1
+
+    def place(
+        self,
+        base: datetime,
+        *,
+        window_minutes: int,
+        cost_minutes: float,
+        is_allowed: Callable[[datetime], bool],
+    ) -> datetime:
+        start = ensure_utc(base)
+        end = start + timedelta(minutes=max(0, int(window_minutes)))
+        step = timedelta(minutes=self._slot_minutes)
+        span = max(1, math.ceil(float(cost_minutes) / self._slot_minutes))
+
+        scored: list[tuple[float, datetime]] = []
+        cursor = start
+        while cursor <= end:
+            if is_allowed(cursor):
+                first = self._slot(cursor)
+                scored.append((sum(self._booked.get(first + i, 0.0) for i in range(span)), cursor))
+            cursor = cursor + step
+        if not scored:
+            self.book(start, minutes=cost_minutes)
+            return start
+
+        lowest = min(score for score, _ in scored)
+        choice = random.choice([moment for score, moment in scored if score == lowest])
+        jitter_limit = min(self._slot_minutes - 1, int((end - choice).total_seconds() // 60))
+        if jitter_limit > 0:
+            jittered = choice + timedelta(minutes=random.randint(0, jitter_limit))
+            if is_allowed(jittered):
+                choice = jittered
+        self.book(choice, minutes=cost_minutes)
+        return choice
+
+
+@dataclass(frozen=True)
+class _CalendarRules:
+    tz: ZoneInfo | timezone
+    weekdays: frozenset[int] | None
+    active_start: time | None
+    active_end: time | None
+
+
+@dataclass(frozen=True)
+class _CronExpression:
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days_of_month: frozenset[int]
+    months: frozenset[int]
+    days_of_week: frozenset[int]
+    dom_restricted: bool
+    dow_restricted: bool
+
+
+def compute_next_run_at(
+    *,
+    frequency: str,
+    schedule_spec: dict,
+    random_config: dict,
+    now: datetime,
+    occupancy: OccupancyCalendar | None = None,
+    cost_minutes: float = 0.0,
+) -> datetime | None:
+    base = _compute_base_next_run_at(frequency=frequency, schedule_spec=schedule_spec or {}, now=ensure_utc(now))
+    if base is None:
         return None
+    return _place_fire_time(
+        base,
+        frequency=frequency,
+        schedule_spec=schedule_spec or {},
+        random_config=random_config or {},
+        occupancy=occupancy,
+        cost_minutes=cost_minutes,
+    )
 
+
+def plan_next_run_at_groups(
+    timings: Sequence[ScheduleTiming], *, now: datetime, occupancy: OccupancyCalendar | None = None
+) -> list[tuple[list[int], datetime | None]]:
+    # Rows are grouped by frequency/spec first, so each distinct timing computes its base fire time once.
+    # Without a calendar or random offset a whole group shares one value; otherwise every row is placed
+    # on its own, since each booking changes the calendar for the next.
     now_utc = ensure_utc(now)
+    groups: list[tuple[list[int], datetime | None]] = []
+    for indexes in _group_indexes(
+        [_timing_key(t.frequency, t.schedule_spec or {}) for t in timings]
+    ).values():
+        first = timings[indexes[0]]
+        base = _compute_base_next_run_at(frequency=first.frequency, schedule_spec=first.schedule_spec or {}, now=now_utc)
+        if base is None:
+            groups.append((indexes, None))
+            continue
+        if occupancy is None:
+            fixed = [i for i in indexes if not _has_random_offset(timings[i].random_config or {})]
+            if fixed:
+                groups.append((fixed, base))
+            indexes = [i for i in indexes if _has_random_offset(timings[i].random_config or {})]
+        for index in indexes:
+            timing = timings[index]
+            groups.append(
+                (
+                    [index],
+                    _place_fire_time(
+                        base,
+                        frequency=timing.frequency,
+                        schedule_spec=timing.schedule_spec or {},
+                        random_config=timing.random_config or {},
+                        occupancy=occupancy,
+                        cost_minutes=timing.cost_minutes,
+                    ),
+                )
+            )
+    return groups
 
-    if freq == "interval":
-        every_minutes = _get_int(schedule_spec, ["every_minutes", "interval_minutes"], default=60)
-        if every_minutes <= 0:
-            every_minutes = 60
-        next_at = now_utc + timedelta(minutes=every_minutes)
-        return _apply_random_offset(next_at, random_config)
 
-    if freq == "daily":
-        hour, minute = _parse_time_of_day(str(schedule_spec.get("time_of_day") or "09:00"))
-        candidate = datetime(
-            year=now_utc.year,
-            month=now_utc.month,
-            day=now_utc.day,
-            hour=hour,
-            minute=minute,
-            tzinfo=timezone.utc,
-        )
-        if candidate <= now_utc:
-            candidate = candidate + timedelta(days=1)
-        return _apply_random_offset(candidate, random_config)
+def compute_deferred_run_at(*, schedule_spec: dict, not_before: datetime) -> datetime:
+    rules = _parse_calendar_rules(schedule_spec or {})
+    return _next_allowed_at(ensure_utc(not_before), rules)
+
 
-    return _apply_random_offset(now_utc + timedelta(hours=24), random_config)
+def plan_deferred_run_at_groups(
+    schedule_specs: Sequence[dict], *, not_before: datetime
+) -> list[tuple[list[int], datetime]]:
+    earliest = ensure_utc(not_before)
+    return [
+        (indexes, _next_allowed_at(earliest, _parse_calendar_rules(schedule_specs[indexes[0]] or {})))
+        for indexes in _group_indexes([_timing_key("deferred", spec or {}) for spec in schedule_specs]).values()
+    ]
 
 
 def should_skip_run(*, random_config: dict) -> bool:
@@ -50,11 +191,270 @@ def should_skip_run(*, random_config: dict) -> bool:
     return random.random() < prob
 
 
-def _apply_random_offset(next_at: datetime, random_config: dict) -> datetime:
+def _compute_base_next_run_at(*, frequency: str, schedule_spec: dict, now: datetime) -> datetime | None:
+    freq = str(frequency).strip().lower()
+    if freq == "manual":
+        return None
+
+    rules = _parse_calendar_rules(schedule_spec)
+
+    if freq == "interval":
+        return _next_allowed_at(now + timedelta(minutes=_interval_minutes(schedule_spec)), rules)
+
+    if freq == "daily":
+        hour, minute = _parse_time_of_day(str(schedule_spec.get("time_of_day") or "09:00"))
+        local_now = now.astimezone(rules.tz)
+        day = local_now.date()
+        for _ in range(8):
+            candidate = _localize(datetime.combine(day, time(hour, minute)), rules.tz)
+            if candidate > now and _is_allowed(candidate, rules):
+                return candidate
+            day = day + timedelta(days=1)
+        return _next_allowed_at(now + timedelta(hours=24), rules)
+
+    if freq == "cron":
+        cron = _parse_cron(str(schedule_spec.get("cron") or schedule_spec.get("expression") or ""))
+        if cron is None:
+            return None
+        return _next_cron_fire(cron, now=now, rules=rules)
+
+    return _next_allowed_at(now + timedelta(hours=24), rules)
+
+
+def _place_fire_time(
+    base: datetime,
+    *,
+    frequency: str,
+    schedule_spec: dict,
+    random_config: dict,
+    occupancy: OccupancyCalendar | None,
+    cost_minutes: float,
+) -> datetime:
+    rules = _parse_calendar_rules(schedule_spec)
+    if occupancy is None:
+        return _apply_random_offset(base, random_config, rules=rules)
+
+    window = max(
+        _get_int(random_config, ["offset_minutes_max", "random_offset_minutes_max"], default=-1),
+        _get_int(schedule_spec, ["spread_minutes"], default=-1),
+    )
+    if window < 0:
+        window = _default_spread_minutes(frequency, schedule_spec, occupancy=occupancy)
+    return occupancy.place(
+        base,
+        window_minutes=window,
+        cost_minutes=cost_minutes,
+        is_allowed=lambda moment: _is_allowed(moment, rules),
+    )
+
+
+def _default_spread_minutes(frequency: str, schedule_spec: dict, *, occupancy: OccupancyCalendar) -> int:
+    # Daily schedules herd on round times like 09:00, so they are spread even without a spread of their own.
+    # Intervals stay well inside their period; cron keeps its exact minute unless asked otherwise.
+    freq = str(frequency).strip().lower()
+    if freq == "daily":
+        return occupancy.default_window_minutes
+    if freq == "interval":
+        return min(occupancy.default_window_minutes, _interval_minutes(schedule_spec) // 2)
+    return 0
+
+
+def _interval_minutes(schedule_spec: dict) -> int:
+    every_minutes = _get_int(schedule_spec, ["every_minutes", "interval_minutes"], default=60)
+    return every_minutes if every_minutes > 0 else 60
+
+
+def _apply_random_offset(next_at: datetime, random_config: dict, *, rules: _CalendarRules) -> datetime:
     max_offset = _get_int(random_config, ["offset_minutes_max", "random_offset_minutes_max"], default=0)
     if max_offset <= 0:
         return next_at
-    return ensure_utc(next_at) + timedelta(minutes=random.randint(0, max_offset))
+    candidate = ensure_utc(next_at) + timedelta(minutes=random.randint(0, max_offset))
+    if not _is_allowed(candidate, rules):
+        return next_at
+    return candidate
+
+
+def _next_allowed_at(candidate: datetime, rules: _CalendarRules) -> datetime:
+    if rules.weekdays is None and rules.active_start is None:
+        return candidate
+
+    local = candidate.astimezone(rules.tz)
+    for _ in range(8):
+        if _is_allowed(local, rules):
+            return ensure_utc(local)
+        day = local.date()
+        if rules.active_start is not None and _weekday_allowed(day, rules) and local.time() < rules.active_start:
+            local = _localize(datetime.combine(day, rules.active_start), rules.tz).astimezone(rules.tz)
+            continue
+        next_day = day + timedelta(days=1)
+        local = _localize(datetime.combine(next_day, rules.active_start or time(0, 0)), rules.tz).astimezone(rules.tz)
+    return ensure_utc(local)
+
+
+def _is_allowed(moment: datetime, rules: _CalendarRules) -> bool:
+    local = moment.astimezone(rules.tz)
+    if not _weekday_allowed(local.date(), rules):
+        return False
+    if rules.active_start is None or rules.active_end is None:
+        return True
+    current = local.time().replace(second=0, microsecond=0)
+    if rules.active_start <= rules.active_end:
+        return rules.active_start <= current < rules.active_end
+    return current >= rules.active_start or current < rules.active_end
+
+
+def _weekday_allowed(day: date, rules: _CalendarRules) -> bool:
+    return rules.weekdays is None or day.weekday() in rules.weekdays
+
+
+def _next_cron_fire(cron: _CronExpression, *, now: datetime, rules: _CalendarRules) -> datetime | None:
+    local = now.astimezone(rules.tz).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+    limit = local + timedelta(days=_CRON_SEARCH_LIMIT_DAYS)
+    while local < limit:
+        if local.month not in cron.months:
+            year = local.year + (1 if local.month == 12 else 0)
+            month = 1 if local.month == 12 else local.month + 1
+            local = datetime(year, month, 1)
+            continue
+        if not _cron_day_matches(cron, local.date()):
+            local = datetime.combine(local.date() + timedelta(days=1), time(0, 0))
+            continue
+        if local.hour not in cron.hours:
+            local = local.replace(minute=0) + timedelta(hours=1)
+            continue
+        if local.minute not in cron.minutes:
+            local = local + timedelta(minutes=1)
+            continue
+
+        candidate = _localize(local, rules.tz)
+        if candidate > now and _is_allowed(candidate, rules):
+            return candidate
+        local = local + timedelta(minutes=1)
+    return None
+
+
+def _cron_day_matches(cron: _CronExpression, day: date) -> bool:
+    dom_match = day.day in cron.days_of_month
+    dow_match = (day.weekday() + 1) % 7 in cron.days_of_week
+    if cron.dom_restricted and cron.dow_restricted:
+        return dom_match or dow_match
+    return dom_match and dow_match
+
+
+@lru_cache(maxsize=1024)
+def _parse_cron(expression: str) -> _CronExpression | None:
+    parts = expression.split()
+    if len(parts) != 5:
+        return None
+    try:
+        minutes = _parse_cron_field(parts[0], 0, 59)
+        hours = _parse_cron_field(parts[1], 0, 23)
+        days_of_month = _parse_cron_field(parts[2], 1, 31)
+        months = _parse_cron_field(parts[3], 1, 12)
+        days_of_week = frozenset(value % 7 for value in _parse_cron_field(parts[4], 0, 7))
+    except ValueError:
+        return None
+    return _CronExpression(
+        minutes=minutes,
+        hours=hours,
+        days_of_month=days_of_month,
+        months=months,
+        days_of_week=days_of_week,
+        dom_restricted=parts[2] != "*",
+        dow_restricted=parts[4] != "*",
+    )
+
+
+def _parse_cron_field(raw: str, min_value: int, max_value: int) -> frozenset[int]:
+    values: set[int] = set()
+    for item in raw.split(","):
+        step = 1
+        if "/" in item:
+            item, step_raw = item.split("/", 1)
+            step = int(step_raw)
+            if step <= 0:
+                raise ValueError("invalid cron step")
+        if item in {"*", ""}:
+            start, end = min_value, max_value
+        elif "-" in item:
+            start_raw, end_raw = item.split("-", 1)
+            start, end = int(start_raw), int(end_raw)
+        else:
+            start = int(item)
+            end = max_value if step > 1 else start
+        if start < min_value or end > max_value or start > end:
+            raise ValueError("cron value out of range")
+        values.update(range(start, end + 1, step))
+    if not values:
+        raise ValueError("empty cron field")
+    return frozenset(values)
+
+
+def _parse_calendar_rules(schedule_spec: dict) -> _CalendarRules:
+    active_start = None
+    active_end = None
+    active_hours = schedule_spec.get("active_hours")
+    if isinstance(active_hours, dict):
+        start_raw = active_hours.get("start")
+        end_raw = active_hours.get("end")
+        if isinstance(start_raw, str) and isinstance(end_raw, str) and start_raw.strip() and end_raw.strip():
+            start_hour, start_minute = _parse_time_of_day(start_raw)
+            end_hour, end_minute = _parse_time_of_day(end_raw)
+            if (start_hour, start_minute) != (end_hour, end_minute):
+                active_start = time(start_hour, start_minute)
+                active_end = time(end_hour, end_minute)
+
+    return _CalendarRules(
+        tz=_resolve_timezone(schedule_spec.get("timezone") or schedule_spec.get("tz")),
+        weekdays=_parse_weekdays(schedule_spec.get("weekdays")),
+        active_start=active_start,
+        active_end=active_end,
+    )
+
+
+def _parse_weekdays(raw: object) -> frozenset[int] | None:
+    if not isinstance(raw, list) or not raw:
+        return None
+    days: set[int] = set()
+    for item in raw:
+        if isinstance(item, int) and 0 <= item <= 6:
+            days.add(item)
+        elif isinstance(item, str) and item.strip().lower()[:3] in _WEEKDAY_NAMES:
+            days.add(_WEEKDAY_NAMES[item.strip().lower()[:3]])
+    return frozenset(days) if days else None
+
+
+@lru_cache(maxsize=256)
+def _load_zone(name: str) -> ZoneInfo | timezone:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _resolve_timezone(raw: object) -> ZoneInfo | timezone:
+    if not isinstance(raw, str) or not raw.strip():
+        return timezone.utc
+    return _load_zone(raw.strip())
+
+
+def _localize(naive: datetime, tz: ZoneInfo | timezone) -> datetime:
+    return ensure_utc(naive.replace(tzinfo=tz))
+
+
+def _group_indexes(keys: Sequence[str]) -> dict[str, list[int]]:
+    groups: dict[str, list[int]] = {}
+    for index, key in enumerate(keys):
+        groups.setdefault(key, []).append(index)
+    return groups
+
+
+def _has_random_offset(random_config: dict) -> bool:
+    return _get_int(random_config, ["offset_minutes_max", "random_offset_minutes_max"], default=0) > 0
+
+
+def _timing_key(frequency: str, schedule_spec: dict) -> str:
+    return f"{str(frequency).strip().lower()}|{json.dumps(schedule_spec, sort_keys=True, default=str)}"
 
 
 def _get_int(source: dict, keys: list[str], *, default: int) -> int:
@@ -84,4 +484,3 @@ def _parse_time_of_day(value: str) -> tuple[int, int]:
     hour = max(0, min(23, hour))
     minute = max(0, min(59, minute))
     return hour, minute
-
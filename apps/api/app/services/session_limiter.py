@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+_KEY_PREFIX = "syncsocial:sessions"
+
+# KEYS[1] = holders zset, ARGV = now, lease_expires_at, limit, holder
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[4]) then
+  redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+  return 1
+end
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+  redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+  redis.call('EXPIRE', KEYS[1], math.ceil(ARGV[2] - ARGV[1]) + 60)
+  return 1
+end
+return 0
+"""
+
+
+# Holders live in a zset scored by lease expiry; a crashed worker only blocks its slot until the lease ends.
+class WorkspaceSessionLimiter:
+    def __init__(self, client: Redis, *, lease_seconds: int) -> None:
+        self._client = client
+        self._lease_seconds = max(1, int(lease_seconds))
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+
+    def acquire(self, *, workspace_id, holder: str, limit: int | None) -> bool:
+        if limit is None or limit <= 0:
+            return True
+        now = time.time()
+        try:
+            acquired = self._acquire(
+                keys=[_key(workspace_id)],
+                args=[now, now + self._lease_seconds, int(limit), str(holder)],
+            )
+        except RedisError:
+            return True
+        return bool(acquired)
+
+    def renew(self, *, workspace_id, holder: str) -> None:
+        try:
+            self._client.zadd(_key(workspace_id), {str(holder): time.time() + self._lease_seconds}, xx=True)
+        except RedisError:
+            return
+
+    def release(self, *, workspace_id, holder: str) -> None:
+        try:
+            self._client.zrem(_key(workspace_id), str(holder))
+        except RedisError:
+            return
+
+    def active_count(self, *, workspace_id) -> int:
+        try:
+            self._client.zremrangebyscore(_key(workspace_id), "-inf", time.time())
+            return int(self._client.zcard(_key(workspace_id)))
+        except RedisError:
+            return 0
+
+
+def _key(workspace_id) -> str:
+    return f"{_KEY_PREFIX}:{workspace_id}"
+
+
+session_limiter = WorkspaceSessionLimiter(redis_client, lease_seconds=settings.session_lease_seconds)
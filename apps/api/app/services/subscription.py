@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.models.subscription import WorkspaceSubscription, WorkspaceUsageMonthly
 from app.models.user import User
+from app.services.usage_meter import usage_meter
 from app.utils.time import ensure_utc
 
 _ACTIVE_STATUSES = {"trial", "active"}
@@ -72,6 +73,33 @@ def increment_automation_runtime_seconds(
         return 0
 
     period_start = get_current_month_period_start(end)
+    if usage_meter.add(workspace_id=workspace_id, period_start=period_start, seconds=seconds):
+        return seconds
+    return _add_runtime_seconds(db, workspace_id=workspace_id, period_start=period_start, seconds=seconds)
+
+
+def get_pending_runtime_seconds(*, workspace_id, period_start: date) -> int:
+    return usage_meter.pending_seconds(workspace_id=workspace_id, period_start=period_start)
+
+
+def flush_pending_runtime_usage(db: Session) -> int:
+    claim_key, pending = usage_meter.claim()
+    if not pending:
+        usage_meter.acknowledge(claim_key)
+        return 0
+    try:
+        for (workspace_id, period_start), seconds in pending.items():
+            _add_runtime_seconds(db, workspace_id=workspace_id, period_start=period_start, seconds=seconds)
+        db.commit()
+    except Exception:
+        db.rollback()
+        usage_meter.release(claim_key)
+        raise
+    usage_meter.acknowledge(claim_key)
+    return len(pending)
+
+
+def _add_runtime_seconds(db: Session, *, workspace_id, period_start: date, seconds: int) -> int:
     bind = db.get_bind()
     if bind is not None and getattr(bind.dialect, "name", "") == "postgresql":
         from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -106,6 +134,8 @@ def increment_automation_runtime_seconds(
 def has_remaining_runtime_quota(
     subscription: WorkspaceSubscription | None,
     usage: WorkspaceUsageMonthly | None,
+    *,
+    pending_seconds: int = 0,
 ) -> SubscriptionCheckResult:
     if subscription is None:
         return SubscriptionCheckResult(allowed=True, reason=None)
@@ -121,6 +151,7 @@ def has_remaining_runtime_quota(
         return SubscriptionCheckResult(allowed=True, reason=None)
 
     used = int(usage.automation_runtime_seconds) if usage is not None and usage.automation_runtime_seconds is not None else 0
+    used += max(0, int(pending_seconds))
     if used >= quota_seconds:
         return SubscriptionCheckResult(allowed=False, reason="RUNTIME_QUOTA_EXCEEDED")
     return SubscriptionCheckResult(allowed=True, reason=None)
@@ -184,3 +215,15 @@ def effective_parallel_limit(subscription: WorkspaceSubscription | None, *, sche
     if quota <= 0:
         return candidate
     return max(1, min(candidate, quota))
+
+
+def max_parallel_sessions_limit(subscription: WorkspaceSubscription | None) -> int | None:
+    if subscription is None or subscription.max_parallel_sessions is None:
+        return None
+    try:
+        quota = int(subscription.max_parallel_sessions)
+    except Exception:
+        return None
+    if quota <= 0:
+        return None
+    return quota
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import date
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+
+_PENDING_KEY = "syncsocial:usage:runtime_seconds:pending"
+
+_CLAIM_PREFIX = f"{_PENDING_KEY}:claim:"
+# A claim older than this belongs to a flush that died before acknowledging it; flushes take seconds.
+_CLAIM_STALE_SECONDS = 900
+
+# KEYS[1] = pending hash, KEYS[2] = claimed hash; folds claimed seconds back into pending.
+_RELEASE_SCRIPT = """
+local raw = redis.call('HGETALL', KEYS[2])
+for i = 1, #raw, 2 do
+  redis.call('HINCRBY', KEYS[1], raw[i], tonumber(raw[i + 1]))
+end
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+
+class RuntimeUsageMeter:
+    def __init__(self, client: Redis) -> None:
+        self._client = client
+        self._release = client.register_script(_RELEASE_SCRIPT)
+
+    def add(self, *, workspace_id, period_start: date, seconds: int) -> bool:
+        try:
+            self._client.hincrby(_PENDING_KEY, _field(workspace_id, period_start), int(seconds))
+        except RedisError:
+            return False
+        return True
+
+    def pending_seconds(self, *, workspace_id, period_start: date) -> int:
+        # Seconds claimed by an in-flight flush are not in the database yet either.
+        field = _field(workspace_id, period_start)
+        try:
+            values = [self._client.hget(_PENDING_KEY, field)]
+            for claim_key in self._client.scan_iter(match=f"{_CLAIM_PREFIX}*", count=100):
+                values.append(self._client.hget(claim_key, field))
+        except RedisError:
+            return 0
+        total = 0
+        for value in values:
+            try:
+                total += int(value or 0)
+            except Exception:
+                continue
+        return max(0, total)
+
+    def claim(self) -> tuple[str | None, dict[tuple[uuid.UUID, date], int]]:
+        # RENAME hands the whole hash to this flush atomically; later adds start a fresh pending hash,
+        # so overlapping flushes never see the same seconds twice.
+        self._recover_stale_claims()
+        claim_key = f"{_CLAIM_PREFIX}{int(time.time())}:{uuid.uuid4().hex}"
+        try:
+            self._client.rename(_PENDING_KEY, claim_key)
+        except RedisError:
+            return None, {}
+        try:
+            raw = self._client.hgetall(claim_key)
+        except RedisError:
+            self.release(claim_key)
+            return None, {}
+        pending: dict[tuple[uuid.UUID, date], int] = {}
+        for field, value in raw.items():
+            workspace_raw, _, period_raw = str(field).partition(":")
+            try:
+                key = (uuid.UUID(workspace_raw), date.fromisoformat(period_raw))
+                seconds = int(value)
+            except Exception:
+                continue
+            if seconds > 0:
+                pending[key] = pending.get(key, 0) + seconds
+        return claim_key, pending
+
+    def _recover_stale_claims(self) -> None:
+        cutoff = time.time() - _CLAIM_STALE_SECONDS
+        try:
+            claim_keys = list(self._client.scan_iter(match=f"{_CLAIM_PREFIX}*", count=100))
+        except RedisError:
+            return
+        for claim_key in claim_keys:
+            claimed_at, _, _ = str(claim_key)[len(_CLAIM_PREFIX) :].partition(":")
+            try:
+                stale = int(claimed_at) < cutoff
+            except ValueError:
+                stale = True
+            if stale:
+                self.release(str(claim_key))
+
+    def acknowledge(self, claim_key: str | None) -> None:
+        if claim_key is None:
+            return
+        try:
+            self._client.delete(claim_key)
+        except RedisError:
+            return
+
+    def release(self, claim_key: str | None) -> None:
+        if claim_key is None:
+            return
+        try:
+            self._release(keys=[_PENDING_KEY, claim_key])
+        except RedisError:
+            return
+
+
+def _field(workspace_id, period_start: date) -> str:
+    return f"{workspace_id}:{period_start.isoformat()}"
+
+
+usage_meter = RuntimeUsageMeter(redis_client)
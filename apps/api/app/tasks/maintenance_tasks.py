@@ -1,22 +1,41 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from pathlib import Path
 
 from sqlalchemy import select
 
 from app.celery_app import celery_app
-from app.core.config import settings
 from app.db.session import SessionLocal
-from app.models.artifact import Artifact
 from app.models.subscription import WorkspaceSubscription
+from app.services.artifact_retention import purge_expired_artifacts
+from app.services.login_session_auto_capture import expire_login_sessions
+from app.services.partitions import archive_expired_partitions, ensure_monthly_partitions
+from app.services.subscription import flush_pending_runtime_usage
 from app.utils.time import utc_now
 
 
+@celery_app.task(name="syncsocial.flush_usage_counters")
+def flush_usage_counters() -> None:
+    with SessionLocal() as db:
+        flush_pending_runtime_usage(db)
+
+
+@celery_app.task(name="syncsocial.expire_login_sessions")
+def expire_login_sessions_task() -> None:
+    expire_login_sessions()
+
+
+@celery_app.task(name="syncsocial.maintain_partitions")
+def maintain_partitions() -> None:
+    now = utc_now()
+    with SessionLocal() as db:
+        ensure_monthly_partitions(db, now=now)
+        archive_expired_partitions(db, now=now)
+
+
 @celery_app.task(name="syncsocial.cleanup_artifacts")
 def cleanup_artifacts() -> None:
     now = utc_now()
-    base_dir = Path(settings.artifacts_dir)
 
     with SessionLocal() as db:
         subs = (
@@ -39,31 +58,4 @@ def cleanup_artifacts() -> None:
             if days <= 0:
                 continue
 
-            cutoff = now - timedelta(days=days)
-            while True:
-                batch = (
-                    db.scalars(
-                        select(Artifact)
-                        .where(Artifact.workspace_id == sub.workspace_id, Artifact.created_at < cutoff)
-                        .order_by(Artifact.created_at.asc())
-                        .limit(200)
-                    )
-                    .all()
-                )
-                if not batch:
-                    break
-
-                for artifact in batch:
-                    try:
-                        path = base_dir / str(artifact.storage_key)
-                        if path.exists():
-                            path.unlink()
-                    except Exception:
-                        pass
-                    try:
-                        db.delete(artifact)
-                    except Exception:
-                        pass
-
-                db.commit()
-
+            purge_expired_artifacts(db, workspace_id=sub.workspace_id, cutoff=now - timedelta(days=days))
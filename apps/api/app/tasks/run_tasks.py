@@ -5,25 +5,36 @@ import random
 import re
 import uuid
 import urllib.parse
-from datetime import date, timedelta
-from pathlib import Path
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from app.celery_app import celery_app
 from app.core.config import settings
-from app.core.crypto import decrypt_json
+from app.core.crypto import decrypt_json, encrypt_json
 from app.db.session import SessionLocal
 from app.models.account_run import AccountRun
-from app.models.action import Action
+from app.models.action import Action, ActionIdempotencyKey
 from app.models.artifact import Artifact
 from app.models.credential import Credential
 from app.models.run import Run
 from app.models.social_account import SocialAccount
 from app.models.strategy import Strategy
+from app.services.action_rollups import record_action_outcomes, retract_action_outcomes
+from app.services.artifact_storage import store_artifact_blob
 from app.services.browser_cluster import browser_cluster
-from app.services.subscription import increment_automation_runtime_seconds
-from app.utils.time import utc_now
+from app.services.pacing import action_pacer
+from app.services.partitions import actions_created_after
+from app.services.retry_policy import RETRYABLE_ACTION_ERROR_CODES, decide_retry
+from app.services.run_events import publish_account_run_status, publish_action_statuses, publish_run_status
+from app.services.run_summary import store_run_summary
+from app.services.session_limiter import session_limiter
+from app.services.subscription import (
+    get_workspace_subscription,
+    increment_automation_runtime_seconds,
+    max_parallel_sessions_limit,
+)
+from app.utils.time import ensure_utc, utc_now
 
 _TWEET_ID_RE = re.compile(r"/status/(?P<tweet_id>\\d+)")
 
@@ -31,7 +42,6 @@ _TWEET_ID_RE = re.compile(r"/status/(?P<tweet_id>\\d+)")
 @celery_app.task(name="syncsocial.execute_account_run")
 def execute_account_run(account_run_id: str) -> None:
     account_run_uuid = uuid.UUID(account_run_id)
-    now = utc_now()
 
     with SessionLocal() as db:
         account_run = db.get(AccountRun, account_run_uuid)
@@ -40,87 +50,111 @@ def execute_account_run(account_run_id: str) -> None:
         if account_run.status not in {"queued", "retry_waiting"}:
             return
 
-        run = db.get(Run, account_run.run_id)
-        if run is None:
+        subscription = get_workspace_subscription(db, workspace_id=account_run.workspace_id)
+        holder = str(account_run.id)
+        acquired = session_limiter.acquire(
+            workspace_id=account_run.workspace_id,
+            holder=holder,
+            limit=max_parallel_sessions_limit(subscription),
+        )
+        if not acquired:
+            if celery_app.conf.task_always_eager:
+                run = db.get(Run, account_run.run_id)
+                if run is not None:
+                    _fail_account_run(db, account_run, run, error_code="SESSION_LIMIT_REACHED")
+                return
+            _requeue_account_run(account_run.id, countdown=settings.session_limit_defer_seconds)
             return
 
-        strategy = db.get(Strategy, run.strategy_id)
-        if strategy is None:
-            _fail_account_run(db, account_run, run, error_code="STRATEGY_NOT_FOUND")
-            return
+        try:
+            _run_account_run(db, account_run)
+        finally:
+            session_limiter.release(workspace_id=account_run.workspace_id, holder=holder)
 
-        account_run.status = "running"
-        account_run.started_at = now
-        db.add(account_run)
 
-        if run.status == "queued":
-            run.status = "running"
-            run.started_at = now
-            db.add(run)
+def _run_account_run(db, account_run: AccountRun) -> None:
+    now = utc_now()
+    run = db.get(Run, account_run.run_id)
+    if run is None:
+        return
 
-        db.commit()
+    strategy = db.get(Strategy, run.strategy_id)
+    if strategy is None:
+        _fail_account_run(db, account_run, run, error_code="STRATEGY_NOT_FOUND")
+        return
 
-        account = db.get(SocialAccount, account_run.social_account_id)
-        if account is None:
-            _fail_account_run(db, account_run, run, error_code="ACCOUNT_NOT_FOUND")
-            return
+    resuming = account_run.status == "retry_waiting"
+    account_run.status = "running"
+    account_run.started_at = now
+    db.add(account_run)
 
-        credential = db.scalar(
-            select(Credential).where(
-                Credential.workspace_id == account_run.workspace_id,
-                Credential.social_account_id == account.id,
-                Credential.credential_type == "storage_state",
-            )
+    if run.status == "queued":
+        run.status = "running"
+        run.started_at = now
+        db.add(run)
+
+    db.commit()
+    publish_account_run_status(account_run)
+    publish_run_status(run)
+
+    account = db.get(SocialAccount, account_run.social_account_id)
+    if account is None:
+        _fail_account_run(db, account_run, run, error_code="ACCOUNT_NOT_FOUND")
+        return
+
+    credential = db.scalar(
+        select(Credential).where(
+            Credential.workspace_id == account_run.workspace_id,
+            Credential.social_account_id == account.id,
+            Credential.credential_type == "storage_state",
         )
+    )
 
-        if account.status != "healthy" or credential is None:
-            _fail_account_run(db, account_run, run, error_code="AUTH_REQUIRED")
-            return
+    if account.status != "healthy" or credential is None:
+        _fail_account_run(db, account_run, run, error_code="AUTH_REQUIRED")
+        return
 
-        try:
-            storage_state = decrypt_json(credential.encrypted_blob)
-        except Exception:
-            _fail_account_run(db, account_run, run, error_code="CREDENTIAL_DECRYPT_FAILED")
-            return
+    try:
+        storage_state = decrypt_json(credential.encrypted_blob)
+    except Exception:
+        _fail_account_run(db, account_run, run, error_code="CREDENTIAL_DECRYPT_FAILED")
+        return
 
-        strategy_type = _strategy_type(strategy)
-        if _strategy_requires_action_text(strategy_type) and not _resolve_action_text(strategy):
-            _fail_account_run(db, account_run, run, error_code="STRATEGY_CONFIG_INVALID")
-            return
+    strategy_type = _strategy_type(strategy)
+    if _strategy_requires_action_text(strategy_type) and not _resolve_action_text(strategy):
+        _fail_account_run(db, account_run, run, error_code="STRATEGY_CONFIG_INVALID")
+        return
 
-        if strategy_type in {
-            "x_search_like",
-            "x_search_repost",
-            "x_search_reply",
-            "x_search_quote",
-            "x_verified_like",
-            "x_verified_repost",
-            "x_verified_reply",
-            "x_verified_quote",
-        }:
+    if strategy_type in {
+        "x_search_like",
+        "x_search_repost",
+        "x_search_reply",
+        "x_search_quote",
+        "x_verified_like",
+        "x_verified_repost",
+        "x_verified_reply",
+        "x_verified_quote",
+    }:
+        if resuming:
+            search_specs = _build_pending_action_specs(db, strategy, account_run=account_run, run=run)
+        else:
             search_specs = _build_search_collect_specs(strategy, account_run=account_run, account=account, run=run)
-            executed_actions, results, error_code = _execute_specs(
-                db,
-                account_run=account_run,
-                run=run,
-                account=account,
-                strategy=strategy,
-                storage_state=storage_state,
-                specs=search_specs,
-            )
-            if error_code is not None:
-                _fail_account_run(db, account_run, run, error_code=error_code)
-                return
-
-            candidates = _extract_candidates(executed_actions, results)
-            if not candidates:
-                account_run.status = "succeeded"
-                account_run.finished_at = utc_now()
-                db.add(account_run)
-                db.commit()
-                _finalize_run_if_done(db, run.id)
-                return
+        executed_actions, results, error_code = _execute_specs(
+            db,
+            account_run=account_run,
+            run=run,
+            account=account,
+            strategy=strategy,
+            credential=credential,
+            storage_state=storage_state,
+            specs=search_specs,
+        )
+        if error_code is not None:
+            _fail_account_run(db, account_run, run, error_code=error_code)
+            return
 
+        candidates = _extract_candidates(executed_actions, results)
+        if candidates:
             action_specs = _build_search_action_specs(
                 strategy,
                 account_run=account_run,
@@ -133,42 +167,205 @@ def execute_account_run(account_run_id: str) -> None:
                 run=run,
                 account=account,
                 strategy=strategy,
+                credential=credential,
                 storage_state=storage_state,
                 specs=action_specs,
             )
             if action_error is not None:
                 _fail_account_run(db, account_run, run, error_code=action_error)
                 return
+    else:
+        if resuming:
+            action_specs = _build_pending_action_specs(db, strategy, account_run=account_run, run=run)
         else:
             action_specs = _build_action_specs(strategy, account_run=account_run, account=account)
-            _, _, error_code = _execute_specs(
-                db,
-                account_run=account_run,
-                run=run,
-                account=account,
-                strategy=strategy,
-                storage_state=storage_state,
-                specs=action_specs,
-            )
-            if error_code is not None:
-                _fail_account_run(db, account_run, run, error_code=error_code)
-                return
-
-        account_run.status = "succeeded"
-        account_run.finished_at = utc_now()
-        db.add(account_run)
-        increment_automation_runtime_seconds(
+        _, _, error_code = _execute_specs(
             db,
-            workspace_id=account_run.workspace_id,
-            started_at=account_run.started_at,
-            finished_at=account_run.finished_at,
+            account_run=account_run,
+            run=run,
+            account=account,
+            strategy=strategy,
+            credential=credential,
+            storage_state=storage_state,
+            specs=action_specs,
         )
-        db.commit()
+        if error_code is not None:
+            _fail_account_run(db, account_run, run, error_code=error_code)
+            return
+
+    if _defer_pending_actions(db, account_run, run):
+        return
+
+    account_run.status = "succeeded"
+    account_run.finished_at = utc_now()
+    db.add(account_run)
+    increment_automation_runtime_seconds(
+        db,
+        workspace_id=account_run.workspace_id,
+        started_at=account_run.started_at,
+        finished_at=account_run.finished_at,
+    )
+    db.commit()
+    publish_account_run_status(account_run)
+
+    _finalize_run_if_done(db, run.id)
+
+
+def _requeue_account_run(account_run_id: uuid.UUID, *, countdown: int) -> None:
+    execute_account_run.apply_async(args=[str(account_run_id)], countdown=max(1, int(countdown)))
+
+
+def _defer_pending_actions(db, account_run: AccountRun, run: Run) -> bool:
+    pending = db.scalars(
+        select(Action).where(
+            Action.workspace_id == account_run.workspace_id,
+            Action.account_run_id == account_run.id,
+            Action.created_at >= actions_created_after(run.created_at),
+            Action.status == "queued",
+        )
+    ).all()
+    if not pending:
+        return False
+
+    # Eager mode ignores countdown and would recurse straight back into the task, so deferred
+    # actions end here instead of waiting for a requeue that never comes.
+    if celery_app.conf.task_always_eager:
+        _fail_account_run(db, account_run, run, error_code="RATE_LIMITED")
+        return True
+
+    now = utc_now()
+    ready_at: datetime | None = None
+    for action in pending:
+        metadata = action.metadata_ if isinstance(action.metadata_, dict) else {}
+        try:
+            candidate = ensure_utc(datetime.fromisoformat(str(metadata.get("deferred_until"))))
+        except Exception:
+            continue
+        if ready_at is None or candidate < ready_at:
+            ready_at = candidate
+
+    countdown = settings.session_limit_defer_seconds
+    if ready_at is not None:
+        countdown = int((ready_at - now).total_seconds())
+
+    account_run.status = "retry_waiting"
+    db.add(account_run)
+    increment_automation_runtime_seconds(
+        db,
+        workspace_id=account_run.workspace_id,
+        started_at=account_run.started_at,
+        finished_at=now,
+    )
+    db.commit()
+    publish_account_run_status(account_run)
+    _requeue_account_run(account_run.id, countdown=countdown)
+    return True
+
 
-        _finalize_run_if_done(db, run.id)
+def _build_pending_action_specs(db, strategy: Strategy, *, account_run: AccountRun, run: Run) -> list[dict]:
+    config = strategy.config if isinstance(strategy.config, dict) else {}
+    bandwidth_mode = config.get("bandwidth_mode")
+    pending = db.scalars(
+        select(Action)
+        .where(
+            Action.workspace_id == account_run.workspace_id,
+            Action.account_run_id == account_run.id,
+            Action.created_at >= actions_created_after(run.created_at),
+            Action.status == "queued",
+        )
+        .order_by(Action.created_at.asc())
+    ).all()
+
+    specs: list[dict] = []
+    for action in pending:
+        metadata = action.metadata_ if isinstance(action.metadata_, dict) else {}
+        action_params = metadata.get("action_params") if isinstance(metadata.get("action_params"), dict) else {}
+        specs.append(
+            {
+                "action_type": action.action_type,
+                "platform_key": action.platform_key,
+                "target_url": action.target_url,
+                "target_external_id": action.target_external_id,
+                "idempotency_key": action.idempotency_key,
+                "bandwidth_mode": bandwidth_mode,
+                "action_params": action_params,
+            }
+        )
+    return specs
+
+
+def _schedule_retry(db, account_run: AccountRun, run: Run, strategy: Strategy | None, *, error_code: str) -> bool:
+    config = strategy.config if strategy is not None and isinstance(strategy.config, dict) else {}
+    max_attempts = _get_int_from_config(
+        config, "max_retries", default=settings.account_run_max_retries, min_value=0, max_value=20
+    )
+    run_retries_used = db.scalar(
+        select(func.coalesce(func.sum(AccountRun.attempt_count), 0)).where(AccountRun.run_id == run.id)
+    )
+    decision = decide_retry(
+        error_code=error_code,
+        attempt=int(account_run.attempt_count or 0),
+        max_attempts=max_attempts,
+        run_retries_used=int(run_retries_used or 0),
+        run_retry_budget=settings.run_retry_budget,
+        base_seconds=settings.retry_backoff_base_seconds,
+        max_seconds=settings.retry_backoff_max_seconds,
+    )
+    if not decision.retry or celery_app.conf.task_always_eager:
+        return False
+
+    retryable = db.scalars(
+        select(Action).where(
+            Action.workspace_id == account_run.workspace_id,
+            Action.account_run_id == account_run.id,
+            Action.created_at >= actions_created_after(run.created_at),
+            Action.status == "failed",
+            Action.error_code.in_(sorted(RETRYABLE_ACTION_ERROR_CODES)),
+        )
+    ).all()
+    if not retryable:
+        return False
+
+    retract_action_outcomes(
+        db, social_account_id=account_run.social_account_id, strategy_id=run.strategy_id, actions=retryable
+    )
+    attempt = int(account_run.attempt_count or 0) + 1
+    for action in retryable:
+        action.metadata_ = {
+            **(action.metadata_ or {}),
+            "retry_attempt": attempt,
+            "last_error_code": action.error_code,
+        }
+        action.status = "queued"
+        action.error_code = None
+        action.started_at = None
+        action.finished_at = None
+        db.add(action)
+
+    now = utc_now()
+    account_run.attempt_count = attempt
+    account_run.error_code = error_code
+    account_run.status = "retry_waiting"
+    db.add(account_run)
+    increment_automation_runtime_seconds(
+        db,
+        workspace_id=account_run.workspace_id,
+        started_at=account_run.started_at,
+        finished_at=now,
+    )
+    db.commit()
+    publish_account_run_status(account_run)
+    _requeue_account_run(account_run.id, countdown=decision.countdown_seconds)
+    return True
 
 
 def _fail_account_run(db, account_run: AccountRun, run: Run, *, error_code: str) -> None:
+    if account_run.status == "running":
+        strategy = db.get(Strategy, run.strategy_id)
+        if _schedule_retry(db, account_run, run, strategy, error_code=error_code):
+            return
+
+    _skip_pending_actions(db, account_run, run)
     account_run.status = "failed"
     account_run.error_code = error_code
     account_run.finished_at = utc_now()
@@ -184,9 +381,37 @@ def _fail_account_run(db, account_run: AccountRun, run: Run, *, error_code: str)
         run.started_at = utc_now()
         db.add(run)
     db.commit()
+    publish_account_run_status(account_run)
     _finalize_run_if_done(db, run.id)
 
 
+def _skip_pending_actions(db, account_run: AccountRun, run: Run) -> None:
+    # Actions still queued (deferred by pacing, or never reached) end with the account run.
+    pending = db.scalars(
+        select(Action).where(
+            Action.workspace_id == account_run.workspace_id,
+            Action.account_run_id == account_run.id,
+            Action.created_at >= actions_created_after(run.created_at),
+            Action.status == "queued",
+        )
+    ).all()
+    if not pending:
+        return
+
+    finished_at = utc_now()
+    for action in pending:
+        metadata = action.metadata_ if isinstance(action.metadata_, dict) else {}
+        action.status = "skipped"
+        action.error_code = str(metadata.get("deferred_reason") or "ABORTED")
+        action.finished_at = finished_at
+        db.add(action)
+    record_action_outcomes(
+        db, social_account_id=account_run.social_account_id, strategy_id=run.strategy_id, actions=pending
+    )
+    db.commit()
+    publish_action_statuses(account_run, pending)
+
+
 def _finalize_run_if_done(db, run_id: uuid.UUID) -> None:
     run = db.get(Run, run_id)
     if run is None:
@@ -196,8 +421,9 @@ def _finalize_run_if_done(db, run_id: uuid.UUID) -> None:
     if not account_runs:
         run.status = "succeeded"
         run.finished_at = utc_now()
-        db.add(run)
+        store_run_summary(db, run)
         db.commit()
+        publish_run_status(run)
         return
 
     if any(ar.status in {"queued", "running", "retry_waiting"} for ar in account_runs):
@@ -208,8 +434,9 @@ def _finalize_run_if_done(db, run_id: uuid.UUID) -> None:
     else:
         run.status = "succeeded"
     run.finished_at = utc_now()
-    db.add(run)
+    store_run_summary(db, run)
     db.commit()
+    publish_run_status(run)
 
 
 def _build_action_specs(strategy: Strategy, *, account_run: AccountRun, account: SocialAccount) -> list[dict]:
@@ -287,6 +514,7 @@ def _execute_specs(
     run: Run,
     account: SocialAccount,
     strategy: Strategy,
+    credential: Credential,
     storage_state: dict,
     specs: list[dict],
 ) -> tuple[list[Action], list[dict], str | None]:
@@ -315,6 +543,9 @@ def _execute_specs(
         if bandwidth_mode is None:
             bandwidth_mode = _normalize_bandwidth_mode(spec.get("bandwidth_mode"))
 
+    actions_to_execute, execute_payload = _apply_pacing(
+        db, account=account, actions=actions_to_execute, payload=execute_payload
+    )
     if not actions_to_execute:
         return [], [], None
 
@@ -324,7 +555,20 @@ def _execute_specs(
         action.started_at = started_at
         db.add(action)
     db.commit()
+    publish_action_statuses(account_run, actions_to_execute)
 
+    def _refresh_credential(updated: dict) -> None:
+        try:
+            credential.encrypted_blob = encrypt_json(updated)
+        except Exception:
+            return
+        credential.validated_at = utc_now()
+        db.add(credential)
+        # Later batches of this account run continue with the refreshed cookies.
+        storage_state.clear()
+        storage_state.update(updated)
+
+    session_limiter.renew(workspace_id=account_run.workspace_id, holder=str(account_run.id))
     try:
         results = browser_cluster.execute_actions(
             platform_key=account.platform_key,
@@ -332,6 +576,9 @@ def _execute_specs(
             actions=execute_payload,
             bandwidth_mode=bandwidth_mode,
             fingerprint_profile=getattr(account, "fingerprint_profile", None) or {},
+            profile_key=str(account.id),
+            on_storage_state=_refresh_credential,
+            parallelism=settings.action_page_parallelism,
         )
     except Exception as exc:
         finished_at = utc_now()
@@ -341,7 +588,11 @@ def _execute_specs(
             action.metadata_ = {**(action.metadata_ or {}), "message": str(exc)}
             action.finished_at = finished_at
             db.add(action)
+        record_action_outcomes(
+            db, social_account_id=account.id, strategy_id=strategy.id, actions=actions_to_execute
+        )
         db.commit()
+        publish_action_statuses(account_run, actions_to_execute)
         return actions_to_execute, [], "BROWSER_NODE_ERROR"
 
     if len(results) != len(actions_to_execute):
@@ -352,7 +603,11 @@ def _execute_specs(
             action.metadata_ = {**(action.metadata_ or {}), "message": "Browser node returned mismatched results"}
             action.finished_at = finished_at
             db.add(action)
+        record_action_outcomes(
+            db, social_account_id=account.id, strategy_id=strategy.id, actions=actions_to_execute
+        )
         db.commit()
+        publish_action_statuses(account_run, actions_to_execute)
         return actions_to_execute, results if isinstance(results, list) else [], "BROWSER_NODE_ERROR"
 
     failures: list[tuple[Action, str | None]] = []
@@ -401,7 +656,9 @@ def _execute_specs(
         account.last_health_check_at = utc_now()
         db.add(account)
 
+    record_action_outcomes(db, social_account_id=account.id, strategy_id=strategy.id, actions=actions_to_execute)
     db.commit()
+    publish_action_statuses(account_run, actions_to_execute)
 
     if failures:
         cause = next((err for _, err in failures if err and err != "ABORTED"), None) or failures[0][1] or "ACTION_FAILED"
@@ -409,6 +666,40 @@ def _execute_specs(
     return actions_to_execute, results, None
 
 
+def _apply_pacing(
+    db, *, account: SocialAccount, actions: list[Action], payload: list[dict]
+) -> tuple[list[Action], list[dict]]:
+    indexes_by_type: dict[str, list[int]] = {}
+    for index, action in enumerate(actions):
+        indexes_by_type.setdefault(action.action_type, []).append(index)
+
+    now = utc_now()
+    deferred: set[int] = set()
+    for action_type, indexes in indexes_by_type.items():
+        decision = action_pacer.take(
+            platform_key=account.platform_key,
+            social_account_id=account.id,
+            action_type=action_type,
+            requested=len(indexes),
+        )
+        deferred_until = (now + timedelta(seconds=decision.retry_after_seconds)).isoformat()
+        for index in indexes[decision.granted :]:
+            deferred.add(index)
+            action = actions[index]
+            action.metadata_ = {
+                **(action.metadata_ or {}),
+                "deferred_reason": "RATE_LIMITED",
+                "deferred_until": deferred_until,
+            }
+            db.add(action)
+
+    if not deferred:
+        return actions, payload
+    db.commit()
+    kept = [index for index in range(len(actions)) if index not in deferred]
+    return [actions[index] for index in kept], [payload[index] for index in kept]
+
+
 def _extract_tweet_id(url: str) -> str | None:
     m = _TWEET_ID_RE.search(url)
     if not m:
@@ -582,6 +873,8 @@ def _build_search_action_specs(
         action_type = "x_quote"
     else:
         return []
+    # Not capped by the pacing budget: picks over budget are created as queued actions and deferred
+    # by _apply_pacing, so a run that hits the limit resumes with the same candidates.
     max_actions = _get_int_from_config(config, "max_actions", default=3, min_value=1, max_value=50)
     verified_only = bool(config.get("verified_only") is True or action_kind.startswith("x_verified_"))
 
@@ -679,24 +972,46 @@ def _create_action(
     if not idempotency_key:
         return None
 
-    existing = db.scalar(select(Action).where(Action.workspace_id == account_run.workspace_id, Action.idempotency_key == idempotency_key))
-    if existing is not None:
-        return existing
+    idempotency_key = idempotency_key[:500]
+    claimed = db.get(ActionIdempotencyKey, (account_run.workspace_id, idempotency_key))
+    if claimed is not None:
+        return db.scalar(
+            select(Action).where(
+                Action.workspace_id == account_run.workspace_id,
+                Action.id == claimed.action_id,
+                Action.created_at == claimed.created_at,
+            )
+        )
 
+    created_at = utc_now()
     action = Action(
+        id=uuid.uuid4(),
         workspace_id=account_run.workspace_id,
         account_run_id=account_run.id,
         action_type=str(spec.get("action_type") or "").strip()[:32],
         platform_key=str(spec.get("platform_key") or account.platform_key).strip().lower()[:32],
         target_external_id=str(spec.get("target_external_id")).strip()[:200] if spec.get("target_external_id") else None,
         target_url=str(spec.get("target_url")).strip()[:1000] if spec.get("target_url") else None,
-        idempotency_key=idempotency_key[:500],
+        idempotency_key=idempotency_key,
         status="queued",
         error_code=None,
-        metadata_={"strategy_id": str(strategy.id), "strategy_version": strategy.version},
+        metadata_={
+            "strategy_id": str(strategy.id),
+            "strategy_version": strategy.version,
+            "action_params": spec.get("action_params") if isinstance(spec.get("action_params"), dict) else {},
+        },
+        created_at=created_at,
         started_at=None,
         finished_at=None,
     )
+    db.add(
+        ActionIdempotencyKey(
+            workspace_id=account_run.workspace_id,
+            idempotency_key=idempotency_key,
+            action_id=action.id,
+            created_at=created_at,
+        )
+    )
     db.add(action)
     db.commit()
     db.refresh(action)
@@ -709,14 +1024,8 @@ def _store_screenshot_artifact(action: Action, screenshot_base64: str) -> Artifa
     except Exception:
         return None
 
-    workspace_prefix = str(action.workspace_id)
-    storage_key = f"{workspace_prefix}/{action.id}-screenshot.png"
-
-    base_dir = Path(settings.artifacts_dir)
-    path = base_dir / storage_key
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(payload)
+        blob = store_artifact_blob(action.workspace_id, payload, extension=".png", content_type="image/png")
     except Exception:
         return None
 
@@ -724,6 +1033,7 @@ def _store_screenshot_artifact(action: Action, screenshot_base64: str) -> Artifa
         workspace_id=action.workspace_id,
         action_id=action.id,
         type="screenshot",
-        storage_key=storage_key,
-        size=len(payload),
+        storage_key=blob.storage_key,
+        content_hash=blob.content_hash,
+        size=blob.size,
     )
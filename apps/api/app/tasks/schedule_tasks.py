@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select, update
 
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
@@ -12,10 +12,19 @@ from app.models.run import Run
 from app.models.schedule import Schedule
 from app.models.social_account import SocialAccount
 from app.models.strategy import Strategy
-from app.services.schedule_planner import compute_next_run_at, should_skip_run
+from app.services.schedule_occupancy import estimate_schedule_minutes, load_occupancy_calendar
+from app.services.schedule_planner import (
+    OccupancyCalendar,
+    ScheduleTiming,
+    compute_next_run_at,
+    plan_deferred_run_at_groups,
+    plan_next_run_at_groups,
+    should_skip_run,
+)
 from app.services.subscription import (
     effective_parallel_limit,
     get_current_month_period_start,
+    get_pending_runtime_seconds,
     get_workspace_subscription,
     get_workspace_usage_monthly,
     has_remaining_runtime_quota,
@@ -41,15 +50,23 @@ def tick_schedules() -> None:
         if not schedules:
             return
 
-        for schedule in schedules:
-            if schedule.next_run_at is None:
-                schedule.next_run_at = compute_next_run_at(
-                    frequency=schedule.frequency,
-                    schedule_spec=schedule.schedule_spec or {},
-                    random_config=schedule.random_config or {},
-                    now=now,
-                )
-                db.add(schedule)
+        occupancy = load_occupancy_calendar(db, now=now)
+        unplanned = [schedule for schedule in schedules if schedule.next_run_at is None]
+        if unplanned:
+            groups = plan_next_run_at_groups(
+                [
+                    ScheduleTiming(
+                        frequency=schedule.frequency,
+                        schedule_spec=schedule.schedule_spec or {},
+                        random_config=schedule.random_config or {},
+                        cost_minutes=estimate_schedule_minutes(schedule.max_parallel),
+                    )
+                    for schedule in unplanned
+                ],
+                now=now,
+                occupancy=occupancy,
+            )
+            _update_next_run_at(db, unplanned, groups)
         db.commit()
 
         due_schedules = (
@@ -66,6 +83,7 @@ def tick_schedules() -> None:
             .all()
         )
 
+        deferred: list[Schedule] = []
         for schedule in due_schedules:
             if _has_running_run(db, schedule.id):
                 continue
@@ -73,18 +91,18 @@ def tick_schedules() -> None:
             subscription = get_workspace_subscription(db, workspace_id=schedule.workspace_id)
             active_check = is_subscription_active(subscription, now=now)
             if not active_check.allowed:
-                schedule.next_run_at = now + timedelta(hours=6)
-                db.add(schedule)
-                db.commit()
+                deferred.append(schedule)
                 continue
 
             period_start = get_current_month_period_start(now)
             usage = get_workspace_usage_monthly(db, workspace_id=schedule.workspace_id, period_start=period_start)
-            runtime_check = has_remaining_runtime_quota(subscription, usage)
+            runtime_check = has_remaining_runtime_quota(
+                subscription,
+                usage,
+                pending_seconds=get_pending_runtime_seconds(workspace_id=schedule.workspace_id, period_start=period_start),
+            )
             if not runtime_check.allowed:
-                schedule.next_run_at = now + timedelta(hours=6)
-                db.add(schedule)
-                db.commit()
+                deferred.append(schedule)
                 continue
 
             strategy = db.get(Strategy, schedule.strategy_id)
@@ -94,6 +112,8 @@ def tick_schedules() -> None:
                     schedule_spec=schedule.schedule_spec or {},
                     random_config=schedule.random_config or {},
                     now=now,
+                    occupancy=occupancy,
+                    cost_minutes=estimate_schedule_minutes(schedule.max_parallel),
                 )
                 schedule.last_run_at = now
                 db.add(schedule)
@@ -107,12 +127,14 @@ def tick_schedules() -> None:
                     schedule_spec=schedule.schedule_spec or {},
                     random_config=schedule.random_config or {},
                     now=now,
+                    occupancy=occupancy,
+                    cost_minutes=estimate_schedule_minutes(schedule.max_parallel),
                 )
                 db.add(schedule)
                 db.commit()
                 continue
 
-            run, account_run_ids = _create_run_for_schedule(db, schedule, strategy, subscription, now)
+            run, account_run_ids = _create_run_for_schedule(db, schedule, strategy, subscription, now, occupancy)
             if run is None:
                 continue
 
@@ -122,6 +144,36 @@ def tick_schedules() -> None:
                 except Exception:
                     pass
 
+        if deferred:
+            _defer_schedules(db, deferred, not_before=now + timedelta(hours=6))
+
+
+def _defer_schedules(db, schedules: list[Schedule], *, not_before: datetime) -> None:
+    groups = plan_deferred_run_at_groups(
+        [schedule.schedule_spec or {} for schedule in schedules],
+        not_before=not_before,
+    )
+    _update_next_run_at(db, schedules, groups)
+    db.commit()
+
+
+def _update_next_run_at(db, schedules: list[Schedule], groups: list[tuple[list[int], datetime | None]]) -> None:
+    # One UPDATE for the whole batch: each timing group maps its ids to a shared next_run_at.
+    whens = [
+        (Schedule.id.in_([schedules[index].id for index in indexes]), next_run_at)
+        for indexes, next_run_at in groups
+        if next_run_at is not None
+    ]
+    if not whens:
+        return
+    ids = [schedules[index].id for indexes, next_run_at in groups if next_run_at is not None for index in indexes]
+    db.execute(
+        update(Schedule)
+        .where(Schedule.id.in_(ids))
+        .values(next_run_at=case(*whens, else_=Schedule.next_run_at))
+        .execution_options(synchronize_session=False)
+    )
+
 
 def _has_running_run(db, schedule_id) -> bool:
     running_count = db.scalar(
@@ -138,6 +190,7 @@ def _create_run_for_schedule(
     strategy: Strategy,
     subscription,
     now: datetime,
+    occupancy: OccupancyCalendar,
 ) -> tuple[Run, list[uuid.UUID]]:
     accounts = _resolve_accounts(db, schedule.workspace_id, schedule.account_selector or {})
     limit = effective_parallel_limit(subscription, schedule_max_parallel=schedule.max_parallel)
@@ -172,6 +225,8 @@ def _create_run_for_schedule(
         schedule_spec=schedule.schedule_spec or {},
         random_config=schedule.random_config or {},
         now=now,
+        occupancy=occupancy,
+        cost_minutes=estimate_schedule_minutes(schedule.max_parallel),
     )
     db.add(schedule)
     db.commit()
@@ -1,20 +1,45 @@
 from __future__ import annotations
 
 import base64
+import json
 import random
 import re
 import time
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from typing import Any, Literal
 
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from playwright.sync_api import sync_playwright
 
+from app.profiles import profile_store, profiles_enabled
 
 ActionStatus = Literal["succeeded", "failed", "skipped"]
 BandwidthMode = Literal["eco", "balanced", "full"]
 
+# After these the context no longer holds a usable session, so its storage state must not replace the credential.
+_SESSION_LOST_ERROR_CODES = {"AUTH_REQUIRED", "ACCOUNT_LOCKED", "CAPTCHA_REQUIRED"}
+
+_HEALTH_CHECK_ACTIONS = {"health_check", "x_health_check"}
+# Actions on distinct tweets that do not depend on each other's outcome.
+_INDEPENDENT_ACTIONS = {
+    "x_like",
+    "like",
+    "x_repost",
+    "x_retweet",
+    "retweet",
+    "repost",
+    "x_reply",
+    "reply",
+    "comment",
+    "x_comment",
+    "x_quote",
+    "quote",
+}
+
 
 @dataclass(frozen=True)
 class ExecuteActionResult:
@@ -37,6 +62,7 @@ def execute_action(
     action_params: dict[str, Any] | None,
     fingerprint_profile: dict[str, Any] | None,
     headless: bool,
+    profile_key: str | None = None,
 ) -> ExecuteActionResult:
     platform = platform_key.strip().lower()
     action = action_type.strip().lower()
@@ -52,29 +78,32 @@ def execute_action(
         )
 
     try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=headless)
-            context_kwargs = {"storage_state": storage_state, **_context_kwargs_from_fingerprint(fingerprint_profile or {})}
-            context = browser.new_context(**context_kwargs)
-            _install_bandwidth_mode(context, bandwidth_mode)
+        with sync_playwright() as pw, _open_context(
+            pw,
+            storage_state=storage_state,
+            fingerprint_profile=fingerprint_profile,
+            headless=headless,
+            profile_key=profile_key,
+        ) as context:
             page = context.new_page()
+            meter = _install_bandwidth_mode(context, page, bandwidth_mode)
             page.set_default_timeout(15_000)
             page.set_default_navigation_timeout(30_000)
 
-            try:
-                if action in {"health_check", "x_health_check"}:
-                    return _x_health_check(page)
-                if action in {"x_like", "like"}:
-                    return _x_like(page, target_url=target_url, tweet_id=target_external_id)
-                if action in {"x_repost", "x_retweet", "retweet", "repost"}:
-                    return _x_repost(page, target_url=target_url, tweet_id=target_external_id)
-                if action in {"x_search_collect", "search_collect"}:
-                    return _x_search_collect(page, search_url=target_url, params=action_params or {})
-                if action in {"x_reply", "reply", "comment", "x_comment"}:
-                    return _x_reply(page, target_url=target_url, tweet_id=target_external_id, params=action_params or {})
-                if action in {"x_quote", "quote"}:
-                    return _x_quote(page, target_url=target_url, tweet_id=target_external_id, params=action_params or {})
-                return ExecuteActionResult(
+            if action in {"health_check", "x_health_check"}:
+                result = _x_health_check(page)
+            elif action in {"x_like", "like"}:
+                result = _x_like(page, target_url=target_url, tweet_id=target_external_id)
+            elif action in {"x_repost", "x_retweet", "retweet", "repost"}:
+                result = _x_repost(page, target_url=target_url, tweet_id=target_external_id)
+            elif action in {"x_search_collect", "search_collect"}:
+                result = _x_search_collect(page, search_url=target_url, params=action_params or {})
+            elif action in {"x_reply", "reply", "comment", "x_comment"}:
+                result = _x_reply(page, target_url=target_url, tweet_id=target_external_id, params=action_params or {})
+            elif action in {"x_quote", "quote"}:
+                result = _x_quote(page, target_url=target_url, tweet_id=target_external_id, params=action_params or {})
+            else:
+                result = ExecuteActionResult(
                     status="failed",
                     error_code="UNSUPPORTED_ACTION",
                     message=f"Unsupported action_type: {action_type}",
@@ -82,11 +111,7 @@ def execute_action(
                     screenshot_base64=None,
                     metadata={},
                 )
-            finally:
-                try:
-                    context.close()
-                finally:
-                    browser.close()
+            return _with_network_usage(result, meter.usage())
     except PlaywrightTimeoutError:
         return ExecuteActionResult(
             status="failed",
@@ -124,6 +149,9 @@ def execute_actions_batch(
     bandwidth_mode: BandwidthMode | None,
     fingerprint_profile: dict[str, Any] | None,
     headless: bool,
+    profile_key: str | None = None,
+    on_storage_state: Callable[[dict[str, Any]], None] | None = None,
+    parallelism: int = 1,
 ) -> list[ExecuteActionResult]:
     platform = platform_key.strip().lower()
     if platform != "x":
@@ -140,79 +168,28 @@ def execute_actions_batch(
         ]
 
     try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=headless)
-            context_kwargs = {"storage_state": storage_state, **_context_kwargs_from_fingerprint(fingerprint_profile or {})}
-            context = browser.new_context(**context_kwargs)
-            _install_bandwidth_mode(context, bandwidth_mode)
-            page = context.new_page()
-            page.set_default_timeout(15_000)
-            page.set_default_navigation_timeout(30_000)
-
-            results: list[ExecuteActionResult] = []
-            aborted = False
-            for item in actions:
-                if aborted:
-                    results.append(
-                        ExecuteActionResult(
-                            status="failed",
-                            error_code="ABORTED",
-                            message="Previous action failed",
-                            current_url=str(getattr(page, "url", "")) or None,
-                            screenshot_base64=None,
-                            metadata={},
-                        )
-                    )
-                    continue
+        with sync_playwright() as pw, _open_context(
+            pw,
+            storage_state=storage_state,
+            fingerprint_profile=fingerprint_profile,
+            headless=headless,
+            profile_key=profile_key,
+        ) as context:
+            page, meter = _new_action_page(context, bandwidth_mode)
+            if parallelism > 1:
+                results = _run_batch_parallel(
+                    context, page, meter, actions, parallelism=parallelism, bandwidth_mode=bandwidth_mode
+                )
+            else:
+                results = _run_batch_sequential(page, meter, actions)
 
-                action_type = str(item.get("action_type") or "")
-                target_url = str(item.get("target_url")) if item.get("target_url") else None
-                target_external_id = str(item.get("target_external_id")) if item.get("target_external_id") else None
-                action_params = item.get("action_params") if isinstance(item.get("action_params"), dict) else {}
+            if on_storage_state is not None and not any(
+                item.error_code in _SESSION_LOST_ERROR_CODES for item in results
+            ):
                 try:
-                    res = _execute_action_on_page(
-                        page,
-                        action_type=action_type,
-                        target_url=target_url,
-                        target_external_id=target_external_id,
-                        action_params=action_params,
-                    )
-                except PlaywrightTimeoutError:
-                    res = ExecuteActionResult(
-                        status="failed",
-                        error_code="NETWORK_TIMEOUT",
-                        message="Playwright timeout",
-                        current_url=str(getattr(page, "url", "")) or None,
-                        screenshot_base64=_safe_screenshot(page),
-                        metadata={},
-                    )
-                except PlaywrightError as exc:
-                    res = ExecuteActionResult(
-                        status="failed",
-                        error_code="BROWSER_ERROR",
-                        message=str(exc),
-                        current_url=str(getattr(page, "url", "")) or None,
-                        screenshot_base64=_safe_screenshot(page),
-                        metadata={},
-                    )
-                except Exception as exc:
-                    res = ExecuteActionResult(
-                        status="failed",
-                        error_code="INTERNAL_ERROR",
-                        message=str(exc),
-                        current_url=str(getattr(page, "url", "")) or None,
-                        screenshot_base64=_safe_screenshot(page),
-                        metadata={},
-                    )
-
-                results.append(res)
-                if res.status == "failed":
-                    aborted = True
-
-            try:
-                context.close()
-            finally:
-                browser.close()
+                    on_storage_state(context.storage_state())
+                except Exception:
+                    pass
 
             return results
     except Exception as exc:
@@ -229,33 +206,337 @@ def execute_actions_batch(
         ]
 
 
-def _install_bandwidth_mode(context: Any, mode: BandwidthMode | None) -> None:
-    if mode is None:
-        return
-    normalized = str(mode).strip().lower()
-    if normalized not in {"eco", "balanced"}:
-        return
+def _new_action_page(context: Any, bandwidth_mode: BandwidthMode | None) -> tuple[Any, NetworkMeter]:
+    page = context.new_page()
+    meter = _install_bandwidth_mode(context, page, bandwidth_mode)
+    page.set_default_timeout(15_000)
+    page.set_default_navigation_timeout(30_000)
+    return page, meter
 
-    def handle_route(route: Any, request: Any) -> None:  # Playwright types are runtime-heavy to import.
-        resource_type = getattr(request, "resource_type", "")
-        url = str(getattr(request, "url", ""))
 
-        if normalized == "eco":
-            if resource_type in {"image", "media"}:
-                route.abort()
-                return
-        if normalized == "balanced":
-            if resource_type == "media":
-                route.abort()
-                return
+def _run_batch_sequential(page: Any, meter: NetworkMeter, actions: list[dict[str, Any]]) -> list[ExecuteActionResult]:
+    results: list[ExecuteActionResult] = []
+    aborted = False
+    for item in actions:
+        if aborted:
+            results.append(_aborted_result(page, "Previous action failed"))
+            continue
+        res = _run_batch_item(page, meter, item)
+        results.append(res)
+        if res.status == "failed":
+            aborted = True
+    return results
+
+
+def _run_batch_parallel(
+    context: Any,
+    page: Any,
+    meter: NetworkMeter,
+    actions: list[dict[str, Any]],
+    *,
+    parallelism: int,
+    bandwidth_mode: BandwidthMode | None,
+) -> list[ExecuteActionResult]:
+    results: list[ExecuteActionResult | None] = [None] * len(actions)
+    session_lost = False
 
-        if "doubleclick.net" in url or "google-analytics.com" in url:
-            route.abort()
+    def _run(lane_page: Any, lane_meter: NetworkMeter, index: int, usage_before: dict[str, Any] | None = None) -> None:
+        nonlocal session_lost
+        if session_lost:
+            results[index] = _aborted_result(lane_page, "Batch stopped after a failed health check or lost session")
             return
+        res = _run_batch_item(lane_page, lane_meter, actions[index], usage_before=usage_before)
+        results[index] = res
+        if res.error_code in _SESSION_LOST_ERROR_CODES:
+            session_lost = True
+
+    # Health checks run first and collects before acts, all on the main page. A failed act does not
+    # abort the others, but a lost session stops everything after it.
+    kinds = [_batch_action_kind(item) for item in actions]
+    for index in [i for i, kind in enumerate(kinds) if kind == "health"]:
+        _run(page, meter, index)
+        if results[index] is not None and results[index].status == "failed":
+            session_lost = True
+    for index in [i for i, kind in enumerate(kinds) if kind == "other"]:
+        _run(page, meter, index)
+
+    # The sync API is bound to this thread, so acts are not run concurrently. Instead extra pages of
+    # the same context start loading upcoming targets while the current act runs; by the time an act
+    # reaches its page the tweet is usually rendered and _x_open_target acts in place.
+    pending = deque(i for i, kind in enumerate(kinds) if kind == "act")
+    lanes: list[tuple[Any, NetworkMeter]] = [(page, meter)]
+    for _ in range(min(parallelism, len(pending)) - 1):
+        try:
+            lanes.append(_new_action_page(context, bandwidth_mode))
+        except PlaywrightError:
+            break
+
+    def _preload(
+        lane_page: Any, lane_meter: NetworkMeter, *, navigate: bool = True
+    ) -> tuple[int, dict[str, Any]] | None:
+        if not pending:
+            return None
+        index = pending.popleft()
+        usage_before = lane_meter.usage()
+        target_url = actions[index].get("target_url")
+        if navigate and not session_lost and target_url:
+            try:
+                lane_page.goto(str(target_url), wait_until="commit")
+            except PlaywrightError:
+                # The act navigates again itself.
+                pass
+        return index, usage_before
+
+    # The main page keeps whatever the collect left on screen so its first act can still find the target there.
+    assigned = deque(
+        (lane_page, lane_meter, _preload(lane_page, lane_meter, navigate=lane_page is not page))
+        for lane_page, lane_meter in lanes
+    )
+    while assigned:
+        lane_page, lane_meter, slot = assigned.popleft()
+        if slot is None:
+            continue
+        index, usage_before = slot
+        _run(lane_page, lane_meter, index, usage_before)
+        assigned.append((lane_page, lane_meter, _preload(lane_page, lane_meter)))
+
+    for lane_page, _ in lanes[1:]:
+        try:
+            lane_page.close()
+        except PlaywrightError:
+            pass
+
+    return [res if res is not None else _aborted_result(page, "Action was not executed") for res in results]
+
+
+def _batch_action_kind(item: dict[str, Any]) -> str:
+    action = str(item.get("action_type") or "").strip().lower()
+    if action in _HEALTH_CHECK_ACTIONS:
+        return "health"
+    if action in _INDEPENDENT_ACTIONS:
+        return "act"
+    return "other"
+
+
+def _run_batch_item(
+    page: Any, meter: NetworkMeter, item: dict[str, Any], *, usage_before: dict[str, Any] | None = None
+) -> ExecuteActionResult:
+    action_type = str(item.get("action_type") or "")
+    target_url = str(item.get("target_url")) if item.get("target_url") else None
+    target_external_id = str(item.get("target_external_id")) if item.get("target_external_id") else None
+    action_params = item.get("action_params") if isinstance(item.get("action_params"), dict) else {}
+    if usage_before is None:
+        usage_before = meter.usage()
+    try:
+        res = _execute_action_on_page(
+            page,
+            action_type=action_type,
+            target_url=target_url,
+            target_external_id=target_external_id,
+            action_params=action_params,
+        )
+    except PlaywrightTimeoutError:
+        res = ExecuteActionResult(
+            status="failed",
+            error_code="NETWORK_TIMEOUT",
+            message="Playwright timeout",
+            current_url=str(getattr(page, "url", "")) or None,
+            screenshot_base64=_safe_screenshot(page),
+            metadata={},
+        )
+    except PlaywrightError as exc:
+        res = ExecuteActionResult(
+            status="failed",
+            error_code="BROWSER_ERROR",
+            message=str(exc),
+            current_url=str(getattr(page, "url", "")) or None,
+            screenshot_base64=_safe_screenshot(page),
+            metadata={},
+        )
+    except Exception as exc:
+        res = ExecuteActionResult(
+            status="failed",
+            error_code="INTERNAL_ERROR",
+            message=str(exc),
+            current_url=str(getattr(page, "url", "")) or None,
+            screenshot_base64=_safe_screenshot(page),
+            metadata={},
+        )
+    return _with_network_usage(res, meter.usage(since=usage_before))
+
+
+def _aborted_result(page: Any, message: str) -> ExecuteActionResult:
+    return ExecuteActionResult(
+        status="failed",
+        error_code="ABORTED",
+        message=message,
+        current_url=str(getattr(page, "url", "")) or None,
+        screenshot_base64=None,
+        metadata={},
+    )
 
-        route.continue_()
 
-    context.route("**/*", handle_route)
+@contextmanager
+def _open_context(
+    pw: Any,
+    *,
+    storage_state: dict[str, Any],
+    fingerprint_profile: dict[str, Any] | None,
+    headless: bool,
+    profile_key: str | None,
+) -> Iterator[Any]:
+    context_kwargs = _context_kwargs_from_fingerprint(fingerprint_profile or {})
+    if profile_key and profiles_enabled():
+        # Persistent contexts cannot take storage_state; the stored cookies are re-applied on top of
+        # the profile so the credential stays authoritative, while cache and local storage carry over.
+        # localStorage from storage_state only fills keys the profile does not hold yet (a cold profile).
+        with profile_store.lease(profile_key) as user_data_dir:
+            context = pw.chromium.launch_persistent_context(str(user_data_dir), headless=headless, **context_kwargs)
+            try:
+                cookies = storage_state.get("cookies") if isinstance(storage_state, dict) else None
+                if isinstance(cookies, list) and cookies:
+                    context.add_cookies(cookies)
+                origins_script = _local_storage_init_script(storage_state)
+                if origins_script is not None:
+                    context.add_init_script(origins_script)
+                yield context
+            finally:
+                context.close()
+        return
+
+    browser = pw.chromium.launch(headless=headless)
+    try:
+        context = browser.new_context(storage_state=storage_state, **context_kwargs)
+        try:
+            yield context
+        finally:
+            context.close()
+    finally:
+        browser.close()
+
+
+def _local_storage_init_script(storage_state: dict[str, Any]) -> str | None:
+    origins = storage_state.get("origins") if isinstance(storage_state, dict) else None
+    if not isinstance(origins, list):
+        return None
+    items_by_origin: dict[str, dict[str, str]] = {}
+    for origin in origins:
+        if not isinstance(origin, dict) or not isinstance(origin.get("origin"), str):
+            continue
+        entries = origin.get("localStorage")
+        if not isinstance(entries, list):
+            continue
+        items = {
+            str(entry["name"]): str(entry["value"])
+            for entry in entries
+            if isinstance(entry, dict) and "name" in entry and "value" in entry
+        }
+        if items:
+            items_by_origin[origin["origin"]] = items
+    if not items_by_origin:
+        return None
+    return (
+        "(() => { const items = %s[location.origin]; if (!items) return; try {"
+        " for (const [name, value] of Object.entries(items)) {"
+        " if (localStorage.getItem(name) === null) localStorage.setItem(name, value); }"
+        " } catch (e) {} })();" % json.dumps(items_by_origin)
+    )
+
+
+_ANALYTICS_URL_PATTERNS = [
+    "*doubleclick.net*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*/i/api/1.1/jot/*",
+    "*/1.1/jot/client_event*",
+]
+
+# Matched by Chromium itself (CDP Network.setBlockedURLs), so requests never round-trip into Python.
+# X serves images and video without file extensions, hence the host/path patterns.
+_BLOCKED_URL_PATTERNS: dict[str, list[str]] = {
+    "balanced": [
+        *_ANALYTICS_URL_PATTERNS,
+        "*://video.twimg.com/*",
+        "*.mp4*",
+        "*.m3u8*",
+        "*.m4s*",
+    ],
+    "eco": [
+        *_ANALYTICS_URL_PATTERNS,
+        "*://video.twimg.com/*",
+        "*.mp4*",
+        "*.m3u8*",
+        "*.m4s*",
+        "*://pbs.twimg.com/*",
+        "*://abs.twimg.com/emoji/*",
+        "*://abs.twimg.com/sticky/*",
+        "*.png*",
+        "*.jpg*",
+        "*.jpeg*",
+        "*.gif*",
+        "*.webp*",
+        "*.woff*",
+        "*.woff2*",
+        "*.ttf*",
+        "*.otf*",
+        "*/i/api/2/badge_count/*",
+        "*/i/api/fleets/*",
+        "*/live_pipeline/*",
+        "*/i/api/1.1/hashflags.json*",
+        "*/i/api/graphql/*/ExploreSidebar*",
+        "*/i/api/graphql/*/TrendHistory*",
+        "*/i/api/graphql/*/WhoToFollow*",
+    ],
+}
+
+
+@dataclass
+class NetworkMeter:
+    mode: str
+    bytes: int = 0
+    requests: int = 0
+    blocked: int = 0
+    enabled: bool = False
+
+    def on_loading_finished(self, params: dict[str, Any]) -> None:
+        self.requests += 1
+        self.bytes += int(params.get("encodedDataLength") or 0)
+
+    def on_loading_failed(self, params: dict[str, Any]) -> None:
+        if params.get("blockedReason"):
+            self.blocked += 1
+        else:
+            self.requests += 1
+
+    def usage(self, *, since: dict[str, Any] | None = None) -> dict[str, Any]:
+        usage = {"mode": self.mode, "bytes": self.bytes, "requests": self.requests, "blocked": self.blocked}
+        if since is not None:
+            for key in ("bytes", "requests", "blocked"):
+                usage[key] -= int(since.get(key) or 0)
+        if not self.enabled:
+            usage["metered"] = False
+        return usage
+
+
+def _install_bandwidth_mode(context: Any, page: Any, mode: BandwidthMode | None) -> NetworkMeter:
+    normalized = str(mode).strip().lower() if mode else "full"
+    meter = NetworkMeter(mode=normalized)
+    try:
+        cdp = context.new_cdp_session(page)
+        cdp.on("Network.loadingFinished", meter.on_loading_finished)
+        cdp.on("Network.loadingFailed", meter.on_loading_failed)
+        cdp.send("Network.enable")
+        patterns = _BLOCKED_URL_PATTERNS.get(normalized)
+        if patterns:
+            cdp.send("Network.setBlockedURLs", {"urls": patterns})
+        meter.enabled = True
+    except PlaywrightError:
+        pass
+    return meter
+
+
+def _with_network_usage(result: ExecuteActionResult, usage: dict[str, Any]) -> ExecuteActionResult:
+    return replace(result, metadata={**(result.metadata or {}), "network": usage})
 
 
 def _context_kwargs_from_fingerprint(profile: dict[str, Any]) -> dict[str, Any]:
@@ -506,6 +787,50 @@ def _x_health_check(page: Any) -> ExecuteActionResult:
     )
 
 
+def _x_tweet_article_selector(tweet_id: str) -> str:
+    # The tweet's own permalink is the link wrapping its timestamp; a plain /status/{id} match would also
+    # hit tweets that quote or link the target.
+    return f'article:has(a[href$="/status/{tweet_id}"]:has(time))'
+
+
+def _x_open_target(page: Any, *, target_url: str, tweet_id: str | None) -> None:
+    # Callers locate the article by the same tweet_id afterwards, so only a known numeric id can be matched in place.
+    tweet_id = str(tweet_id).strip() if tweet_id and str(tweet_id).strip().isdigit() else None
+    article_selector = _x_tweet_article_selector(tweet_id) if tweet_id else "article"
+
+    # A batch that just collected from a search or timeline usually still shows the target; act in place,
+    # unless the page shows more than one match and the target is ambiguous.
+    current_url = str(getattr(page, "url", "") or "")
+    if tweet_id and current_url.startswith(("https://x.com/", "https://twitter.com/")):
+        try:
+            matches = page.locator(article_selector)
+            if matches.count() == 1 and matches.first.is_visible():
+                return
+        except PlaywrightError:
+            pass
+
+    # X renders client-side, so waiting for DOMContentLoaded adds latency without guaranteeing content;
+    # wait for the target article, or anything the risk/login checks below look for, instead. A page the
+    # batch runner preloaded is already on its way to the target and is not reloaded.
+    if current_url.split("?")[0].rstrip("/") != target_url.split("?")[0].rstrip("/"):
+        page.goto(target_url, wait_until="commit")
+    try:
+        page.wait_for_selector(
+            ", ".join(
+                [
+                    article_selector,
+                    "[data-testid='loginButton']",
+                    "a[href*='/i/flow/login']",
+                    "iframe[src*='arkose']",
+                    "[data-testid='error-detail']",
+                ]
+            ),
+            timeout=15_000,
+        )
+    except PlaywrightTimeoutError:
+        pass
+
+
 def _x_is_logged_in(page: Any) -> bool:
     url = str(getattr(page, "url", ""))
     if "/i/flow/login" in url or "/login" in url:
@@ -579,7 +904,7 @@ def _x_like(page: Any, *, target_url: str | None, tweet_id: str | None) -> Execu
             metadata={},
         )
 
-    page.goto(str(target_url), wait_until="domcontentloaded")
+    _x_open_target(page, target_url=str(target_url), tweet_id=tweet_id)
 
     risk = _x_detect_risk(page)
     if risk is not None:
@@ -606,7 +931,7 @@ def _x_like(page: Any, *, target_url: str | None, tweet_id: str | None) -> Execu
 
     try:
         if tweet_id and str(tweet_id).strip():
-            article = page.locator("article").filter(has=page.locator(f'a[href*=\"/status/{tweet_id}\"]')).first
+            article = page.locator(_x_tweet_article_selector(str(tweet_id).strip())).first
         else:
             article = page.locator("article").first
         article.wait_for(state="visible", timeout=10_000)
@@ -701,7 +1026,7 @@ def _x_reply(page: Any, *, target_url: str | None, tweet_id: str | None, params:
             metadata={},
         )
 
-    page.goto(str(target_url), wait_until="domcontentloaded")
+    _x_open_target(page, target_url=str(target_url), tweet_id=tweet_id)
 
     risk = _x_detect_risk(page)
     if risk is not None:
@@ -728,7 +1053,7 @@ def _x_reply(page: Any, *, target_url: str | None, tweet_id: str | None, params:
 
     try:
         if tweet_id and str(tweet_id).strip():
-            article = page.locator("article").filter(has=page.locator(f'a[href*=\"/status/{tweet_id}\"]')).first
+            article = page.locator(_x_tweet_article_selector(str(tweet_id).strip())).first
         else:
             article = page.locator("article").first
         article.wait_for(state="visible", timeout=10_000)
@@ -863,7 +1188,7 @@ def _x_quote(page: Any, *, target_url: str | None, tweet_id: str | None, params:
             metadata={},
         )
 
-    page.goto(str(target_url), wait_until="domcontentloaded")
+    _x_open_target(page, target_url=str(target_url), tweet_id=tweet_id)
 
     risk = _x_detect_risk(page)
     if risk is not None:
@@ -890,7 +1215,7 @@ def _x_quote(page: Any, *, target_url: str | None, tweet_id: str | None, params:
 
     try:
         if tweet_id and str(tweet_id).strip():
-            article = page.locator("article").filter(has=page.locator(f'a[href*=\"/status/{tweet_id}\"]')).first
+            article = page.locator(_x_tweet_article_selector(str(tweet_id).strip())).first
         else:
             article = page.locator("article").first
         article.wait_for(state="visible", timeout=10_000)
@@ -1122,7 +1447,7 @@ def _x_repost(page: Any, *, target_url: str | None, tweet_id: str | None) -> Exe
             metadata={},
         )
 
-    page.goto(str(target_url), wait_until="domcontentloaded")
+    _x_open_target(page, target_url=str(target_url), tweet_id=tweet_id)
 
     risk = _x_detect_risk(page)
     if risk is not None:
@@ -1149,7 +1474,7 @@ def _x_repost(page: Any, *, target_url: str | None, tweet_id: str | None) -> Exe
 
     try:
         if tweet_id and str(tweet_id).strip():
-            article = page.locator("article").filter(has=page.locator(f'a[href*=\"/status/{tweet_id}\"]')).first
+            article = page.locator(_x_tweet_article_selector(str(tweet_id).strip())).first
         else:
             article = page.locator("article").first
         article.wait_for(state="visible", timeout=10_000)
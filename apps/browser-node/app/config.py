@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import socket
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +17,31 @@ class Settings(BaseSettings):
     internal_token: str = Field(default="change-me", alias="BROWSER_NODE_INTERNAL_TOKEN")
     novnc_public_url: str | None = Field(default=None, alias="NOVNC_PUBLIC_URL")
     headless: bool = Field(default=False, alias="BROWSER_NODE_HEADLESS")
+    screen: str = Field(default="1280x720x24", alias="BROWSER_NODE_SCREEN")
+    display_pool_size: int = Field(default=0, alias="BROWSER_NODE_DISPLAY_POOL_SIZE")
+    display_base: int = Field(default=100, alias="BROWSER_NODE_DISPLAY_BASE")
+    vnc_base_port: int = Field(default=5910, alias="BROWSER_NODE_VNC_BASE_PORT")
+    novnc_base_port: int = Field(default=7910, alias="BROWSER_NODE_NOVNC_BASE_PORT")
+    novnc_web_dir: str = Field(default="/usr/share/novnc", alias="BROWSER_NODE_NOVNC_WEB_DIR")
+    novnc_public_url_template: str | None = Field(default=None, alias="NOVNC_PUBLIC_URL_TEMPLATE")
+    max_login_sessions: int = Field(default=20, alias="BROWSER_NODE_MAX_LOGIN_SESSIONS")
+    login_contexts_per_browser: int = Field(default=8, alias="BROWSER_NODE_LOGIN_CONTEXTS_PER_BROWSER")
+    login_ttl_seconds: float = Field(default=1800.0, alias="BROWSER_NODE_LOGIN_TTL_SECONDS")
+    login_idle_seconds: float = Field(default=600.0, alias="BROWSER_NODE_LOGIN_IDLE_SECONDS")
+    browser_idle_seconds: float = Field(default=120.0, alias="BROWSER_NODE_BROWSER_IDLE_SECONDS")
+    reaper_interval_seconds: float = Field(default=5.0, alias="BROWSER_NODE_REAPER_INTERVAL_SECONDS")
+    node_id: str = Field(default_factory=socket.gethostname, alias="BROWSER_NODE_ID")
+    persistent_profiles: bool = Field(default=False, alias="BROWSER_NODE_PERSISTENT_PROFILES")
+    profiles_dir: str = Field(default="/data/profiles", alias="BROWSER_NODE_PROFILES_DIR")
+    profiles_max_bytes: int = Field(default=5 * 1024**3, alias="BROWSER_NODE_PROFILES_MAX_BYTES")
+    profiles_sweep_interval_seconds: float = Field(default=300.0, alias="BROWSER_NODE_PROFILES_SWEEP_INTERVAL_SECONDS")
+    max_page_parallelism: int = Field(default=4, alias="BROWSER_NODE_MAX_PAGE_PARALLELISM")
+    storage_state_cache_size: int = Field(default=1000, alias="BROWSER_NODE_STORAGE_STATE_CACHE_SIZE")
+    api_callback_url: str | None = Field(default=None, alias="BROWSER_NODE_API_CALLBACK_URL")
+    login_watch_interval_seconds: float = Field(default=0.25, alias="BROWSER_NODE_LOGIN_WATCH_INTERVAL_SECONDS")
+    login_cookie_check_interval_seconds: float = Field(
+        default=2.0, alias="BROWSER_NODE_LOGIN_COOKIE_CHECK_INTERVAL_SECONDS"
+    )
 
 
 settings = Settings()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.config import settings
+
+
+class DisplayPoolExhaustedError(RuntimeError):
+    pass
+
+
+@dataclass
+class VirtualDisplay:
+    number: int
+    vnc_port: int
+    web_port: int
+    processes: list[subprocess.Popen] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f":{self.number}"
+
+    def public_url(self) -> str | None:
+        template = settings.novnc_public_url_template
+        if template is None or not template.strip():
+            return settings.novnc_public_url
+        return template.strip().format(port=self.web_port, display=self.number)
+
+
+# Each slot is one Xvfb screen with its own x11vnc and websockify/noVNC port, so concurrent
+# headed logins never share a screen.
+class DisplayAllocator:
+    def __init__(self, *, size: int, display_base: int, vnc_base_port: int, web_base_port: int) -> None:
+        self._size = max(0, int(size))
+        self._display_base = display_base
+        self._vnc_base_port = vnc_base_port
+        self._web_base_port = web_base_port
+        self._lock = threading.Lock()
+        self._free = list(range(self._size))
+
+    @property
+    def enabled(self) -> bool:
+        return self._size > 0
+
+    def acquire(self) -> VirtualDisplay:
+        with self._lock:
+            if not self._free:
+                raise DisplayPoolExhaustedError("No free virtual display on this node")
+            slot = self._free.pop(0)
+
+        display = VirtualDisplay(
+            number=self._display_base + slot,
+            vnc_port=self._vnc_base_port + slot,
+            web_port=self._web_base_port + slot,
+        )
+        try:
+            _start_display(display)
+        except Exception:
+            _stop_processes(display)
+            with self._lock:
+                self._free.append(slot)
+            raise
+        return display
+
+    def release(self, display: VirtualDisplay) -> None:
+        _stop_processes(display)
+        slot = display.number - self._display_base
+        with self._lock:
+            if 0 <= slot < self._size and slot not in self._free:
+                self._free.append(slot)
+
+
+display_allocator = DisplayAllocator(
+    size=settings.display_pool_size,
+    display_base=settings.display_base,
+    vnc_base_port=settings.vnc_base_port,
+    web_base_port=settings.novnc_base_port,
+)
+
+
+def screen_size() -> tuple[int, int]:
+    try:
+        width, height = settings.screen.lower().split("x")[:2]
+        return int(width), int(height)
+    except ValueError:
+        return 1280, 720
+
+
+def _start_display(display: VirtualDisplay) -> None:
+    # A lock file left by a crashed Xvfb would make the new server refuse the display number.
+    Path(f"/tmp/.X{display.number}-lock").unlink(missing_ok=True)
+    display.processes.append(
+        _spawn(["Xvfb", display.name, "-screen", "0", settings.screen, "-ac", "+extension", "RANDR", "-nolisten", "tcp"])
+    )
+    socket_path = Path(f"/tmp/.X11-unix/X{display.number}")
+    deadline = time.monotonic() + 5
+    while not socket_path.exists():
+        if display.processes[0].poll() is not None or time.monotonic() >= deadline:
+            raise RuntimeError(f"Xvfb did not start on display {display.name}")
+        time.sleep(0.05)
+
+    display.processes.append(
+        _spawn(
+            [
+                "x11vnc",
+                "-display",
+                display.name,
+                "-forever",
+                "-shared",
+                "-quiet",
+                "-nopw",
+                "-rfbport",
+                str(display.vnc_port),
+            ]
+        )
+    )
+    display.processes.append(
+        _spawn(["websockify", "--web", settings.novnc_web_dir, str(display.web_port), f"localhost:{display.vnc_port}"])
+    )
+
+
+def _spawn(args: list[str]) -> subprocess.Popen:
+    return subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _stop_processes(display: VirtualDisplay) -> None:
+    for process in reversed(display.processes):
+        if process.poll() is None:
+            process.terminate()
+    for process in reversed(display.processes):
+        try:
+            process.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    display.processes.clear()
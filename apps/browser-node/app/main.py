@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, Header, HTTPException, status
@@ -8,9 +9,24 @@ from pydantic import BaseModel, Field
 
 from app.automation import execute_action, execute_actions_batch
 from app.config import settings
-from app.session_manager import session_manager
+from app.profiles import profile_store, profiles_enabled
+from app.storage_states import storage_state_cache, storage_state_hash
+from app.session_manager import NodeAtCapacityError, session_manager
 
-app = FastAPI(title="SyncSocial Browser Node", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    session_manager.start()
+    if profiles_enabled():
+        profile_store.start(interval_seconds=settings.profiles_sweep_interval_seconds)
+    try:
+        yield
+    finally:
+        profile_store.shutdown()
+        session_manager.shutdown()
+
+
+app = FastAPI(title="SyncSocial Browser Node", version="0.1.0", lifespan=lifespan)
 
 
 def require_internal_token(x_internal_token: Annotated[str | None, Header()] = None) -> None:
@@ -28,6 +44,14 @@ class CreateLoginSessionResponse(BaseModel):
     remote_url: str | None
 
 
+class LoginStatusBatchRequest(BaseModel):
+    login_session_ids: list[uuid.UUID] = Field(default_factory=list, max_length=500)
+
+
+class LoginStatusBatchResponse(BaseModel):
+    results: dict[str, bool | None]
+
+
 class ExecuteActionRequest(BaseModel):
     platform_key: str = Field(min_length=1, max_length=32)
     action_type: str = Field(min_length=1, max_length=64)
@@ -37,6 +61,7 @@ class ExecuteActionRequest(BaseModel):
     bandwidth_mode: str | None = Field(default=None, max_length=16)
     action_params: dict = Field(default_factory=dict)
     fingerprint_profile: dict = Field(default_factory=dict)
+    profile_key: str | None = Field(default=None, max_length=200)
 
 
 class ExecuteActionResponse(BaseModel):
@@ -57,14 +82,21 @@ class ExecuteActionBatchItem(BaseModel):
 
 class ExecuteActionsBatchRequest(BaseModel):
     platform_key: str = Field(min_length=1, max_length=32)
-    storage_state: dict
+    storage_state: dict | None = None
+    storage_state_hash: str | None = Field(default=None, max_length=64)
     bandwidth_mode: str | None = Field(default=None, max_length=16)
     fingerprint_profile: dict = Field(default_factory=dict)
+    profile_key: str | None = Field(default=None, max_length=200)
+    parallelism: int = Field(default=1, ge=1, le=32)
     actions: list[ExecuteActionBatchItem] = Field(default_factory=list)
 
 
 class ExecuteActionsBatchResponse(BaseModel):
     results: list[ExecuteActionResponse]
+    node_id: str | None = None
+    profile_warm: bool = False
+    storage_state: dict | None = None
+    storage_state_hash: str | None = None
 
 
 @app.get("/health")
@@ -82,9 +114,19 @@ def create_login_session(payload: CreateLoginSessionRequest, _: None = Depends(r
         )
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except NodeAtCapacityError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     return CreateLoginSessionResponse(remote_url=remote_url)
 
 
+@app.post("/login-sessions/is-logged-in", response_model=LoginStatusBatchResponse)
+def is_logged_in_batch_endpoint(
+    payload: LoginStatusBatchRequest, _: None = Depends(require_internal_token)
+) -> LoginStatusBatchResponse:
+    states = session_manager.get_logged_in_batch(login_session_ids=payload.login_session_ids)
+    return LoginStatusBatchResponse(results={str(login_session_id): value for login_session_id, value in states.items()})
+
+
 @app.get("/login-sessions/{login_session_id}/is-logged-in")
 def is_logged_in_endpoint(login_session_id: uuid.UUID, _: None = Depends(require_internal_token)) -> dict:
     try:
@@ -120,6 +162,7 @@ def execute_action_endpoint(payload: ExecuteActionRequest, _: None = Depends(req
         action_params=payload.action_params,
         fingerprint_profile=payload.fingerprint_profile,
         headless=settings.headless,
+        profile_key=payload.profile_key,
     )
     return ExecuteActionResponse(
         status=result.status,
@@ -135,14 +178,45 @@ def execute_action_endpoint(payload: ExecuteActionRequest, _: None = Depends(req
 def execute_actions_batch_endpoint(
     payload: ExecuteActionsBatchRequest, _: None = Depends(require_internal_token)
 ) -> ExecuteActionsBatchResponse:
+    storage_state = payload.storage_state
+    if storage_state is not None:
+        input_hash = storage_state_hash(storage_state)
+        storage_state_cache.put(input_hash, storage_state)
+    else:
+        input_hash = payload.storage_state_hash or ""
+        storage_state = storage_state_cache.get(input_hash) if input_hash else None
+        if storage_state is None:
+            # The API resends the full body on this status.
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Storage state not cached")
+
+    updated: dict = {}
+
+    def _capture_storage_state(value: dict) -> None:
+        updated["storage_state"] = value
+
+    use_profile = bool(payload.profile_key) and profiles_enabled()
+    # Reported so the API can keep sending this account to the node that holds its warm profile.
+    profile_warm = use_profile and profile_store.is_warm(payload.profile_key)
     results = execute_actions_batch(
         platform_key=payload.platform_key,
         actions=[item.model_dump() for item in payload.actions],
-        storage_state=payload.storage_state,
+        storage_state=storage_state,
         bandwidth_mode=payload.bandwidth_mode if payload.bandwidth_mode else None,
         fingerprint_profile=payload.fingerprint_profile,
         headless=settings.headless,
+        profile_key=payload.profile_key,
+        on_storage_state=_capture_storage_state,
+        parallelism=max(1, min(payload.parallelism, settings.max_page_parallelism)),
     )
+
+    output_state = None
+    output_hash = input_hash
+    if "storage_state" in updated:
+        output_hash = storage_state_hash(updated["storage_state"])
+        storage_state_cache.put(output_hash, updated["storage_state"])
+        if output_hash != input_hash:
+            output_state = updated["storage_state"]
+
     return ExecuteActionsBatchResponse(
         results=[
             ExecuteActionResponse(
@@ -154,5 +228,9 @@ def execute_actions_batch_endpoint(
                 metadata=item.metadata,
             )
             for item in results
-        ]
+        ],
+        node_id=settings.node_id if use_profile else None,
+        profile_warm=profile_warm,
+        storage_state=output_state,
+        storage_state_hash=output_hash,
     )
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.config import settings
+
+
+# One user-data dir per account keeps Chromium's HTTP cache, service workers and local storage
+# between batches. A dir is used by one browser at a time; unused dirs are evicted LRU by disk budget
+# from a background sweep, so batches never pay for walking the profile tree.
+class ProfileStore:
+    def __init__(self, *, base_dir: str, max_bytes: int) -> None:
+        self._base_dir = Path(base_dir)
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._profile_locks: dict[str, threading.Lock] = {}
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, *, interval_seconds: float) -> None:
+        if self._thread is not None or self._max_bytes <= 0:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._sweep_loop, args=(max(1.0, float(interval_seconds)),), name="profile-sweep", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stopping.wait(interval):
+            try:
+                self.enforce_budget()
+            except Exception:
+                pass
+
+    def path_for(self, profile_key: str) -> Path:
+        digest = hashlib.sha256(profile_key.encode("utf-8")).hexdigest()[:32]
+        return self._base_dir / digest
+
+    def is_warm(self, profile_key: str) -> bool:
+        return (self.path_for(profile_key) / "Default").is_dir()
+
+    @contextmanager
+    def lease(self, profile_key: str) -> Iterator[Path]:
+        path = self.path_for(profile_key)
+        with self._lock:
+            profile_lock = self._profile_locks.setdefault(path.name, threading.Lock())
+        with profile_lock:
+            path.mkdir(parents=True, exist_ok=True)
+            os.utime(path)
+            try:
+                yield path
+            finally:
+                os.utime(path)
+
+    def enforce_budget(self) -> int:
+        if self._max_bytes <= 0 or not self._base_dir.is_dir():
+            return 0
+        profiles = []
+        total = 0
+        for path in self._base_dir.iterdir():
+            if not path.is_dir():
+                continue
+            size = _dir_size(path)
+            total += size
+            profiles.append((path.stat().st_mtime, size, path))
+
+        removed = 0
+        for _, size, path in sorted(profiles):
+            if total <= self._max_bytes:
+                break
+            with self._lock:
+                profile_lock = self._profile_locks.setdefault(path.name, threading.Lock())
+            # Profiles in use are skipped; holding the lock while deleting makes a new lease wait.
+            if not profile_lock.acquire(blocking=False):
+                continue
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                profile_lock.release()
+            total -= size
+            removed += 1
+        return removed
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+profile_store = ProfileStore(base_dir=settings.profiles_dir, max_bytes=settings.profiles_max_bytes)
+
+
+def profiles_enabled() -> bool:
+    return settings.persistent_profiles
+
@@ -1,90 +1,403 @@
 from __future__ import annotations
 
+import json
+import os
 import threading
+import time
 import uuid
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
 
 from app.config import settings
+from app.displays import DisplayPoolExhaustedError, VirtualDisplay, display_allocator, screen_size
 from app.platforms import cookie_origin, is_logged_in, login_url
 
+_EVENT_PUMP_MS = 50
+
+
+class NodeAtCapacityError(RuntimeError):
+    pass
+
+
+@dataclass
+class SharedBrowser:
+    browser: object
+    contexts: int = 0
+    idle_since: float | None = None
+    display: VirtualDisplay | None = None
+
 
 @dataclass
 class LoginRuntime:
     platform_key: str
     created_at: datetime
-    playwright: object
-    browser: object
+    browser: SharedBrowser
     context: object
     page: object
+    remote_url: str | None = None
+    display: VirtualDisplay | None = None
+    last_activity: float = field(default_factory=time.monotonic)
+    login_signal: threading.Event = field(default_factory=threading.Event)
+    last_checked: float = 0.0
+    reported: bool = False
 
 
 class SessionManager:
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._sessions: dict[uuid.UUID, LoginRuntime] = {}
+        self._starting: set[uuid.UUID] = set()
+        # Login sessions are contexts in a few shared Chromium processes. Every Playwright call goes
+        # through one thread, since the sync API is bound to the thread that started it.
+        self._playwright: object | None = None
+        self._browsers: list[SharedBrowser] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def _call(self, fn, /, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs).result()
 
     def start_login(
         self, *, login_session_id: uuid.UUID, platform_key: str, fingerprint_profile: dict | None = None
     ) -> str | None:
         with self._lock:
-            if login_session_id in self._sessions:
-                return settings.novnc_public_url
-
-        from playwright.sync_api import sync_playwright
-
-        pw = sync_playwright().start()
-        browser = pw.chromium.launch(headless=settings.headless)
-        context_kwargs = _context_kwargs_from_fingerprint(fingerprint_profile or {})
-        context = browser.new_context(**context_kwargs)
-        page = context.new_page()
-        page.goto(login_url(platform_key))
-
-        runtime = LoginRuntime(
-            platform_key=platform_key.strip().lower(),
-            created_at=datetime.now(timezone.utc),
-            playwright=pw,
-            browser=browser,
-            context=context,
-            page=page,
-        )
+            existing = self._sessions.get(login_session_id)
+            if existing is not None:
+                return existing.remote_url
+            if login_session_id in self._starting:
+                return None
+            if len(self._sessions) + len(self._starting) >= max(1, settings.max_login_sessions):
+                raise NodeAtCapacityError("Browser node is at its login session limit")
+            self._starting.add(login_session_id)
+
+        display = None
+        try:
+            if display_allocator.enabled and not settings.headless:
+                try:
+                    display = display_allocator.acquire()
+                except DisplayPoolExhaustedError as exc:
+                    raise NodeAtCapacityError(str(exc)) from exc
+            runtime = self._call(self._open_login, platform_key, fingerprint_profile or {}, display)
+        except Exception:
+            if display is not None:
+                display_allocator.release(display)
+            raise
+        finally:
+            with self._lock:
+                self._starting.discard(login_session_id)
 
         with self._lock:
             self._sessions[login_session_id] = runtime
-        return settings.novnc_public_url
+        return runtime.remote_url
 
     def get_logged_in(self, *, login_session_id: uuid.UUID) -> bool:
-        with self._lock:
-            runtime = self._sessions.get(login_session_id)
-        if runtime is None:
-            raise KeyError("Login session not found")
-        cookies = runtime.context.cookies(cookie_origin(runtime.platform_key))
+        runtime = self._get_runtime(login_session_id)
+        cookies = self._call(runtime.context.cookies, cookie_origin(runtime.platform_key))
         return is_logged_in(runtime.platform_key, cookies=cookies)
 
+    def get_logged_in_batch(self, *, login_session_ids: list[uuid.UUID]) -> dict[uuid.UUID, bool | None]:
+        states: dict[uuid.UUID, bool | None] = {}
+        for login_session_id in login_session_ids:
+            try:
+                states[login_session_id] = self.get_logged_in(login_session_id=login_session_id)
+            except KeyError:
+                states[login_session_id] = None
+            except Exception:
+                continue
+        return states
+
     def export_storage_state(self, *, login_session_id: uuid.UUID) -> dict:
-        with self._lock:
-            runtime = self._sessions.get(login_session_id)
-        if runtime is None:
-            raise KeyError("Login session not found")
-        return runtime.context.storage_state()
+        runtime = self._get_runtime(login_session_id)
+        return self._call(runtime.context.storage_state)
 
     def stop(self, *, login_session_id: uuid.UUID) -> None:
         with self._lock:
             runtime = self._sessions.pop(login_session_id, None)
         if runtime is None:
             return
+        try:
+            self._call(self._close_login, runtime)
+        finally:
+            if runtime.display is not None:
+                display_allocator.release(runtime.display)
+
+    def start(self) -> None:
+        self._stopping.clear()
+        targets = [self._reap_loop]
+        if settings.api_callback_url and settings.api_callback_url.strip():
+            targets.append(self._watch_logins)
+        for target in targets:
+            thread = threading.Thread(target=target, name=target.__name__.strip("_"), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads.clear()
+
+        with self._lock:
+            login_session_ids = list(self._sessions)
+        for login_session_id in login_session_ids:
+            try:
+                self.stop(login_session_id=login_session_id)
+            except Exception:
+                pass
+        try:
+            self._call(self._close_browsers, force=True)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def reap(self) -> None:
+        # Runtimes are dropped after BROWSER_NODE_LOGIN_TTL_SECONDS whatever the API thinks, so
+        # sessions orphaned by an API restart or a lost stop call cannot hold a browser forever.
+        ttl_seconds = float(settings.login_ttl_seconds)
+        idle_seconds = float(settings.login_idle_seconds)
+        self._call(self._pump_events)
+        now = time.monotonic()
+        now_utc = datetime.now(timezone.utc)
+        with self._lock:
+            stale_ids = [
+                login_session_id
+                for login_session_id, runtime in self._sessions.items()
+                if (ttl_seconds > 0 and (now_utc - runtime.created_at).total_seconds() >= ttl_seconds)
+                or (idle_seconds > 0 and now - runtime.last_activity >= idle_seconds)
+            ]
+        for login_session_id in stale_ids:
+            try:
+                self.stop(login_session_id=login_session_id)
+            except Exception:
+                pass
+            # Without this the API keeps the row active until its own expiry, pointing at a dead runtime.
+            if settings.api_callback_url and settings.api_callback_url.strip():
+                _post_callback(f"/internal/login-sessions/{login_session_id}/evicted", {})
+        self._call(self._close_browsers)
+
+    def _get_runtime(self, login_session_id: uuid.UUID) -> LoginRuntime:
+        with self._lock:
+            runtime = self._sessions.get(login_session_id)
+        if runtime is None:
+            raise KeyError("Login session not found")
+        return runtime
+
+    def _open_login(
+        self, platform_key: str, fingerprint_profile: dict, display: VirtualDisplay | None
+    ) -> LoginRuntime:
+        shared = self._acquire_browser(display)
+        context = None
+        try:
+            context = shared.browser.new_context(**_context_kwargs_from_fingerprint(fingerprint_profile))
+            page = context.new_page()
+            runtime = LoginRuntime(
+                platform_key=platform_key.strip().lower(),
+                created_at=datetime.now(timezone.utc),
+                browser=shared,
+                context=context,
+                page=page,
+                remote_url=display.public_url() if display is not None else settings.novnc_public_url,
+                display=display,
+            )
+            _watch_login_responses(runtime)
+            page.goto(login_url(platform_key))
+        except Exception:
+            if context is not None:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            self._release_browser(shared)
+            raise
+        return runtime
+
+    def _close_login(self, runtime: LoginRuntime) -> None:
         try:
             runtime.context.close()
+        except Exception:
+            pass
         finally:
+            self._release_browser(runtime.browser)
+
+    def _acquire_browser(self, display: VirtualDisplay | None = None) -> SharedBrowser:
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+
+        if display is not None:
+            # A browser window lives on one X display, so a session with its own display gets its own browser.
+            width, height = screen_size()
+            shared = SharedBrowser(
+                browser=self._playwright.chromium.launch(
+                    headless=False,
+                    env={**os.environ, "DISPLAY": display.name},
+                    args=["--window-position=0,0", f"--window-size={width},{height}"],
+                ),
+                contexts=1,
+                display=display,
+            )
+            self._browsers.append(shared)
+            return shared
+
+        self._browsers = [item for item in self._browsers if item.contexts or item.browser.is_connected()]
+        per_browser = max(1, settings.login_contexts_per_browser)
+        # Fill the busiest browser first so the others drain and can be evicted.
+        candidates = [
+            item
+            for item in self._browsers
+            if item.display is None and item.contexts < per_browser and item.browser.is_connected()
+        ]
+        if candidates:
+            shared = max(candidates, key=lambda item: item.contexts)
+        else:
+            shared = SharedBrowser(browser=self._playwright.chromium.launch(headless=settings.headless))
+            self._browsers.append(shared)
+        shared.contexts += 1
+        shared.idle_since = None
+        return shared
+
+    def _release_browser(self, shared: SharedBrowser) -> None:
+        shared.contexts = max(0, shared.contexts - 1)
+        if shared.display is not None:
+            try:
+                shared.browser.close()
+            except Exception:
+                pass
+            self._browsers = [item for item in self._browsers if item is not shared]
+            return
+        if shared.contexts == 0:
+            shared.idle_since = time.monotonic()
+
+    def _close_browsers(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        idle_seconds = float(settings.browser_idle_seconds)
+        keep: list[SharedBrowser] = []
+        for shared in self._browsers:
+            idle = shared.contexts == 0 and shared.idle_since is not None and now - shared.idle_since >= idle_seconds
+            if not (force or idle or not shared.browser.is_connected()):
+                keep.append(shared)
+                continue
+            try:
+                shared.browser.close()
+            except Exception:
+                pass
+        self._browsers = keep
+        if not self._browsers and self._playwright is not None:
             try:
-                runtime.browser.close()
-            finally:
-                runtime.playwright.stop()
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def _pump_events(self) -> None:
+        # The sync API only dispatches browser events while its own thread is inside a Playwright call,
+        # so a short wait here is what delivers queued responses to _watch_login_responses.
+        with self._lock:
+            runtimes = list(self._sessions.values())
+        for runtime in runtimes:
+            try:
+                runtime.page.wait_for_timeout(_EVENT_PUMP_MS)
+            except Exception:
+                continue
+            return
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, float(settings.reaper_interval_seconds))
+        while not self._stopping.wait(interval):
+            try:
+                self.reap()
+            except Exception:
+                pass
+
+    def _watch_logins(self) -> None:
+        interval = max(0.05, float(settings.login_watch_interval_seconds))
+        fallback = max(interval, float(settings.login_cookie_check_interval_seconds))
+        while not self._stopping.wait(interval):
+            with self._lock:
+                items = list(self._sessions.items())
+            if not items:
+                continue
+            try:
+                self._call(self._pump_events)
+            except Exception:
+                pass
+            for login_session_id, runtime in items:
+                now = time.monotonic()
+                # Responses that may carry a login only flag the runtime; cookies are read here,
+                # with a slower periodic check for logins the listener cannot see.
+                if runtime.reported or (not runtime.login_signal.is_set() and now - runtime.last_checked < fallback):
+                    continue
+                runtime.login_signal.clear()
+                runtime.last_checked = now
+                try:
+                    if not self.get_logged_in(login_session_id=login_session_id):
+                        continue
+                    storage_state = self.export_storage_state(login_session_id=login_session_id)
+                except Exception:
+                    continue
+
+                captured = _push_logged_in(login_session_id, storage_state)
+                if captured is None:
+                    continue
+                runtime.reported = True
+                if captured:
+                    try:
+                        self.stop(login_session_id=login_session_id)
+                    except Exception:
+                        pass
 
 
 session_manager = SessionManager()
 
 
+def _watch_login_responses(runtime: LoginRuntime) -> None:
+    # Set-Cookie is hidden from response.headers, so react to what usually accompanies a login:
+    # a document navigation or a non-GET request (form post, XHR sign-in).
+    def _on_response(response) -> None:
+        try:
+            runtime.last_activity = time.monotonic()
+            request = response.request
+            if request.is_navigation_request() or request.method != "GET":
+                runtime.login_signal.set()
+        except Exception:
+            pass
+
+    runtime.context.on("response", _on_response)
+
+
+def _push_logged_in(login_session_id: uuid.UUID, storage_state: dict) -> bool | None:
+    body = _post_callback(f"/internal/login-sessions/{login_session_id}/logged-in", {"storage_state": storage_state})
+    if body is None:
+        return None
+    try:
+        return bool(json.loads(body.decode("utf-8")).get("captured")) if body else False
+    except ValueError:
+        return None
+
+
+def _post_callback(path: str, payload: dict) -> bytes | None:
+    base_url = (settings.api_callback_url or "").strip().rstrip("/")
+    req = Request(
+        url=f"{base_url}{path}",
+        method="POST",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={
+            "accept": "application/json",
+            "content-type": "application/json",
+            "x-internal-token": settings.internal_token,
+        },
+    )
+    try:
+        with urlopen(req, timeout=30) as resp:
+            return resp.read()
+    except (HTTPError, URLError, OSError):
+        return None
+
+
 def _context_kwargs_from_fingerprint(profile: dict) -> dict:
     if not isinstance(profile, dict) or not profile:
         return {}
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from app.config import settings
+
+
+def storage_state_hash(storage_state: dict) -> str:
+    payload = json.dumps(storage_state, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# In-memory only: storage states are live credentials and must never be written to disk here.
+class StorageStateCache:
+    def __init__(self, *, max_entries: int) -> None:
+        self._max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def get(self, state_hash: str) -> dict | None:
+        with self._lock:
+            storage_state = self._entries.get(state_hash)
+            if storage_state is not None:
+                self._entries.move_to_end(state_hash)
+            return storage_state
+
+    def put(self, state_hash: str, storage_state: dict) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[state_hash] = storage_state
+            self._entries.move_to_end(state_hash)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+storage_state_cache = StorageStateCache(max_entries=settings.storage_state_cache_size)
@@ -3,11 +3,17 @@ set -euo pipefail
 
 DISPLAY="${DISPLAY:-:99}"
 SCREEN="${BROWSER_NODE_SCREEN:-1280x720x24}"
+DISPLAY_POOL_SIZE="${BROWSER_NODE_DISPLAY_POOL_SIZE:-0}"
 
+# Headed action batches always run on this screen.
 Xvfb "$DISPLAY" -screen 0 "$SCREEN" -ac +extension RANDR &
 fluxbox -display "$DISPLAY" &
-x11vnc -display "$DISPLAY" -forever -shared -rfbport 5900 -nopw &
-/usr/share/novnc/utils/novnc_proxy --vnc localhost:5900 --listen 7900 &
 
-exec uvicorn app.main:app --host 0.0.0.0 --port 9300
+# With a display pool every login session gets its own Xvfb/x11vnc/noVNC stack from the node,
+# so the shared screen is not exposed over VNC.
+if [ "$DISPLAY_POOL_SIZE" -le 0 ]; then
+  x11vnc -display "$DISPLAY" -forever -shared -rfbport 5900 -nopw &
+  /usr/share/novnc/utils/novnc_proxy --vnc localhost:5900 --listen 7900 &
+fi
 
+exec uvicorn app.main:app --host 0.0.0.0 --port 9300
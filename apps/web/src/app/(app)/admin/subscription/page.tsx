@@ -118,7 +118,8 @@ export default function AdminSubscriptionPage() {
     );
   }
 
-  const usedSeconds = overview?.current_month_usage?.automation_runtime_seconds ?? 0;
+  const usedSeconds =
+    (overview?.current_month_usage?.automation_runtime_seconds ?? 0) + (overview?.pending_runtime_seconds ?? 0);
   const usedHours = Math.round((usedSeconds / 3600) * 100) / 100;
   const quotaHours = overview?.subscription?.automation_runtime_hours ?? null;
 
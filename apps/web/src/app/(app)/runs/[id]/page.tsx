@@ -4,7 +4,15 @@ import { useAuth } from "@/lib/auth";
 import type { ActionPublic, RunDetail } from "@/lib/types";
 import Link from "next/link";
 import { useParams } from "next/navigation";
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
+
+type RunEvent = {
+  type?: "run" | "account_run" | "action";
+  id?: string;
+  status?: string;
+  error_code?: string | null;
+  attempt_count?: number;
+};
 
 export default function RunDetailPage() {
   const auth = useAuth();
@@ -12,6 +20,8 @@ export default function RunDetailPage() {
   const runId = params.id;
 
   const [data, setData] = useState<RunDetail | null>(null);
+  const dataRef = useRef<RunDetail | null>(null);
+  dataRef.current = data;
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -35,6 +45,80 @@ export default function RunDetailPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [runId]);
 
+  useEffect(() => {
+    const controller = new AbortController();
+
+    function applyEvent(event: RunEvent) {
+      if (event.type === "action" && event.id) {
+        if (!dataRef.current?.actions.some((a) => a.id === event.id)) {
+          void load();
+          return;
+        }
+        setData((prev) => {
+          if (!prev) return prev;
+          return {
+            ...prev,
+            actions: prev.actions.map((a) =>
+              a.id === event.id ? { ...a, status: event.status ?? a.status, error_code: event.error_code ?? null } : a,
+            ),
+          };
+        });
+        return;
+      }
+      setData((prev) => {
+        if (!prev) return prev;
+        if (event.type === "run") return { ...prev, run: { ...prev.run, status: event.status ?? prev.run.status } };
+        if (event.type === "account_run") {
+          return {
+            ...prev,
+            account_runs: prev.account_runs.map((ar) =>
+              ar.id === event.id
+                ? {
+                    ...ar,
+                    status: event.status ?? ar.status,
+                    error_code: event.error_code ?? null,
+                    attempt_count: event.attempt_count ?? ar.attempt_count,
+                  }
+                : ar,
+            ),
+          };
+        }
+        return prev;
+      });
+    }
+
+    async function follow() {
+      const res = await auth.apiFetch(`/runs/${runId}/events`, { signal: controller.signal });
+      if (!res.ok || !res.body) return;
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep = buffer.indexOf("\n\n");
+        while (sep >= 0) {
+          const chunk = buffer.slice(0, sep);
+          buffer = buffer.slice(sep + 2);
+          sep = buffer.indexOf("\n\n");
+          const dataLine = chunk.split("\n").find((line) => line.startsWith("data: "));
+          if (!dataLine) continue;
+          try {
+            const event = JSON.parse(dataLine.slice(6)) as RunEvent;
+            if (event.type) applyEvent(event);
+          } catch {
+            // ignore malformed events
+          }
+        }
+      }
+    }
+
+    follow().catch(() => null);
+    return () => controller.abort();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [runId]);
+
   function getMetaString(action: ActionPublic, key: string) {
     const v = action.metadata[key];
     return typeof v === "string" ? v : null;
@@ -159,9 +243,9 @@ export default function RunDetailPage() {
                         <button
                           type="button"
                           onClick={() => void openScreenshot(a)}
-                          style={{ padding: "6px 10px", borderRadius: 8, border: "1px solid #333", background: "transparent" }}
+                          style={{ padding: 0, borderRadius: 8, border: "1px solid #333", background: "transparent" }}
                         >
-                          截图
+                          <ScreenshotThumbnail artifactId={a.artifacts.find((it) => it.type === "screenshot")!.id} />
                         </button>
                       ) : (
                         "—"
@@ -204,3 +288,30 @@ export default function RunDetailPage() {
     </div>
   );
 }
+
+function ScreenshotThumbnail({ artifactId }: { artifactId: string }) {
+  const auth = useAuth();
+  const [src, setSrc] = useState<string | null>(null);
+
+  useEffect(() => {
+    let url: string | null = null;
+    let cancelled = false;
+    auth
+      .apiFetch(`/artifacts/${artifactId}/thumbnail?width=160`)
+      .then(async (res) => {
+        if (!res.ok || cancelled) return;
+        url = URL.createObjectURL(await res.blob());
+        if (cancelled) URL.revokeObjectURL(url);
+        else setSrc(url);
+      })
+      .catch(() => null);
+    return () => {
+      cancelled = true;
+      if (url) URL.revokeObjectURL(url);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [artifactId]);
+
+  if (!src) return <span style={{ display: "inline-block", padding: "6px 10px" }}>截图</span>;
+  return <img src={src} alt="截图" width={160} style={{ display: "block", borderRadius: 8 }} />;
+}
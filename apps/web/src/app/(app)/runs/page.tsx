@@ -1,24 +1,30 @@
 "use client";
 
 import { useAuth } from "@/lib/auth";
-import type { RunPublic } from "@/lib/types";
+import type { RunPage, RunPublic } from "@/lib/types";
 import Link from "next/link";
 import { useEffect, useState } from "react";
 
 export default function RunsPage() {
   const auth = useAuth();
   const [runs, setRuns] = useState<RunPublic[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [statusFilter, setStatusFilter] = useState("");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  async function load() {
+  async function load(cursor?: string) {
     setLoading(true);
     setError(null);
     try {
-      const res = await auth.apiFetch("/runs");
+      const params = new URLSearchParams({ limit: "50" });
+      if (statusFilter) params.set("status", statusFilter);
+      if (cursor) params.set("cursor", cursor);
+      const res = await auth.apiFetch(`/runs?${params.toString()}`);
       if (!res.ok) throw new Error(await res.text());
-      const data = (await res.json()) as RunPublic[];
-      setRuns(data);
+      const data = (await res.json()) as RunPage;
+      setRuns((prev) => (cursor ? [...prev, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : "加载失败");
     } finally {
@@ -29,7 +35,7 @@ export default function RunsPage() {
   useEffect(() => {
     void load();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [statusFilter]);
 
   return (
     <div style={{ padding: 24 }}>
@@ -42,6 +48,17 @@ export default function RunsPage() {
         >
           刷新
         </button>
+        <select
+          value={statusFilter}
+          onChange={(e) => setStatusFilter(e.target.value)}
+          style={{ padding: "10px 14px", borderRadius: 10, border: "1px solid #333" }}
+        >
+          <option value="">全部状态</option>
+          <option value="queued">queued</option>
+          <option value="running">running</option>
+          <option value="succeeded">succeeded</option>
+          <option value="failed">failed</option>
+        </select>
         <Link href="/schedules" style={{ padding: "10px 14px", borderRadius: 10, border: "1px solid #333" }}>
           去执行计划
         </Link>
@@ -76,6 +93,17 @@ export default function RunsPage() {
           </tbody>
         </table>
       </div>
+
+      {nextCursor ? (
+        <button
+          type="button"
+          disabled={loading}
+          onClick={() => load(nextCursor).catch(() => null)}
+          style={{ marginTop: 16, padding: "10px 14px", borderRadius: 10, border: "1px solid #333", background: "transparent" }}
+        >
+          加载更多
+        </button>
+      ) : null}
     </div>
   );
 }
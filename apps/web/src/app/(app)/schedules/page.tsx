@@ -15,7 +15,7 @@ export default function SchedulesPage() {
   const [name, setName] = useState("");
   const [strategyId, setStrategyId] = useState("");
   const [accountSelectorText, setAccountSelectorText] = useState('{"all": true}');
-  const [frequency, setFrequency] = useState<"manual" | "interval" | "daily">("manual");
+  const [frequency, setFrequency] = useState<"manual" | "interval" | "daily" | "cron">("manual");
   const [scheduleSpecText, setScheduleSpecText] = useState("{}");
   const [randomConfigText, setRandomConfigText] = useState("{}");
   const [maxParallel, setMaxParallel] = useState(1);
@@ -23,6 +23,7 @@ export default function SchedulesPage() {
   useEffect(() => {
     if (frequency === "interval") setScheduleSpecText('{"every_minutes": 60}');
     else if (frequency === "daily") setScheduleSpecText('{"time_of_day": "09:00"}');
+    else if (frequency === "cron") setScheduleSpecText('{"cron": "0 9 * * 1-5", "timezone": "UTC"}');
     else setScheduleSpecText("{}");
   }, [frequency]);
 
@@ -146,17 +147,18 @@ export default function SchedulesPage() {
         />
         <select
           value={frequency}
-          onChange={(e) => setFrequency(e.target.value as "manual" | "interval" | "daily")}
+          onChange={(e) => setFrequency(e.target.value as "manual" | "interval" | "daily" | "cron")}
           style={{ padding: 10, borderRadius: 8, border: "1px solid #333" }}
         >
           <option value="manual">manual（仅手动触发）</option>
           <option value="interval">interval（按间隔）</option>
           <option value="daily">daily（每天定时）</option>
+          <option value="cron">cron（cron 表达式）</option>
         </select>
         <input
           value={scheduleSpecText}
           onChange={(e) => setScheduleSpecText(e.target.value)}
-          placeholder='schedule_spec JSON，比如 {"every_minutes":60} / {"time_of_day":"09:00"}'
+          placeholder='schedule_spec JSON，比如 {"every_minutes":60} / {"time_of_day":"09:00","timezone":"Asia/Shanghai","weekdays":[0,1,2,3,4],"active_hours":{"start":"08:00","end":"22:00"}}'
           style={{ padding: 10, borderRadius: 8, border: "1px solid #333", minWidth: 360 }}
         />
         <input
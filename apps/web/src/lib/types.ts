@@ -72,6 +72,7 @@ export type AdminSubscriptionOverview = {
   current_month_usage: WorkspaceUsageMonthlyPublic | null;
   active: boolean;
   active_reason: string | null;
+  pending_runtime_seconds: number;
 };
 
 export type AuditLogPublic = {
@@ -152,6 +153,11 @@ export type RunPublic = {
   finished_at: string | null;
 };
 
+export type RunPage = {
+  items: RunPublic[];
+  next_cursor: string | null;
+};
+
 export type AccountRunPublic = {
   id: string;
   workspace_id: string;
@@ -159,6 +165,7 @@ export type AccountRunPublic = {
   social_account_id: string;
   status: string;
   error_code: string | null;
+  attempt_count: number;
   started_at: string | null;
   finished_at: string | null;
 };
@@ -187,12 +194,51 @@ export type ArtifactPublic = {
   action_id: string;
   type: string;
   storage_key: string;
+  content_hash: string | null;
   size: number | null;
   created_at: string;
 };
 
+export type RunSummary = {
+  run: RunPublic;
+  account_run_total: number;
+  account_runs_by_status: Record<string, number>;
+  account_run_error_codes: Record<string, number>;
+  action_total: number;
+  actions_by_type: Record<string, Record<string, number>>;
+  action_error_codes: Record<string, number>;
+};
+
+export type AccountRunPage = {
+  items: AccountRunPublic[];
+  next_cursor: string | null;
+};
+
+export type ActionPage = {
+  items: ActionPublic[];
+  next_cursor: string | null;
+};
+
 export type RunDetail = {
   run: RunPublic;
   account_runs: AccountRunPublic[];
   actions: ActionPublic[];
 };
+
+export type ActionSeriesPoint = {
+  bucket_start: string;
+  count: number;
+  social_account_id?: string | null;
+  strategy_id?: string | null;
+  action_type?: string | null;
+  status?: string | null;
+  error_code?: string | null;
+};
+
+export type ActionSeries = {
+  granularity: "hour" | "day" | string;
+  start: string;
+  end: string;
+  group_by: string[];
+  points: ActionSeriesPoint[];
+};